@@ -1,7 +1,12 @@
 # accounts/admin.py
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import QuerySet
+from django.http import HttpRequest
 
+from core.pagination import EstimatedCountPaginator
+
+from . import search
 from .models import CustomUser
 
 
@@ -58,11 +63,26 @@ class CustomUserAdmin(BaseUserAdmin):
         ),
     )
 
-    # Fields to search by
-    search_fields = ('email', 'first_name', 'last_name')
+    # Fields to search by; get_search_results() matches them the way
+    # their trigram indexes can serve (see accounts/search.py).
+    search_fields = search.SEARCH_FIELDS
     ordering = ('email',)
     filter_horizontal = ('groups', 'user_permissions',)
 
+    # Estimate page counts on large tables instead of counting, and
+    # skip the second count of the unfiltered table.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        search_term: str,
+    ) -> tuple[QuerySet, bool]:
+        fields = tuple(self.get_search_fields(request))
+        return search.search(queryset, search_term, fields), False
+
 # Register your models here.
 
 # Register your models here.
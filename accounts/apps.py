@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.core import checks
+
+from accounts.checks import check_password_hashers, check_trigram_indexes
 
 
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self) -> None:
+        # Imported here because signals.py needs the app registry.
+        from accounts import signals  # noqa: PLC0415
+
+        signals.connect()
+        checks.register(check_password_hashers)
+        checks.register(check_trigram_indexes, checks.Tags.database)
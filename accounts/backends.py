@@ -0,0 +1,149 @@
+# accounts/backends.py
+"""
+Authentication backend with a shared permission cache.
+
+``ModelBackend`` caches permissions on the user object, so every
+request loads them from the database again. ``CachedPermissionBackend``
+keeps them in Django's cache framework between requests.
+
+Entries are keyed by user, by whether the user is a superuser (who is
+granted every permission) and by a global generation number. A change
+that affects one user, including saving the user, deletes that user's
+entries; a change that can affect many users (group permissions,
+deleted groups or permissions) bumps the generation, which orphans all
+entries at once. Both happen from the signal handlers in
+:mod:`accounts.signals`.
+
+Invalidation only reaches the cache the process uses, so with several
+workers ``ACCOUNTS_PERMISSION_CACHE`` must name a shared cache (see
+core.W007).
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+
+if TYPE_CHECKING:
+    from django.contrib.auth.base_user import AbstractBaseUser
+    from django.core.cache.backends.base import BaseCache
+    from django.db.models import Model
+
+KEY_PREFIX = 'accounts:perms'
+GENERATION_KEY = f'{KEY_PREFIX}:generation'
+DEFAULT_ALIAS = 'permissions'
+DEFAULT_TIMEOUT = 300
+
+
+def cache_alias() -> str:
+    return getattr(settings, 'ACCOUNTS_PERMISSION_CACHE', DEFAULT_ALIAS)
+
+
+def _cache() -> BaseCache:
+    return caches[cache_alias()]
+
+
+def _timeout() -> int:
+    return getattr(
+        settings, 'ACCOUNTS_PERMISSION_CACHE_TIMEOUT', DEFAULT_TIMEOUT
+    )
+
+
+def _generation(cache: BaseCache) -> int:
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Never expire the counter, or entries of an older generation
+        # could become valid again.
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+def permission_cache_key(
+    user_pk: object,
+    generation: int,
+    superuser: bool = False,
+) -> str:
+    """Return the cache key for the permissions of one user."""
+    # The flag is part of the key so that a demotion through
+    # QuerySet.update(), which sends no signal, is not served from cache.
+    suffix = ':superuser' if superuser else ''
+    return f'{KEY_PREFIX}:{generation}:{user_pk}{suffix}'
+
+
+def invalidate_user_permissions(user_pks: Iterable[object]) -> None:
+    """Drop the cached permissions of the given users."""
+    cache = _cache()
+    generation = _generation(cache)
+    cache.delete_many([
+        permission_cache_key(pk, generation, superuser)
+        for pk in user_pks
+        for superuser in (False, True)
+    ])
+
+
+def invalidate_all_permissions() -> None:
+    """Drop the cached permissions of every user."""
+    cache = _cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # The counter was evicted; start a generation nobody used yet.
+        cache.set(GENERATION_KEY, _generation(cache) + 1, timeout=None)
+
+
+class CachedPermissionBackend(ModelBackend):
+    """ModelBackend whose permission lookups are served from the cache."""
+
+    def _load_permissions(
+        self,
+        user_obj: AbstractBaseUser,
+    ) -> dict[str, set[str]]:
+        perms = getattr(user_obj, '_cached_perms', None)
+        if perms is not None:
+            return perms
+        cache = _cache()
+        key = permission_cache_key(
+            user_obj.pk, _generation(cache), user_obj.is_superuser
+        )
+        perms = cache.get(key)
+        if perms is None:
+            perms = {
+                'user': super().get_user_permissions(user_obj),
+                'group': super().get_group_permissions(user_obj),
+            }
+            cache.set(key, perms, _timeout())
+        user_obj._cached_perms = perms
+        return perms
+
+    def _cacheable(
+        self,
+        user_obj: AbstractBaseUser,
+        obj: Model | None,
+    ) -> bool:
+        return (
+            obj is None
+            and user_obj.is_active
+            and not user_obj.is_anonymous
+        )
+
+    def get_user_permissions(
+        self,
+        user_obj: AbstractBaseUser,
+        obj: Model | None = None,
+    ) -> set[str]:
+        if not self._cacheable(user_obj, obj):
+            return super().get_user_permissions(user_obj, obj)
+        return self._load_permissions(user_obj)['user']
+
+    def get_group_permissions(
+        self,
+        user_obj: AbstractBaseUser,
+        obj: Model | None = None,
+    ) -> set[str]:
+        if not self._cacheable(user_obj, obj):
+            return super().get_group_permissions(user_obj, obj)
+        return self._load_permissions(user_obj)['group']
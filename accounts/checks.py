@@ -0,0 +1,56 @@
+# accounts/checks.py
+from typing import Any, List
+
+from django.conf import settings
+from django.core.checks import Error, Warning
+from django.db import connections
+
+from accounts import search
+from accounts.hashers import argon2_available
+
+ARGON2_HASHER = 'accounts.hashers.Argon2PasswordHasher'
+
+
+def check_password_hashers(
+    app_configs: Any = None,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> List[Error]:
+    """Argon2 can only be the preferred hasher with argon2-cffi."""
+    preferred = settings.PASSWORD_HASHERS[0]
+    if preferred == ARGON2_HASHER and not argon2_available():
+        return [
+            Error(
+                'PASSWORD_HASHERS prefers Argon2, but argon2-cffi is not '
+                'installed.',
+                hint='Install "django[argon2]" or set '
+                'DJANGO_PASSWORD_HASHERS=pbkdf2.',
+                id='accounts.E001',
+            )
+        ]
+    return []
+
+
+def check_trigram_indexes(
+    app_configs: Any = None,  # noqa: ANN401
+    databases: Any = None,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> List[Warning]:
+    """Report user search indexes the trigram migration had to skip."""
+    warnings: List[Warning] = []
+    for alias in databases or ():
+        connection = connections[alias]
+        if connection.vendor != 'postgresql':
+            continue
+        missing = search.missing_indexes(connection)
+        if missing:
+            warnings.append(
+                Warning(
+                    f'Database {alias!r} lacks the user search indexes '
+                    f'{", ".join(missing)}.',
+                    hint='Install the PostgreSQL contrib package '
+                    '(pg_trgm), then run "manage.py migrate accounts '
+                    '0001" and "manage.py migrate accounts".',
+                    id='accounts.W001',
+                )
+            )
+    return warnings
@@ -0,0 +1,107 @@
+# accounts/hashers.py
+"""
+Password hashing tuned for many logins at once.
+
+Django's default PBKDF2 hasher spends its whole work factor in CPU
+time. ``Argon2PasswordHasher`` is Argon2id with the parameters of
+``PASSWORD_ARGON2``; the defaults (19 MiB, two passes, one lane) are
+the OWASP minimum, which costs a fraction of the CPU time of PBKDF2 and
+makes guessing expensive through memory instead. Changing the
+parameters or the hasher needs no migration: ``CustomUser`` rehashes a
+password with the preferred hasher on the next successful login.
+
+Verification can run in a pool of ``PASSWORD_VERIFY_WORKERS`` threads.
+Both argon2-cffi and hashlib release the GIL while hashing, so threads
+hash in parallel without forking. The pool bounds the number of
+hashes computed at once: a burst of logins waits in its queue instead
+of slowing every other request down, and async callers await it
+without blocking the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+DEFAULT_ARGON2 = {'time_cost': 2, 'memory_cost': 19456, 'parallelism': 1}
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def argon2_available() -> bool:
+    """Return True if argon2-cffi is installed."""
+    return importlib.util.find_spec('argon2') is not None
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id with the parameters of ``PASSWORD_ARGON2``."""
+
+    def __init__(self) -> None:
+        params = {
+            **DEFAULT_ARGON2,
+            **getattr(settings, 'PASSWORD_ARGON2', {}),
+        }
+        self.time_cost = params['time_cost']
+        self.memory_cost = params['memory_cost']
+        self.parallelism = params['parallelism']
+
+
+def verification_pool() -> ThreadPoolExecutor | None:
+    """Return the shared pool, or None to verify in the caller."""
+    global _pool  # noqa: PLW0603
+    workers = getattr(settings, 'PASSWORD_VERIFY_WORKERS', 0)
+    if not workers:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix='password-verify'
+            )
+        return _pool
+
+
+@receiver(setting_changed)
+def _reset(setting: str, **kwargs: object) -> None:
+    global _pool  # noqa: PLW0603
+    if setting == 'PASSWORD_ARGON2':
+        hashers.reset_hashers(setting='PASSWORD_HASHERS')
+    elif setting == 'PASSWORD_VERIFY_WORKERS' and _pool is not None:
+        with _pool_lock:
+            _pool.shutdown(wait=False)
+            _pool = None
+
+
+def verify_password(password: str | None, encoded: str) -> tuple[bool, bool]:
+    """
+    ``django.contrib.auth.hashers.verify_password`` in the pool.
+
+    Returns whether ``password`` matches and whether ``encoded`` should
+    be replaced by a hash with the preferred hasher.
+    """
+    pool = verification_pool()
+    if pool is None:
+        return hashers.verify_password(password, encoded)
+    return pool.submit(hashers.verify_password, password, encoded).result()
+
+
+async def averify_password(
+    password: str | None,
+    encoded: str,
+) -> tuple[bool, bool]:
+    """See ``verify_password``; never blocks the event loop."""
+    pool = verification_pool()
+    if pool is None:
+        return await sync_to_async(
+            hashers.verify_password, thread_sensitive=False
+        )(password, encoded)
+    return await asyncio.wrap_future(
+        pool.submit(hashers.verify_password, password, encoded)
+    )
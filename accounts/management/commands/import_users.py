@@ -0,0 +1,98 @@
+# accounts/management/commands/import_users.py
+"""
+Create user accounts in bulk from a CSV or JSON file.
+
+CSV files need a header row; JSON files hold an array of objects.
+Recognised fields are ``email`` (required), ``password``,
+``first_name``, ``last_name``, ``is_staff``, ``is_active`` and
+``groups`` (a list in JSON, ``;``-separated in CSV). Users without a
+password get an unusable one and can set it via password reset.
+
+    python manage.py import_users analysts.csv --group Analysts
+
+Existing email addresses are skipped and reported.
+"""
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import IO, Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import CustomUser
+from accounts.provisioning import READERS, BulkCreateResult, read_users
+
+
+class Command(BaseCommand):
+    help = 'Create users in bulk from a CSV or JSON file.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            'path',
+            help='CSV or JSON file to read; "-" reads standard input.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=tuple(READERS),
+            help='File format. Defaults to the file extension.',
+        )
+        parser.add_argument(
+            '--group',
+            action='append',
+            default=[],
+            dest='groups',
+            help='Add every imported user to this group (repeatable).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of users inserted per batch.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help=(
+                'Processes used for password hashing. 0 uses one per '
+                'CPU; 1 hashes in this process.'
+            ),
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        path = options['path']
+        file_format = options['format'] or Path(path).suffix.lstrip('.')
+        if file_format not in READERS:
+            raise CommandError(
+                'Cannot tell the file format; pass --format csv or json.'
+            )
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        try:
+            if path == '-':
+                result = self._import(sys.stdin, file_format, options)
+            else:
+                with open(path, encoding='utf-8', newline='') as stream:
+                    result = self._import(stream, file_format, options)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        for email in result.skipped:
+            self.stdout.write(f'Skipped existing user {email}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {result.created} users, skipped {len(result.skipped)}.'
+        ))
+
+    def _import(
+        self,
+        stream: IO[str],
+        file_format: str,
+        options: dict[str, Any],
+    ) -> BulkCreateResult:
+        return CustomUser.objects.bulk_create_users(
+            read_users(stream, file_format),
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            groups=options['groups'],
+        )
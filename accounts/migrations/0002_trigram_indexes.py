@@ -0,0 +1,33 @@
+# Trigram indexes for the user search (see accounts/search.py).
+
+from django.db import migrations
+
+from accounts import search
+
+
+def create_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if not search.trigram_available(connection):
+        return
+    search.create_indexes(connection)
+
+
+def drop_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    search.drop_indexes(connection)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run in a transaction.
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
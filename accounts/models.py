@@ -1,16 +1,25 @@
 # accounts/models.py
 from __future__ import annotations
 
-from typing import Mapping, Optional
+import itertools
+from typing import Iterable, Mapping, Optional
 
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
+    Group,
     PermissionsMixin,
 )
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
+from accounts.hashers import averify_password, verify_password
+from accounts.provisioning import (
+    BulkCreateResult,
+    clean_record,
+    hash_passwords,
+)
+
 
 class CustomUserManager(BaseUserManager):
     """Manager for CustomUser."""
@@ -41,6 +50,102 @@ class CustomUserManager(BaseUserManager):
         extra_fields.setdefault('is_superuser', True)
         return self.create_user(email, password, **extra_fields)
 
+    def bulk_create_users(
+        self,
+        records: Iterable[Mapping[str, object]],
+        batch_size: int = 500,
+        workers: int = 0,
+        groups: Iterable[str] = (),
+    ) -> BulkCreateResult:
+        """
+        Create users from ``records`` in batches.
+
+        Each record needs an ``email`` and may set ``password``,
+        ``groups`` (group names) and the fields in
+        ``provisioning.USER_FIELDS``. Emails that already exist are
+        skipped. ``groups`` are added to every new user.
+
+        All records are validated and every group name is resolved
+        before anything is written, and the users are inserted in one
+        transaction, so a failed import leaves nothing behind. Per batch
+        this costs one lookup, one INSERT for the users and one for
+        their group memberships; all passwords are hashed in one go, in
+        ``workers`` processes.
+        """
+        result = BulkCreateResult()
+        extra_groups = list(groups)
+        cleaned: dict[str, dict[str, object]] = {}
+        for record in records:
+            data = clean_record(record)
+            email = self.normalize_email(data.pop('email'))
+            if email in cleaned:
+                result.skipped.append(email)
+                continue
+            data['groups'] += extra_groups
+            cleaned[email] = data
+
+        group_names = {name for d in cleaned.values() for name in d['groups']}
+        group_ids = dict(
+            Group.objects.filter(name__in=group_names).values_list(
+                'name', 'id'
+            )
+        )
+        missing = group_names - group_ids.keys()
+        if missing:
+            raise ValueError(
+                f'Unknown group(s): {", ".join(sorted(missing))}'
+            )
+
+        new = {}
+        for batch in itertools.batched(cleaned, batch_size):
+            existing = set(
+                self.filter(email__in=batch).values_list('email', flat=True)
+            )
+            for email in batch:
+                if email in existing:
+                    result.skipped.append(email)
+                else:
+                    new[email] = cleaned[email]
+        if not new:
+            return result
+
+        # Outside the transaction: worker processes need the database
+        # connections closed.
+        passwords = hash_passwords(
+            [d.pop('password') for d in new.values()], workers
+        )
+        membership = self.model.groups.through
+        with transaction.atomic(using=self.db):
+            for batch in itertools.batched(
+                zip(new.items(), passwords, strict=True), batch_size
+            ):
+                users = [
+                    self.model(
+                        email=email,
+                        password=password,
+                        **{k: v for k, v in data.items() if k != 'groups'},
+                    )
+                    for (email, data), password in batch
+                ]
+                self.bulk_create(users, batch_size=batch_size)
+                # New users have no cached permissions yet, so skipping
+                # m2m_changed here is harmless.
+                membership.objects.using(self.db).bulk_create(
+                    [
+                        membership(
+                            customuser_id=user.pk,
+                            group_id=group_ids[name],
+                        )
+                        for user, ((_, data), _) in zip(
+                            users, batch, strict=True
+                        )
+                        for name in dict.fromkeys(data['groups'])
+                    ],
+                    batch_size=batch_size,
+                )
+                result.created += len(users)
+        return result
+
 
 class CustomUser(AbstractBaseUser, PermissionsMixin):
     """Custom user model for Forensic Lab Management."""
@@ -63,6 +168,32 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     def __str__(self) -> str:
         return self.email
 
+    def _upgrade_password(self, raw_password: str) -> None:
+        self.set_password(raw_password)
+        # A rehash is not a password change.
+        self._password = None
+
+    def check_password(self, raw_password: str | None) -> bool:
+        """
+        Verify through ``accounts.hashers``, which may queue the work
+        in a bounded pool; rehash with the preferred hasher on success.
+        """
+        is_correct, must_update = verify_password(raw_password, self.password)
+        if is_correct and must_update:
+            self._upgrade_password(raw_password)
+            self.save(update_fields=['password'])
+        return is_correct
+
+    async def acheck_password(self, raw_password: str | None) -> bool:
+        """See ``check_password``."""
+        is_correct, must_update = await averify_password(
+            raw_password, self.password
+        )
+        if is_correct and must_update:
+            self._upgrade_password(raw_password)
+            await self.asave(update_fields=['password'])
+        return is_correct
+
 # Create your models here.
 
 # Create your models here.
@@ -0,0 +1,125 @@
+# accounts/provisioning.py
+"""
+Helpers for creating many user accounts at once.
+
+Used by ``CustomUserManager.bulk_create_users`` and the
+``import_users`` management command.
+"""
+from __future__ import annotations
+
+import csv
+import json
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import IO, Any
+
+from django.contrib.auth.hashers import make_password
+from django.db import connections
+
+from core.processes import process_pool
+
+# Fields a user record may set besides ``email``, ``password`` and
+# ``groups``.
+USER_FIELDS = ('first_name', 'last_name', 'is_staff', 'is_active')
+BOOLEAN_FIELDS = frozenset({'is_staff', 'is_active'})
+TRUE_VALUES = frozenset({'1', 'true', 'yes', 'y'})
+
+# CSV cells list several groups separated by this character.
+GROUP_SEPARATOR = ';'
+
+# Below this many passwords, starting worker processes costs more
+# than it saves.
+MIN_PARALLEL_PASSWORDS = 8
+
+
+@dataclass
+class BulkCreateResult:
+    """Outcome of ``CustomUserManager.bulk_create_users``."""
+
+    created: int = 0
+    skipped: list[str] = field(default_factory=list)
+
+
+def hash_passwords(
+    passwords: Sequence[str | None],
+    workers: int = 0,
+) -> list[str]:
+    """
+    Hash ``passwords`` with the configured hasher.
+
+    ``None`` yields an unusable password. Hashing is CPU bound by
+    design, so it is spread over ``workers`` processes (0: one per
+    CPU, 1: hash in this process).
+    """
+    usable = [p for p in passwords if p is not None]
+    # Worker processes need the database connections closed, which
+    # is impossible inside an atomic block.
+    in_transaction = any(
+        c.in_atomic_block for c in connections.all(initialized_only=True)
+    )
+    if (
+        workers == 1
+        or in_transaction
+        or len(usable) < MIN_PARALLEL_PASSWORDS
+    ):
+        hashed = [make_password(p) for p in usable]
+    else:
+        with process_pool(workers) as pool:
+            hashed = list(pool.map(make_password, usable, chunksize=8))
+    it = iter(hashed)
+    return [
+        make_password(None) if p is None else next(it) for p in passwords
+    ]
+
+
+def _parse_bool(value: Any) -> bool:  # noqa: ANN401
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def clean_record(record: Mapping[str, Any]) -> dict[str, Any]:
+    """Normalise one raw CSV/JSON row into keyword arguments."""
+    email = (record.get('email') or '').strip()
+    if not email:
+        raise ValueError('The Email field must be set')
+    groups = record.get('groups') or []
+    if isinstance(groups, str):
+        groups = groups.split(GROUP_SEPARATOR)
+    cleaned = {
+        'email': email,
+        'password': record.get('password') or None,
+        'groups': [g.strip() for g in groups if g.strip()],
+    }
+    for name in USER_FIELDS:
+        value = record.get(name)
+        if value in (None, ''):
+            continue
+        cleaned[name] = (
+            _parse_bool(value) if name in BOOLEAN_FIELDS else value
+        )
+    return cleaned
+
+
+def read_csv(stream: IO[str]) -> Iterator[dict[str, Any]]:
+    """Yield records from a CSV file with a header row."""
+    yield from csv.DictReader(stream)
+
+
+def read_json(stream: IO[str]) -> Iterator[dict[str, Any]]:
+    """Yield records from a JSON array of objects."""
+    data = json.load(stream)
+    if not isinstance(data, list):
+        raise ValueError('Expected a JSON array of user objects.')
+    yield from data
+
+
+READERS = {
+    'csv': read_csv,
+    'json': read_json,
+}
+
+
+def read_users(stream: IO[str], file_format: str) -> Iterable[dict]:
+    """Return an iterable of user records read from ``stream``."""
+    return READERS[file_format](stream)
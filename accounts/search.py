@@ -0,0 +1,132 @@
+# accounts/search.py
+"""
+User search backed by pg_trgm indexes on PostgreSQL.
+
+Django turns ``icontains`` and ``istartswith`` into
+``UPPER(column::text) LIKE UPPER(pattern)``. A B-tree index cannot
+serve a pattern with a leading wildcard, so on a large user table every
+admin search used to scan the whole table. A GIN index over the same
+expression with ``gin_trgm_ops`` serves both lookups; ``SEARCH_FIELDS``
+each get one.
+
+Trigram indexes need at least one trigram from the pattern: a term
+shorter than three characters matches as a prefix instead of anywhere
+in the field, which the index can still serve (the start of a word is
+padded into trigrams). A term with an ``@`` can only be part of an
+email address and searches that field alone.
+
+pg_trgm ships with PostgreSQL's contrib package. Where it is not
+installed, the migration skips the indexes and ``accounts.W001``
+reports them as missing; searching still works, only slower.
+"""
+from __future__ import annotations
+
+import functools
+import operator
+
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Q, QuerySet
+from django.utils.text import smart_split, unescape_string_literal
+
+USER_TABLE = 'accounts_customuser'
+SEARCH_FIELDS = ('email', 'first_name', 'last_name')
+TRIGRAM_LENGTH = 3
+
+
+def index_name(field: str, table: str = USER_TABLE) -> str:
+    return f'{table}_{field}_trgm'
+
+
+def trigram_available(connection: BaseDatabaseWrapper) -> bool:
+    """Whether pg_trgm is installed or can be installed."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        )
+        return cursor.fetchone() is not None
+
+
+def missing_indexes(
+    connection: BaseDatabaseWrapper,
+    table: str = USER_TABLE,
+) -> list[str]:
+    """Return the names of the trigram indexes ``table`` lacks."""
+    names = [index_name(field, table) for field in SEARCH_FIELDS]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT indexname FROM pg_indexes WHERE indexname = ANY(%s)',
+            [names],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+    return [name for name in names if name not in existing]
+
+
+def create_indexes(
+    connection: BaseDatabaseWrapper,
+    table: str = USER_TABLE,
+) -> None:
+    """
+    Install pg_trgm and index ``SEARCH_FIELDS`` of ``table``.
+
+    The indexes are built concurrently, so this has to run outside a
+    transaction; it does not block writes to a large user table.
+    """
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for field in SEARCH_FIELDS:
+            cursor.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                f'{quote(index_name(field, table))} ON {quote(table)} '
+                f'USING gin ((UPPER({quote(field)}::text)) gin_trgm_ops)'
+            )
+
+
+def drop_indexes(
+    connection: BaseDatabaseWrapper,
+    table: str = USER_TABLE,
+) -> None:
+    """Drop the indexes of ``create_indexes``; pg_trgm stays."""
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for field in SEARCH_FIELDS:
+            cursor.execute(
+                f'DROP INDEX CONCURRENTLY IF EXISTS '
+                f'{quote(index_name(field, table))}'
+            )
+
+
+def search_terms(search_term: str) -> list[str]:
+    """Split like the admin does; quoted phrases stay together."""
+    terms = []
+    for bit in smart_split(search_term):
+        term = bit
+        if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+            term = unescape_string_literal(bit)
+        if term:
+            terms.append(term)
+    return terms
+
+
+def term_filter(term: str, fields: tuple[str, ...] = SEARCH_FIELDS) -> Q:
+    """Match ``term`` in any of ``fields``, the way the indexes serve."""
+    if '@' in term and 'email' in fields:
+        fields = ('email',)
+    lookup = 'icontains' if len(term) >= TRIGRAM_LENGTH else 'istartswith'
+    return functools.reduce(
+        operator.or_,
+        (Q(**{f'{field}__{lookup}': term}) for field in fields),
+    )
+
+
+def search(
+    queryset: QuerySet,
+    search_term: str,
+    fields: tuple[str, ...] = SEARCH_FIELDS,
+) -> QuerySet:
+    """Filter ``queryset`` to the rows that match every term."""
+    for term in search_terms(search_term):
+        queryset = queryset.filter(term_filter(term, fields))
+    return queryset
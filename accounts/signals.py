@@ -0,0 +1,110 @@
+# accounts/signals.py
+"""Keep the permission cache of ``CachedPermissionBackend`` current."""
+from collections.abc import Callable
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from accounts.backends import (
+    invalidate_all_permissions,
+    invalidate_user_permissions,
+)
+
+M2M_ACTIONS = frozenset({'post_add', 'post_remove', 'post_clear'})
+# Fields of the user that ModelBackend's permission lookups depend on.
+USER_PERMISSION_FIELDS = frozenset({'is_active', 'is_staff', 'is_superuser'})
+
+
+def _invalidate(func: Callable[..., None], *args: Any) -> None:  # noqa: ANN401
+    # Now for this process, and again after commit so that a concurrent
+    # request cannot re-cache the state from before the change.
+    func(*args)
+    transaction.on_commit(lambda: func(*args))
+
+
+def user_relations_changed(
+    sender: type[Model],
+    instance: Model,
+    action: str,
+    reverse: bool,
+    pk_set: set[Any] | None,
+    **kwargs: Any,  # noqa: ANN401
+) -> None:
+    """A user's groups or direct permissions changed."""
+    if action not in M2M_ACTIONS:
+        return
+    if not reverse:
+        _invalidate(invalidate_user_permissions, [instance.pk])
+    elif pk_set:
+        _invalidate(invalidate_user_permissions, list(pk_set))
+    else:
+        # group.user_set.clear(): the affected users are unknown.
+        _invalidate(invalidate_all_permissions)
+
+
+def user_saved(
+    sender: type[Model],
+    instance: Model,
+    update_fields: frozenset[str] | None,
+    **kwargs: Any,  # noqa: ANN401
+) -> None:
+    """The user's superuser, staff or active flag may have changed."""
+    # Saves of other fields only, such as last_login on every login,
+    # keep the entry.
+    if update_fields is not None and not (
+        USER_PERMISSION_FIELDS & update_fields
+    ):
+        return
+    _invalidate(invalidate_user_permissions, [instance.pk])
+
+
+def group_permissions_changed(
+    sender: type[Model],
+    action: str,
+    **kwargs: Any,  # noqa: ANN401
+) -> None:
+    """Permissions of a group changed; all members are affected."""
+    if action in M2M_ACTIONS:
+        _invalidate(invalidate_all_permissions)
+
+
+def permission_source_deleted(
+    sender: type[Model],
+    **kwargs: Any,  # noqa: ANN401
+) -> None:
+    """Cascading deletes of a group or permission skip m2m_changed."""
+    _invalidate(invalidate_all_permissions)
+
+
+def connect() -> None:
+    """Connect the handlers; called from AccountsConfig.ready()."""
+    user_model = get_user_model()
+    for through in (
+        user_model.groups.through,
+        user_model.user_permissions.through,
+    ):
+        m2m_changed.connect(
+            user_relations_changed,
+            sender=through,
+            dispatch_uid=f'accounts.perms.{through._meta.label}',
+        )
+    post_save.connect(
+        user_saved,
+        sender=user_model,
+        dispatch_uid='accounts.perms.user_saved',
+    )
+    m2m_changed.connect(
+        group_permissions_changed,
+        sender=Group.permissions.through,
+        dispatch_uid='accounts.perms.group_permissions',
+    )
+    for model in (Group, Permission):
+        post_delete.connect(
+            permission_source_deleted,
+            sender=model,
+            dispatch_uid=f'accounts.perms.delete.{model._meta.label}',
+        )
@@ -0,0 +1,165 @@
+"""
+Tests for bulk user provisioning.
+"""
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from accounts import provisioning
+from accounts.models import CustomUser
+from accounts.tests.factories import CustomUserFactory
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('fast_hashers'),
+]
+
+
+@pytest.fixture
+def fast_hashers() -> Iterator[None]:
+    with override_settings(PASSWORD_HASHERS=FAST_HASHERS):
+        yield
+
+
+@pytest.fixture
+def analysts() -> Group:
+    return Group.objects.create(name='Analysts')
+
+
+def _records(count: int, **extra: object) -> list[dict]:
+    return [
+        {'email': f'analyst{i}@example.com', 'password': f'pw-{i}', **extra}
+        for i in range(count)
+    ]
+
+
+class TestBulkCreateUsers:
+    """CustomUser.objects.bulk_create_users()"""
+
+    def test_creates_users_with_hashed_passwords(self) -> None:
+        result = CustomUser.objects.bulk_create_users(
+            _records(3, first_name='Ada')
+        )
+        assert result.created == 3
+        user = CustomUser.objects.get(email='analyst1@example.com')
+        assert user.check_password('pw-1')
+        assert user.first_name == 'Ada'
+
+    def test_missing_password_is_unusable(self) -> None:
+        CustomUser.objects.bulk_create_users([{'email': 'a@example.com'}])
+        user = CustomUser.objects.get(email='a@example.com')
+        assert not user.has_usable_password()
+
+    def test_existing_and_duplicate_emails_are_skipped(self) -> None:
+        CustomUserFactory(email='analyst0@example.com')
+        records = [*_records(2), {'email': 'analyst1@EXAMPLE.com'}]
+        result = CustomUser.objects.bulk_create_users(records)
+        assert result.created == 1
+        assert sorted(result.skipped) == [
+            'analyst0@example.com',
+            'analyst1@example.com',
+        ]
+
+    def test_one_insert_per_batch(self, analysts: Group) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            CustomUser.objects.bulk_create_users(
+                _records(10, groups=['Analysts']), batch_size=5
+            )
+        inserts = [
+            q['sql'] for q in queries if q['sql'].startswith('INSERT')
+        ]
+        # Users and memberships: one INSERT each per batch.
+        assert len(inserts) == 4
+        assert analysts.user_set.count() == 10
+
+    def test_groups_for_everyone(self, analysts: Group) -> None:
+        Group.objects.create(name='Reviewers')
+        CustomUser.objects.bulk_create_users(
+            _records(2, groups='Reviewers'), groups=['Analysts']
+        )
+        user = CustomUser.objects.get(email='analyst0@example.com')
+        assert set(user.groups.values_list('name', flat=True)) == {
+            'Analysts',
+            'Reviewers',
+        }
+
+    def test_unknown_group(self) -> None:
+        with pytest.raises(ValueError, match='Unknown group'):
+            CustomUser.objects.bulk_create_users(_records(1, groups=['X']))
+        assert not CustomUser.objects.exists()
+
+    def test_unknown_group_in_a_later_batch(self) -> None:
+        records = [*_records(4), {'email': 'x@example.com', 'groups': 'X'}]
+        with pytest.raises(ValueError, match='Unknown group'):
+            CustomUser.objects.bulk_create_users(records, batch_size=2)
+        assert not CustomUser.objects.exists()
+
+    def test_duplicates_across_batches(self) -> None:
+        records = [*_records(3), {'email': 'analyst0@example.com'}]
+        result = CustomUser.objects.bulk_create_users(records, batch_size=2)
+        assert result.created == 3
+        assert result.skipped == ['analyst0@example.com']
+
+    def test_email_is_required(self) -> None:
+        with pytest.raises(ValueError, match='Email'):
+            CustomUser.objects.bulk_create_users([{'first_name': 'Ada'}])
+
+
+class TestImportUsersCommand:
+    """manage.py import_users"""
+
+    def test_csv(self, tmp_path: Path, analysts: Group) -> None:
+        path = tmp_path / 'users.csv'
+        path.write_text(
+            'email,password,first_name,is_staff,groups\n'
+            'ada@example.com,secret,Ada,yes,Analysts\n'
+            'bob@example.com,,Bob,no,\n'
+        )
+        call_command('import_users', str(path), '--workers=1')
+
+        ada = CustomUser.objects.get(email='ada@example.com')
+        assert ada.is_staff
+        assert ada.check_password('secret')
+        assert list(ada.groups.all()) == [analysts]
+        assert not CustomUser.objects.get(email='bob@example.com').is_staff
+
+    def test_json(self, tmp_path: Path, analysts: Group) -> None:
+        path = tmp_path / 'users.json'
+        path.write_text(json.dumps(_records(2)))
+        call_command('import_users', str(path), '--group=Analysts')
+        assert analysts.user_set.count() == 2
+
+    def test_unknown_format(self, tmp_path: Path) -> None:
+        path = tmp_path / 'users.txt'
+        path.write_text('')
+        with pytest.raises(CommandError, match='format'):
+            call_command('import_users', str(path))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_passwords_are_hashed_in_worker_processes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pools = []
+    process_pool = provisioning.process_pool
+
+    def counting_pool(workers: int) -> object:
+        pools.append(workers)
+        return process_pool(workers)
+
+    monkeypatch.setattr(provisioning, 'process_pool', counting_pool)
+    result = CustomUser.objects.bulk_create_users(
+        _records(20), batch_size=5, workers=2
+    )
+    assert result.created == 20
+    assert pools == [2]
+    user = CustomUser.objects.get(email='analyst9@example.com')
+    assert user.check_password('pw-9')
@@ -0,0 +1,114 @@
+"""
+Tests for the Argon2 profile and pooled verification in accounts.hashers.
+"""
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.test import override_settings
+
+from accounts import checks, hashers
+from accounts.models import CustomUser
+
+PASSWORD = 'correct horse battery staple'
+ARGON2 = ['accounts.hashers.Argon2PasswordHasher']
+MD5 = ['django.contrib.auth.hashers.MD5PasswordHasher']
+# Cheap enough for tests.
+FAST_ARGON2 = {'time_cost': 1, 'memory_cost': 64, 'parallelism': 1}
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def fast_argon2() -> None:
+    with override_settings(PASSWORD_ARGON2=FAST_ARGON2):
+        yield
+
+
+def _user(hasher_paths: list[str]) -> CustomUser:
+    with override_settings(PASSWORD_HASHERS=hasher_paths):
+        return CustomUser.objects.create_user(
+            email='analyst@example.com', password=PASSWORD
+        )
+
+
+def _algorithm(user: CustomUser) -> str:
+    user.refresh_from_db()
+    return user.password.split('$', 1)[0]
+
+
+def test_parameters_from_settings() -> None:
+    with override_settings(PASSWORD_HASHERS=ARGON2):
+        encoded = make_password(PASSWORD)
+        params = identify_hasher(encoded).decode(encoded)
+    assert params['memory_cost'] == FAST_ARGON2['memory_cost']
+    assert params['time_cost'] == FAST_ARGON2['time_cost']
+
+
+class TestRehash:
+    """CustomUser.check_password and acheck_password"""
+
+    def test_old_hasher_is_replaced(self) -> None:
+        user = _user(MD5)
+        with override_settings(PASSWORD_HASHERS=ARGON2 + MD5):
+            assert user.check_password(PASSWORD)
+        assert _algorithm(user) == 'argon2'
+
+    def test_changed_parameters(self) -> None:
+        user = _user(ARGON2)
+        stronger = {**FAST_ARGON2, 'time_cost': 2}
+        with override_settings(PASSWORD_ARGON2=stronger):
+            assert user.check_password(PASSWORD)
+            user.refresh_from_db()
+            params = identify_hasher(user.password).decode(user.password)
+        assert params['time_cost'] == stronger['time_cost']
+
+    def test_wrong_password_keeps_the_hash(self) -> None:
+        user = _user(MD5)
+        with override_settings(PASSWORD_HASHERS=ARGON2 + MD5):
+            assert not user.check_password('wrong')
+        assert _algorithm(user) == 'md5'
+
+    def test_async(self) -> None:
+        user = _user(MD5)
+        with override_settings(
+            PASSWORD_HASHERS=ARGON2 + MD5, PASSWORD_VERIFY_WORKERS=2
+        ):
+            assert async_to_sync(user.acheck_password)(PASSWORD)
+        assert _algorithm(user) == 'argon2'
+
+
+class TestVerificationPool:
+    """accounts.hashers.verification_pool"""
+
+    def test_off_by_default(self) -> None:
+        with override_settings(PASSWORD_VERIFY_WORKERS=0):
+            assert hashers.verification_pool() is None
+
+    def test_verifies_in_the_pool(self, monkeypatch) -> None:
+        threads = []
+
+        def verify(password: str, encoded: str) -> tuple[bool, bool]:
+            threads.append(threading.current_thread().name)
+            return True, False
+
+        monkeypatch.setattr(hashers.hashers, 'verify_password', verify)
+        with override_settings(PASSWORD_VERIFY_WORKERS=2):
+            pool = hashers.verification_pool()
+            assert pool._max_workers == 2
+            assert hashers.verify_password(PASSWORD, 'x') == (True, False)
+            async_to_sync(hashers.averify_password)(PASSWORD, 'x')
+        assert [name.split('_')[0] for name in threads] == [
+            'password-verify',
+            'password-verify',
+        ]
+
+
+def test_argon2_without_library(monkeypatch) -> None:
+    monkeypatch.setattr(checks, 'argon2_available', lambda: False)
+    with override_settings(PASSWORD_HASHERS=ARGON2 + MD5):
+        [error] = checks.check_password_hashers()
+    assert error.id == 'accounts.E001'
+    with override_settings(PASSWORD_HASHERS=MD5 + ARGON2):
+        assert checks.check_password_hashers() == []
@@ -0,0 +1,188 @@
+"""
+Tests for the cached permission backend and its invalidation.
+"""
+from collections.abc import Callable
+
+import pytest
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.test import override_settings
+
+from accounts.backends import (
+    DEFAULT_ALIAS,
+    GENERATION_KEY,
+    CachedPermissionBackend,
+    permission_cache_key,
+)
+from accounts.models import CustomUser
+from core import checks
+
+PERM = 'audittrail.view_auditlogentry'
+
+pytestmark = pytest.mark.django_db
+
+cache = caches[DEFAULT_ALIAS]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    cache.clear()
+
+
+@pytest.fixture
+def permission() -> Permission:
+    return Permission.objects.get(
+        content_type__app_label='audittrail', codename='view_auditlogentry'
+    )
+
+
+@pytest.fixture
+def group(permission: Permission) -> Group:
+    group = Group.objects.create(name='Analysts')
+    group.permissions.add(permission)
+    return group
+
+
+def _fresh(user: CustomUser) -> CustomUser:
+    """Load the user again, as the next request would."""
+    return CustomUser.objects.get(pk=user.pk)
+
+
+def test_permissions_are_served_from_cache(
+    user: CustomUser,
+    group: Group,
+    django_assert_num_queries: Callable,
+) -> None:
+    user.groups.add(group)
+    assert _fresh(user).has_perm(PERM)
+
+    fresh = _fresh(user)
+    with django_assert_num_queries(0):
+        assert fresh.has_perm(PERM)
+        assert not fresh.has_perm('audittrail.delete_auditlogentry')
+
+
+def test_adding_user_to_group(user: CustomUser, group: Group) -> None:
+    assert not _fresh(user).has_perm(PERM)
+    user.groups.add(group)
+    assert _fresh(user).has_perm(PERM)
+
+
+def test_adding_user_via_group(user: CustomUser, group: Group) -> None:
+    assert not _fresh(user).has_perm(PERM)
+    group.user_set.add(user)
+    assert _fresh(user).has_perm(PERM)
+
+
+def test_clearing_group_members(user: CustomUser, group: Group) -> None:
+    user.groups.add(group)
+    assert _fresh(user).has_perm(PERM)
+    group.user_set.clear()
+    assert not _fresh(user).has_perm(PERM)
+
+
+def test_direct_user_permission(
+    user: CustomUser,
+    permission: Permission,
+) -> None:
+    assert not _fresh(user).has_perm(PERM)
+    user.user_permissions.add(permission)
+    assert _fresh(user).has_perm(PERM)
+
+
+def test_changing_group_permissions(
+    user: CustomUser,
+    group: Group,
+    permission: Permission,
+) -> None:
+    user.groups.add(group)
+    assert _fresh(user).has_perm(PERM)
+    group.permissions.remove(permission)
+    assert not _fresh(user).has_perm(PERM)
+
+
+def test_deleting_group(user: CustomUser, group: Group) -> None:
+    user.groups.add(group)
+    assert _fresh(user).has_perm(PERM)
+    group.delete()
+    assert not _fresh(user).has_perm(PERM)
+
+
+def test_demoting_superuser(superuser: CustomUser) -> None:
+    perm = 'auth.delete_group'
+    assert _fresh(superuser).get_all_permissions()
+    superuser.is_superuser = False
+    superuser.save()
+    fresh = _fresh(superuser)
+    assert not fresh.has_perm(perm)
+    assert fresh.get_all_permissions() == set()
+
+
+def test_demoting_superuser_without_signals(superuser: CustomUser) -> None:
+    assert _fresh(superuser).get_all_permissions()
+    CustomUser.objects.filter(pk=superuser.pk).update(is_superuser=False)
+    assert _fresh(superuser).get_all_permissions() == set()
+
+
+def test_deactivating_user(user: CustomUser, group: Group) -> None:
+    user.groups.add(group)
+    assert _fresh(user).has_perm(PERM)
+    user.is_active = False
+    user.save()
+    assert not _fresh(user).has_perm(PERM)
+    # Reactivated without its group, the user does not get the old entry.
+    user.groups.remove(group)
+    cache.set(
+        permission_cache_key(user.pk, cache.get(GENERATION_KEY)),
+        {'user': set(), 'group': {PERM}},
+    )
+    user.is_active = True
+    user.save(update_fields=['is_active'])
+    assert not _fresh(user).has_perm(PERM)
+
+
+def test_unrelated_saves_keep_the_entry(
+    user: CustomUser,
+    group: Group,
+    django_assert_num_queries: Callable,
+) -> None:
+    user.groups.add(group)
+    assert _fresh(user).has_perm(PERM)
+    user.save(update_fields=['last_login'])
+    fresh = _fresh(user)
+    with django_assert_num_queries(0):
+        assert fresh.has_perm(PERM)
+
+
+def test_inactive_user_is_not_cached(user: CustomUser, group: Group) -> None:
+    user.groups.add(group)
+    user.is_active = False
+    assert CachedPermissionBackend().get_all_permissions(user) == set()
+
+
+def test_invalidation_after_commit(
+    user: CustomUser,
+    group: Group,
+    django_capture_on_commit_callbacks: Callable,
+) -> None:
+    """An entry cached before the commit is dropped again afterwards."""
+    with django_capture_on_commit_callbacks(execute=True):
+        user.groups.add(group)
+        # A concurrent request caches the state before the commit.
+        key = permission_cache_key(user.pk, cache.get(GENERATION_KEY))
+        cache.set(key, {'user': set(), 'group': set()})
+        assert not _fresh(user).has_perm(PERM)
+
+    assert _fresh(user).has_perm(PERM)
+
+
+def test_local_permission_cache_warning() -> None:
+    with override_settings(DEBUG=False):
+        [warning] = checks.check_permission_cache()
+    assert warning.id == 'core.W007'
+    shared = 'django.core.cache.backends.redis.RedisCache'
+    with override_settings(
+        DEBUG=False,
+        CACHES={DEFAULT_ALIAS: {'BACKEND': shared}},
+    ):
+        assert checks.check_permission_cache() == []
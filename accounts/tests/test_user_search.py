@@ -0,0 +1,150 @@
+"""
+Tests for the user search and the changelist paginator.
+"""
+import pytest
+from django.core.checks import Warning
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts import search
+from accounts.checks import check_trigram_indexes
+from accounts.models import CustomUser
+from accounts.tests.factories import CustomUserFactory
+from core.pagination import EstimatedCountPaginator, estimate_count
+
+pytestmark = pytest.mark.django_db
+
+
+class EstimateAll(EstimatedCountPaginator):
+    exact_below = 0
+
+
+@pytest.fixture
+def users() -> list[CustomUser]:
+    return [
+        CustomUserFactory(
+            email='ada@lab.example', first_name='Ada', last_name='Lovelace'
+        ),
+        CustomUserFactory(
+            email='alan@lab.example', first_name='Alan', last_name='Turing'
+        ),
+        CustomUserFactory(
+            email='grace@navy.example', first_name='Grace', last_name='Hopper'
+        ),
+    ]
+
+
+def _emails(search_term: str) -> list[str]:
+    queryset = search.search(CustomUser.objects.order_by('email'), search_term)
+    return list(queryset.values_list('email', flat=True))
+
+
+class TestSearch:
+    """accounts.search.search"""
+
+    def test_every_term_must_match(self, users: list[CustomUser]) -> None:
+        assert _emails('lab') == ['ada@lab.example', 'alan@lab.example']
+        assert _emails('lab turing') == ['alan@lab.example']
+
+    def test_short_terms_match_prefixes(
+        self,
+        users: list[CustomUser],
+    ) -> None:
+        # "Grace" and "Hopper" contain an "r", but none starts with it.
+        assert _emails('r') == []
+        assert _emails('ho') == ['grace@navy.example']
+
+    def test_email_terms_only_search_emails(self) -> None:
+        assert str(search.term_filter('a@b')) == str(
+            search.term_filter('a@b', ('email',))
+        )
+
+    def test_quoted_phrases(self, users: list[CustomUser]) -> None:
+        assert search.search_terms('"Ada Lovelace" x') == ['Ada Lovelace', 'x']
+
+    def test_lookups_match_the_index_expression(self) -> None:
+        queryset = search.search(CustomUser.objects.all(), 'ada')
+        sql = str(queryset.query)
+        assert 'UPPER("accounts_customuser"."email"::text) LIKE' in sql
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'postgresql',
+    reason='Trigram indexes need PostgreSQL.',
+)
+class TestIndexes:
+    """accounts.search index management and accounts.W001"""
+
+    def test_missing_indexes_are_reported(self) -> None:
+        # Tests run without migrations, so the indexes do not exist.
+        [warning] = check_trigram_indexes(databases=['default'])
+        assert isinstance(warning, Warning)
+        assert warning.id == 'accounts.W001'
+        for field in search.SEARCH_FIELDS:
+            assert search.index_name(field) in warning.msg
+
+    @pytest.mark.django_db(transaction=True)
+    def test_create_and_drop(self) -> None:
+        if not search.trigram_available(connection):
+            pytest.skip('pg_trgm is not installed.')
+        search.create_indexes(connection)
+        try:
+            assert search.missing_indexes(connection) == []
+            assert check_trigram_indexes(databases=['default']) == []
+        finally:
+            search.drop_indexes(connection)
+        assert len(search.missing_indexes(connection)) == len(
+            search.SEARCH_FIELDS
+        )
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'postgresql',
+    reason='Count estimates need PostgreSQL.',
+)
+class TestEstimatedCountPaginator:
+    """core.pagination.EstimatedCountPaginator"""
+
+    def test_small_counts_are_exact(self, users: list[CustomUser]) -> None:
+        paginator = EstimatedCountPaginator(
+            CustomUser.objects.order_by('email'), 2
+        )
+        assert paginator.count == len(users)
+
+    def test_unfiltered_count_from_the_statistics(
+        self,
+        users: list[CustomUser],
+    ) -> None:
+        queryset = CustomUser.objects.order_by('email')
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE accounts_customuser')
+        with CaptureQueriesContext(connection) as queries:
+            count = EstimateAll(queryset, 2).count
+        assert count == len(users)
+        assert 'pg_class' in queries[0]['sql']
+
+    def test_filtered_count_from_the_plan(
+        self,
+        users: list[CustomUser],
+    ) -> None:
+        queryset = CustomUser.objects.filter(email__icontains='lab')
+        queryset = queryset.order_by('email')
+        with CaptureQueriesContext(connection) as queries:
+            count = EstimateAll(queryset, 2).count
+        assert count == estimate_count(queryset)
+        assert queries[0]['sql'].startswith('EXPLAIN')
+
+    def test_changelist_counts_once(
+        self,
+        admin_client: Client,
+        users: list[CustomUser],
+    ) -> None:
+        url = reverse('admin:accounts_customuser_changelist')
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(url, {'q': 'lab'})
+        assert response.status_code == 200
+        assert list(response.context['cl'].result_list) == users[:2]
+        counts = [q for q in queries if 'COUNT(*)' in q['sql']]
+        assert len(counts) == 1
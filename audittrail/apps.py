@@ -1,4 +1,7 @@
 from django.apps import AppConfig
+from django.core import checks
+
+from audittrail.checks import check_auditlog_settings
 
 
 class AudittrailConfig(AppConfig):
@@ -6,6 +9,5 @@ class AudittrailConfig(AppConfig):
     name = 'audittrail'
     verbose_name = 'Audit Trail & Logging'
 
-def ready(self: AudittrailConfig) -> None:
-
-        pass
+    def ready(self) -> None:
+        checks.register(check_auditlog_settings)
@@ -0,0 +1,129 @@
+# audittrail/buffer.py
+"""
+Transaction-scoped buffering of audit log entries.
+
+Instead of one INSERT per audited save, log entries created inside an
+atomic block are collected here and written with a single
+``bulk_create`` once the surrounding transaction commits. Entries that
+belong to a rolled back transaction or savepoint are discarded together
+with the data they describe.
+"""
+from __future__ import annotations
+
+import weakref
+from functools import partial
+from typing import TYPE_CHECKING, Callable
+
+from asgiref.local import Local
+from django.conf import settings
+from django.db import transaction
+
+from audittrail.chain import write_entries
+
+if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper
+
+    from audittrail.models import AuditLogEntry
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def buffering_enabled() -> bool:
+    """Return True if audit log entries should be written in bulk."""
+    return getattr(settings, 'AUDITTRAIL_BUFFERED_WRITES', True)
+
+
+def get_batch_size() -> int:
+    """Return the maximum number of rows per INSERT statement."""
+    return getattr(
+        settings, 'AUDITTRAIL_BUFFER_BATCH_SIZE', DEFAULT_BATCH_SIZE
+    )
+
+
+class _PendingGroup:
+    """Entries created within the same savepoint; their own flush hook."""
+
+    def __init__(self, flush: Callable[[], None]) -> None:
+        self._flush = flush
+        self.entries: list[AuditLogEntry] = []
+
+    def __call__(self) -> None:
+        self._flush()
+
+
+class AuditLogBuffer:
+    """
+    Collect audit log entries per transaction and flush them on commit.
+
+    Flushing goes through :func:`audittrail.chain.write_entries`, which
+    links the batch to the audit hash chain before inserting it.
+
+    Entries are grouped by the savepoints that were active when they
+    were created. Every group is registered as an ``on_commit`` hook,
+    so Django's own savepoint bookkeeping decides whether a group is
+    written or dropped. In the common case of a bulk edit inside a
+    single ``atomic()`` block this results in one ``bulk_create``.
+    The buffer only holds weak references to the groups: when a
+    rollback discards a hook, its entries are freed along with it.
+
+    State is kept per thread (or per async task) and per database
+    alias, mirroring how Django scopes its database connections.
+    """
+
+    def __init__(self) -> None:
+        self._local = Local()
+
+    def _groups(
+        self,
+        using: str,
+    ) -> weakref.WeakValueDictionary[frozenset[str], _PendingGroup]:
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            state = self._local.state = {}
+        return state.setdefault(using, weakref.WeakValueDictionary())
+
+    def _prune(
+        self,
+        connection: BaseDatabaseWrapper,
+        groups: weakref.WeakValueDictionary[frozenset[str], _PendingGroup],
+    ) -> None:
+        """Forget groups whose hook was discarded but is still alive."""
+        registered = {func for _, func, _ in connection.run_on_commit}
+        for key in [
+            key for key, group in groups.items() if group not in registered
+        ]:
+            del groups[key]
+
+    def add(self, entry: AuditLogEntry, using: str) -> None:
+        """Queue ``entry`` until the current transaction commits."""
+        connection = transaction.get_connection(using)
+        groups = self._groups(using)
+        self._prune(connection, groups)
+
+        key = frozenset(connection.savepoint_ids)
+        group = groups.get(key)
+        if group is None:
+            group = _PendingGroup(partial(self.flush, using, key))
+            groups[key] = group
+            transaction.on_commit(group, using=using)
+        group.entries.append(entry)
+
+    def pending(self, using: str) -> int:
+        """Return the number of entries still waiting for a commit."""
+        return sum(
+            len(group.entries) for group in self._groups(using).values()
+        )
+
+    def flush(self, using: str, key: frozenset[str]) -> None:
+        """Write all entries of one group with a single bulk INSERT."""
+        group = self._groups(using).pop(key, None)
+        if group is None or not group.entries:
+            return
+        write_entries(group.entries, using, batch_size=get_batch_size())
+
+    def clear(self) -> None:
+        """Drop all pending entries of the current thread."""
+        self._local.state = {}
+
+
+audit_buffer = AuditLogBuffer()
@@ -0,0 +1,338 @@
+# audittrail/chain.py
+"""
+SHA-256 hash chain over the audit log.
+
+Every entry stores the hash of its predecessor (``previous_hash``) and
+its own ``entry_hash`` = SHA-256 over a canonical serialisation of its
+content plus ``previous_hash``. Changing, deleting or inserting a row
+anywhere breaks the chain from that point on.
+
+Entries are sealed under a database lock right before they are
+inserted, so chain order equals ``id`` order even with concurrent
+writers. ``AuditCheckpoint`` rows record verified ranges together with
+their Merkle root, which lets verification resume where it stopped.
+"""
+from __future__ import annotations
+
+import datetime
+import hashlib
+import ipaddress
+import json
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps
+from django.db import connections, transaction
+
+if TYPE_CHECKING:
+    from django.db.models import Model
+
+    from audittrail.models import AuditLogEntry
+
+GENESIS_HASH = '0' * 64
+
+# Stable lock key for pg_advisory_xact_lock(); any 64-bit integer works.
+CHAIN_LOCK_ID = 0x617564697463686E  # "auditchn"
+
+HASHED_FIELDS = (
+    'timestamp',
+    'content_type_id',
+    'object_pk',
+    'object_id',
+    'object_repr',
+    'serialized_data',
+    'action',
+    'changes_text',
+    'changes',
+    'actor_id',
+    'actor_email',
+    'cid',
+    'remote_addr',
+    'remote_port',
+    'additional_data',
+)
+
+VERIFY_FIELDS = ('id', 'previous_hash', 'entry_hash', *HASHED_FIELDS)
+
+
+def _canonical(value: Any) -> Any:  # noqa: ANN401
+    """Return ``value`` in a form that survives a database round trip."""
+    if isinstance(value, datetime.datetime):
+        return value.astimezone(datetime.UTC).isoformat(
+            timespec='microseconds'
+        )
+    if isinstance(value, ipaddress.IPv4Address | ipaddress.IPv6Address):
+        return value.compressed
+    return value
+
+
+def canonical_values(
+    model: type[Model],
+    values: Mapping[str, Any],
+) -> dict[str, Any]:
+    """Normalise raw field values the same way for writes and reads."""
+    result = {}
+    for name in HASHED_FIELDS:
+        model_field = model._meta.get_field(name)
+        value = values[name]
+        if value is not None and not model_field.is_relation:
+            value = model_field.to_python(value)
+        if value is not None and name == 'remote_addr':
+            value = ipaddress.ip_address(str(value))
+        result[name] = _canonical(value)
+    return result
+
+
+def entry_digest(
+    model: type[Model],
+    values: Mapping[str, Any],
+    previous_hash: str,
+) -> str:
+    """Return the SHA-256 hex digest chaining ``values`` to its predecessor."""
+    payload = canonical_values(model, values)
+    payload['previous_hash'] = previous_hash
+    data = json.dumps(
+        payload,
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _instance_values(entry: Model) -> dict[str, Any]:
+    return {name: getattr(entry, name) for name in HASHED_FIELDS}
+
+
+def lock_chain(using: str) -> None:
+    """Serialise chain writers until the current transaction ends."""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        # SQLite and friends serialise writers on their own.
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)', [CHAIN_LOCK_ID])
+
+
+def chain_head(model: type[AuditLogEntry], using: str) -> str:
+    """Return the hash of the most recently sealed entry."""
+    last = (
+        model._base_manager.using(using)
+        .exclude(entry_hash='')
+        .order_by('-id')
+        .values_list('entry_hash', flat=True)
+        .first()
+    )
+    return last or GENESIS_HASH
+
+
+def seal_entries(entries: Sequence[AuditLogEntry], using: str) -> None:
+    """
+    Link ``entries`` to the chain, in order.
+
+    Must be called inside ``transaction.atomic()``; the caller has to
+    insert the entries before that transaction commits so the lock
+    covers both reading the chain head and extending it.
+    """
+    if not entries:
+        return
+    if not transaction.get_connection(using).in_atomic_block:
+        raise transaction.TransactionManagementError(
+            'seal_entries() requires an atomic block.'
+        )
+    model = type(entries[0])
+    lock_chain(using)
+    previous = chain_head(model, using)
+    for entry in entries:
+        entry.previous_hash = previous
+        entry.entry_hash = entry_digest(
+            model, _instance_values(entry), previous
+        )
+        previous = entry.entry_hash
+
+
+def write_entries(
+    entries: Sequence[AuditLogEntry],
+    using: str,
+    batch_size: int | None = None,
+) -> None:
+    """Seal ``entries`` and insert them with one bulk INSERT per batch."""
+    if not entries:
+        return
+    model = type(entries[0])
+    with transaction.atomic(using=using):
+        seal_entries(entries, using)
+        model._base_manager.db_manager(using).bulk_create(
+            entries,
+            batch_size=batch_size,
+        )
+
+
+# ----------------------------------------------------------------------
+# Merkle roots
+# ----------------------------------------------------------------------
+
+def _leaf(digest: str) -> bytes:
+    return hashlib.sha256(b'\x00' + bytes.fromhex(digest)).digest()
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b'\x01' + left + right).digest()
+
+
+def merkle_root(entry_hashes: Iterable[str]) -> str:
+    """
+    Return the Merkle root over ``entry_hashes`` as hex.
+
+    Leaves and inner nodes use distinct prefixes (as in RFC 6962); an
+    odd node at the end of a level is promoted unchanged.
+    """
+    level = [_leaf(h) for h in entry_hashes]
+    if not level:
+        return hashlib.sha256(b'').hexdigest()
+    while len(level) > 1:
+        paired = [
+            _node(level[i], level[i + 1])
+            for i in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0].hex()
+
+
+class MerkleBuilder:
+    """
+    ``merkle_root()`` over hashes added one at a time.
+
+    Only the roots of the complete subtrees built so far are kept, one
+    per set bit of the count, so memory stays logarithmic.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._subtrees: list[bytes] = []
+
+    def add(self, entry_hash: str) -> None:
+        node = _leaf(entry_hash)
+        self.count += 1
+        # Like a carry in binary addition: merge equal-sized subtrees.
+        size = self.count
+        while size % 2 == 0:
+            node = _node(self._subtrees.pop(), node)
+            size //= 2
+        self._subtrees.append(node)
+
+    def root(self) -> str:
+        if not self._subtrees:
+            return hashlib.sha256(b'').hexdigest()
+        # Smaller subtrees are the odd nodes merkle_root() promotes.
+        node = self._subtrees[-1]
+        for left in reversed(self._subtrees[:-1]):
+            node = _node(left, node)
+        return node.hex()
+
+
+# ----------------------------------------------------------------------
+# Verification
+# ----------------------------------------------------------------------
+
+@dataclass
+class RangeResult:
+    """Outcome of verifying the entries of one ID range."""
+
+    first_id: int | None = None
+    last_id: int | None = None
+    first_previous_hash: str | None = None
+    last_entry_hash: str | None = None
+    entry_ids: list[int] = field(default_factory=list)
+    entry_hashes: list[str] = field(default_factory=list)
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.entry_hashes)
+
+
+def _rows(
+    model: type[AuditLogEntry],
+    using: str,
+    first_id: int,
+    last_id: int,
+    chunk_size: int,
+) -> Iterator[dict[str, Any]]:
+    return (
+        model._base_manager.using(using)
+        .filter(id__gte=first_id, id__lte=last_id)
+        .order_by('id')
+        .values(*VERIFY_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def verify_range(
+    first_id: int,
+    last_id: int,
+    using: str = 'default',
+    chunk_size: int = 2000,
+) -> RangeResult:
+    """
+    Recompute and check the hashes of entries with IDs in the range.
+
+    Links *inside* the range are checked here; the caller checks that
+    consecutive ranges connect. Safe to run in a worker process.
+    """
+    model = apps.get_model('audittrail', 'AuditLogEntry')
+    result = RangeResult()
+    previous = None
+    for row in _rows(model, using, first_id, last_id, chunk_size):
+        if result.first_id is None:
+            result.first_id = row['id']
+            result.first_previous_hash = row['previous_hash']
+        elif row['previous_hash'] != previous:
+            result.errors.append((row['id'], 'broken link to predecessor'))
+
+        if not row['entry_hash']:
+            result.errors.append((row['id'], 'entry is not sealed'))
+        elif row['entry_hash'] != entry_digest(
+            model, row, row['previous_hash']
+        ):
+            result.errors.append((row['id'], 'content does not match hash'))
+
+        previous = row['entry_hash']
+        result.last_id = row['id']
+        result.entry_ids.append(row['id'])
+        result.entry_hashes.append(row['entry_hash'] or GENESIS_HASH)
+    result.last_entry_hash = previous
+    return result
+
+
+@dataclass
+class JoinedRanges:
+    """
+    Consecutive range results, checked for the links between them.
+
+    Only the ends of the chain are kept, not its entry hashes. With
+    ``last_entry_hash`` None, the first entry may link to any hash.
+    """
+
+    last_entry_hash: str | None
+    first_id: int | None = None
+    last_id: int | None = None
+    count: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    def add(self, result: RangeResult) -> None:
+        if not result.count:
+            return
+        if self.last_entry_hash not in (None, result.first_previous_hash):
+            self.errors.append(
+                (result.first_id, 'broken link to predecessor')
+            )
+        if self.first_id is None:
+            self.first_id = result.first_id
+        self.last_id = result.last_id
+        self.count += result.count
+        self.errors.extend(result.errors)
+        self.last_entry_hash = result.last_entry_hash
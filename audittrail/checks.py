@@ -0,0 +1,34 @@
+# audittrail/checks.py
+from typing import Any, List
+
+from django.conf import settings
+from django.core.checks import Error, Warning
+
+AUDIT_MODEL = 'audittrail.AuditLogEntry'
+CID_GETTER = 'cid.locals.get_cid'
+
+
+def check_auditlog_settings(
+    app_configs: Any = None,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> List[Error | Warning]:
+    """Ensure auditlog writes through the buffered audittrail model."""
+    errors: List[Error | Warning] = []
+    model = getattr(settings, 'AUDITLOG_LOGENTRY_MODEL', 'auditlog.LogEntry')
+    if model != AUDIT_MODEL:
+        errors.append(
+            Error(
+                f'AUDITLOG_LOGENTRY_MODEL must be {AUDIT_MODEL!r}.',
+                hint='Buffered audit writes require the audittrail model.',
+                id='audittrail.E001',
+            )
+        )
+    if getattr(settings, 'AUDITLOG_CID_GETTER', None) != CID_GETTER:
+        errors.append(
+            Warning(
+                'Audit entries will not carry the django-cid correlation ID.',
+                hint=f'Set AUDITLOG_CID_GETTER = {CID_GETTER!r}.',
+                id='audittrail.W001',
+            )
+        )
+    return errors
@@ -0,0 +1,241 @@
+# audittrail/export.py
+"""
+Streaming export of the audit log as CSV or NDJSON.
+
+Rows are read with a server-side cursor (``QuerySet.iterator()``) and
+rendered one at a time, so memory use does not grow with the size of
+the export. The same generators back the export view and the
+``export_audit_log`` management command. Under ASGI the view streams
+them through ``aiter_blocks()``: Django reads a synchronous iterator
+into a list before it sends the first byte.
+"""
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+import zlib
+from collections.abc import AsyncIterator, Iterable, Iterator
+from typing import TYPE_CHECKING, Any
+
+from asgiref.sync import sync_to_async
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+
+from audittrail.models import AuditLogEntry
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Collect small rows into chunks of roughly this size before they are
+# handed to the WSGI server or compressed.
+WRITE_BUFFER_SIZE = 64 * 1024
+
+EXPORT_FIELDS = (
+    'id',
+    'timestamp',
+    'cid',
+    'action',
+    'content_type__app_label',
+    'content_type__model',
+    'object_pk',
+    'object_id',
+    'object_repr',
+    'changes',
+    'actor_id',
+    'actor_email',
+    'remote_addr',
+    'remote_port',
+    'additional_data',
+    'previous_hash',
+    'entry_hash',
+)
+
+COLUMNS = (
+    'id',
+    'timestamp',
+    'cid',
+    'action',
+    'content_type',
+    'object_pk',
+    'object_id',
+    'object_repr',
+    'changes',
+    'actor_id',
+    'actor_email',
+    'remote_addr',
+    'remote_port',
+    'additional_data',
+    'previous_hash',
+    'entry_hash',
+)
+
+# Columns that hold JSON and are encoded as JSON text in CSV cells.
+JSON_COLUMNS = frozenset({'changes', 'additional_data'})
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def filter_entries(
+    *,
+    since: datetime.datetime | None = None,
+    until: datetime.datetime | None = None,
+    model: str | None = None,
+    cid: str | None = None,
+) -> QuerySet[AuditLogEntry]:
+    """
+    Return the audit entries selected for an export.
+
+    ``model`` is given as ``'app_label.model'``; an unknown model raises
+    ``ValueError``. Time bounds are half-open (``since <= t < until``).
+    """
+    entries = (
+        AuditLogEntry.objects.for_cid(cid)
+        if cid
+        else AuditLogEntry.objects.all()
+    )
+    if since is not None:
+        entries = entries.filter(timestamp__gte=since)
+    if until is not None:
+        entries = entries.filter(timestamp__lt=until)
+    if model:
+        app_label, _, model_name = model.lower().partition('.')
+        try:
+            content_type = ContentType.objects.get_by_natural_key(
+                app_label, model_name
+            )
+        except ContentType.DoesNotExist:
+            raise ValueError(f'Unknown model {model!r}.') from None
+        entries = entries.filter(content_type=content_type)
+    return entries
+
+
+def flatten_content_type(row: dict[str, Any]) -> dict[str, Any]:
+    """Replace the content type lookups of ``row`` by ``app_label.model``."""
+    app_label = row.pop('content_type__app_label')
+    model = row.pop('content_type__model')
+    row['content_type'] = f'{app_label}.{model}'
+    return row
+
+
+def iter_rows(
+    entries: QuerySet[AuditLogEntry],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """Yield export rows in chain order using a server-side cursor."""
+    values = entries.order_by('id').values(*EXPORT_FIELDS)
+    for row in values.iterator(chunk_size=chunk_size):
+        yield flatten_content_type(row)
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the written value."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_cell(column: str, value: Any) -> Any:  # noqa: ANN401
+    if value is None:
+        return ''
+    if column in JSON_COLUMNS:
+        return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def render_csv(rows: Iterable[dict[str, Any]]) -> Iterator[str]:
+    """Yield the CSV header and one line per row."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(COLUMNS)
+    for row in rows:
+        yield writer.writerow(
+            [_csv_cell(column, row[column]) for column in COLUMNS]
+        )
+
+
+def render_ndjson(rows: Iterable[dict[str, Any]]) -> Iterator[str]:
+    """Yield one JSON document per line."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode({column: row[column] for column in COLUMNS})
+        yield '\n'
+
+
+RENDERERS = {
+    'csv': render_csv,
+    'ndjson': render_ndjson,
+}
+
+FORMATS = tuple(RENDERERS)
+
+
+def encode(
+    chunks: Iterable[str],
+    buffer_size: int = WRITE_BUFFER_SIZE,
+) -> Iterator[bytes]:
+    """Encode ``chunks`` as UTF-8, joined into blocks of ``buffer_size``."""
+    pending: list[str] = []
+    size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            yield ''.join(pending).encode('utf-8')
+            pending, size = [], 0
+    if pending:
+        yield ''.join(pending).encode('utf-8')
+
+
+def compress(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip ``blocks`` incrementally."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for block in blocks:
+        data = compressor.compress(block)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export(
+    entries: QuerySet[AuditLogEntry],
+    export_format: str,
+    *,
+    gzip: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Return a byte stream with ``entries`` rendered as ``export_format``."""
+    render = RENDERERS[export_format]
+    stream = encode(render(iter_rows(entries, chunk_size)))
+    if gzip:
+        stream = compress(stream)
+    return stream
+
+
+async def aiter_blocks(stream: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Yield the blocks of ``stream`` on the event loop.
+
+    Each block is produced in the thread the database connection
+    belongs to; the stream (and its cursor) is closed when iteration
+    ends or is abandoned.
+    """
+    fetch = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (block := await fetch(stream, None)) is not None:
+            yield block
+    finally:
+        await sync_to_async(stream.close, thread_sensitive=True)()
+
+
+def filename(export_format: str, *, gzip: bool = False) -> str:
+    """Return a download file name for an export started now."""
+    stamp = datetime.datetime.now(datetime.UTC).strftime('%Y%m%dT%H%M%SZ')
+    suffix = '.gz' if gzip else ''
+    return f'audit-log-{stamp}.{export_format}{suffix}'
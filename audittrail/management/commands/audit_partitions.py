@@ -0,0 +1,118 @@
+# audittrail/management/commands/audit_partitions.py
+"""
+Maintain the monthly partitions of the audit log table.
+
+Run this regularly (e.g. daily from cron) so partitions exist before
+they are needed:
+
+    python manage.py audit_partitions --months-ahead 3
+
+Old partitions can be detached for archival. They are kept as regular
+tables and never dropped:
+
+    python manage.py audit_partitions --retain-months 24 \\
+        --archive-schema audit_archive
+"""
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from audittrail import partitioning
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming and detach old monthly audit log partitions.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=partitioning.DEFAULT_MONTHS_AHEAD,
+            help='Number of future months to pre-create partitions for.',
+        )
+        parser.add_argument(
+            '--retain-months',
+            type=int,
+            default=None,
+            help=(
+                'Detach partitions older than this many months. '
+                'Without this option nothing is detached.'
+            ),
+        )
+        parser.add_argument(
+            '--archive-schema',
+            default=None,
+            help='Move detached partitions into this schema.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report what would be done.',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database alias to operate on.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        connection = connections[options['database']]
+        if not partitioning.is_partitioned(connection):
+            raise CommandError(
+                'The audit log table is not partitioned. '
+                'Partitioning requires PostgreSQL; run "migrate" first.'
+            )
+        retain = options['retain_months']
+        if options['months_ahead'] < 0:
+            raise CommandError('--months-ahead must not be negative.')
+        if retain is not None and retain < 1:
+            raise CommandError('--retain-months must be at least 1.')
+
+        today = timezone.now().date()
+        current = partitioning.month_start(today)
+        existing = {p.month for p in partitioning.list_partitions(connection)}
+        wanted = [
+            partitioning.add_months(current, n)
+            for n in range(options['months_ahead'] + 1)
+        ]
+        to_detach = []
+        if retain is not None:
+            cutoff = partitioning.add_months(current, -retain)
+            to_detach = [
+                p
+                for p in partitioning.list_partitions(connection)
+                if p.end <= cutoff
+            ]
+
+        if options['dry_run']:
+            for month in wanted:
+                if month not in existing:
+                    self.stdout.write(
+                        f'Would create {partitioning.partition_name(month)}'
+                    )
+            for partition in to_detach:
+                self.stdout.write(f'Would detach {partition.name}')
+            return
+
+        with transaction.atomic(using=options['database']):
+            created = partitioning.ensure_partitions(
+                connection, today, options['months_ahead']
+            )
+            detached = [
+                partitioning.detach_partition(
+                    connection,
+                    partition,
+                    archive_schema=options['archive_schema'],
+                )
+                for partition in to_detach
+            ]
+
+        for name in created:
+            self.stdout.write(self.style.SUCCESS(f'Created {name}'))
+        for name in detached:
+            self.stdout.write(self.style.SUCCESS(f'Detached {name}'))
+        if not created and not detached:
+            self.stdout.write('Audit log partitions are up to date.')
@@ -0,0 +1,280 @@
+# audittrail/management/commands/verify_audit_chain.py
+"""
+Verify the audit log hash chain.
+
+By default only entries written after the most recent checkpoint are
+checked, and a new checkpoint is recorded if they are intact. Run it
+regularly (e.g. nightly from cron):
+
+    python manage.py verify_audit_chain --workers 4
+
+``--full`` re-verifies the chain from the first attached entry and
+cross-checks all existing checkpoints. Checkpoints of entries in
+partitions detached by ``audit_partitions`` are skipped; the chain then
+starts from the last of them, or from the end of a checkpoint the
+oldest attached partition only partly holds. The printed chain hash
+can be archived outside the database as an external anchor.
+
+Range results are streamed and Merkle roots built incrementally, so
+memory does not grow with the length of the chain.
+"""
+from argparse import ArgumentParser
+from collections import deque
+from collections.abc import Iterable, Iterator
+from functools import partial
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Max, Min
+
+from audittrail import chain
+from audittrail.models import AuditCheckpoint, AuditLogEntry
+from core.processes import process_pool
+
+DEFAULT_RANGE_SIZE = 50_000
+MAX_REPORTED_ERRORS = 20
+
+
+def _id_ranges(
+    first_id: int,
+    last_id: int,
+    size: int,
+) -> Iterator[tuple[int, int]]:
+    for start in range(first_id, last_id + 1, size):
+        yield start, min(start + size - 1, last_id)
+
+
+class _CheckpointCheck:
+    """
+    Compare recorded checkpoints with the chain as it streams past.
+
+    ``checkpoints`` are ordered by ``last_entry_id`` and none ends
+    before ``first_id``, the first attached entry. A checkpoint that
+    starts before it can only be checked against its chain hash.
+    """
+
+    def __init__(
+        self,
+        checkpoints: Iterable[AuditCheckpoint],
+        first_id: int,
+    ) -> None:
+        self.first_id = first_id
+        self.errors: list[tuple[int, str]] = []
+        self._pending = deque(checkpoints)
+        self._covered: chain.MerkleBuilder | None = None
+
+    def add(self, entry_id: int, entry_hash: str) -> None:
+        pending = self._pending
+        while pending and pending[0].last_entry_id < entry_id:
+            self._missing(pending.popleft())
+        if not pending or entry_id < pending[0].first_entry_id:
+            return
+        checkpoint = pending[0]
+        if entry_id == checkpoint.first_entry_id:
+            self._covered = chain.MerkleBuilder()
+        if self._covered is not None:
+            self._covered.add(entry_hash)
+        if entry_id != checkpoint.last_entry_id:
+            return
+        pending.popleft()
+        covered, self._covered = self._covered, None
+        if covered is None:
+            if checkpoint.first_entry_id >= self.first_id:
+                self._missing(checkpoint)
+                return
+            matches = entry_hash == checkpoint.chain_hash
+        else:
+            matches = (
+                entry_hash == checkpoint.chain_hash
+                and covered.count == checkpoint.entry_count
+                and covered.root() == checkpoint.merkle_root
+            )
+        if not matches:
+            self.errors.append((
+                checkpoint.last_entry_id,
+                'checkpoint does not match the chain',
+            ))
+
+    def finish(self) -> list[tuple[int, str]]:
+        while self._pending:
+            self._missing(self._pending.popleft())
+        return self.errors
+
+    def _missing(self, checkpoint: AuditCheckpoint) -> None:
+        self._covered = None
+        self.errors.append((
+            checkpoint.last_entry_id,
+            'checkpoint refers to a missing entry',
+        ))
+
+
+class Command(BaseCommand):
+    help = 'Verify the tamper-evident audit log hash chain.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Ignore checkpoints and verify the whole chain.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'Number of worker processes. 0 uses one per CPU; '
+                '1 verifies in this process.'
+            ),
+        )
+        parser.add_argument(
+            '--range-size',
+            type=int,
+            default=DEFAULT_RANGE_SIZE,
+            help='Number of entry IDs handed to a worker at a time.',
+        )
+        parser.add_argument(
+            '--no-checkpoint',
+            action='store_true',
+            help='Do not record a checkpoint after a successful run.',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database alias to operate on.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        using = options['database']
+        if options['range_size'] < 1:
+            raise CommandError('--range-size must be at least 1.')
+        if options['workers'] < 0:
+            raise CommandError('--workers must not be negative.')
+
+        checkpoints = AuditCheckpoint.objects.using(using)
+        latest = checkpoints.first()
+        if options['full'] or latest is None:
+            after_id, expected = 0, chain.GENESIS_HASH
+        else:
+            after_id, expected = latest.last_entry_id, latest.chain_hash
+
+        bounds = (
+            AuditLogEntry.objects.using(using)
+            .filter(id__gt=after_id)
+            .aggregate(first=Min('id'), last=Max('id'))
+        )
+        if bounds['first'] is None:
+            self.stdout.write(
+                'No new audit log entries since the last checkpoint.'
+            )
+            return
+
+        check, detached = None, []
+        if options['full']:
+            expected, detached, check = self._full_run_start(
+                checkpoints.order_by('last_entry_id'), bounds['first']
+            )
+
+        joined = chain.JoinedRanges(expected)
+        ranges = list(
+            _id_ranges(bounds['first'], bounds['last'], options['range_size'])
+        )
+        new_first, new_covered = self._walk(
+            self._verify(ranges, using, options['workers']),
+            joined,
+            check,
+            latest.last_entry_id if latest else 0,
+        )
+        errors = list(joined.errors)
+        if check is not None:
+            errors.extend(check.finish())
+
+        if errors:
+            for entry_id, reason in errors[:MAX_REPORTED_ERRORS]:
+                self.stderr.write(f'Entry {entry_id}: {reason}')
+            raise CommandError(
+                f'Audit chain verification failed: {len(errors)} problem(s).'
+            )
+
+        if detached or expected is None:
+            self.stdout.write(
+                f'Entries before {bounds["first"]} are detached; skipped '
+                f'{len(detached)} checkpoint(s) covering only them.'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Verified {joined.count} entries '
+            f'({joined.first_id}-{joined.last_id}).'
+        ))
+        self.stdout.write(f'Chain hash: {joined.last_entry_hash}')
+        if options['no_checkpoint'] or not new_covered.count:
+            return
+        checkpoint = checkpoints.create(
+            first_entry_id=new_first,
+            last_entry_id=joined.last_id,
+            entry_count=new_covered.count,
+            chain_hash=joined.last_entry_hash,
+            merkle_root=new_covered.root(),
+        )
+        self.stdout.write(f'Recorded checkpoint {checkpoint}.')
+
+    def _full_run_start(
+        self,
+        recorded: Iterable[AuditCheckpoint],
+        first_id: int,
+    ) -> tuple[str | None, list[AuditCheckpoint], _CheckpointCheck]:
+        """
+        Return the hash the first attached entry must link to, the
+        checkpoints of detached entries, and the check for the others.
+        """
+        recorded = list(recorded)
+        detached = [c for c in recorded if c.last_entry_id < first_id]
+        attached = recorded[len(detached):]
+        if attached and attached[0].first_entry_id < first_id:
+            # Anchored by that checkpoint's chain hash instead.
+            expected = None
+        elif detached:
+            expected = detached[-1].chain_hash
+        else:
+            expected = chain.GENESIS_HASH
+        return expected, detached, _CheckpointCheck(attached, first_id)
+
+    def _walk(
+        self,
+        results: Iterable[chain.RangeResult],
+        joined: chain.JoinedRanges,
+        check: _CheckpointCheck | None,
+        new_after: int,
+    ) -> tuple[int | None, chain.MerkleBuilder]:
+        """
+        Join the range results and pass each entry to ``check``.
+
+        Return the first ID and the Merkle builder of the entries after
+        ``new_after``, which the next checkpoint covers.
+        """
+        new_first, new_covered = None, chain.MerkleBuilder()
+        for result in results:
+            joined.add(result)
+            for entry_id, entry_hash in zip(
+                result.entry_ids, result.entry_hashes, strict=True
+            ):
+                if check is not None:
+                    check.add(entry_id, entry_hash)
+                if entry_id > new_after:
+                    new_first = new_first or entry_id
+                    new_covered.add(entry_hash)
+        return new_first, new_covered
+
+    def _verify(
+        self,
+        ranges: list[tuple[int, int]],
+        using: str,
+        workers: int,
+    ) -> Iterator[chain.RangeResult]:
+        """Yield the range results in order, as they become available."""
+        verify = partial(chain.verify_range, using=using)
+        if workers == 1 or len(ranges) == 1:
+            for first, last in ranges:
+                yield verify(first, last)
+            return
+        with process_pool(workers) as pool:
+            yield from pool.map(verify, *zip(*ranges, strict=True))
@@ -0,0 +1,79 @@
+# audittrail/managers.py
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING, Any
+
+from auditlog.models import LogEntryManager
+from django.db import router, transaction
+from django.db.models import Q, QuerySet
+from django.db.models.signals import pre_save
+
+from audittrail.buffer import audit_buffer, buffering_enabled
+from audittrail.chain import write_entries
+
+if TYPE_CHECKING:
+    from audittrail.models import AuditLogEntry
+
+# django-cid joins an upstream ID and the generated one with ', ' when
+# CID_CONCATENATE_IDS is enabled.
+CID_SEPARATOR = ', '
+
+
+class BufferedLogEntryManager(LogEntryManager):
+    """
+    LogEntry manager that defers INSERTs to the end of the transaction.
+
+    ``LogEntryManager.log_create`` and ``log_m2m_changes`` both funnel
+    through ``create()``. Inside an atomic block the entry is handed to
+    the audit buffer instead of being saved; outside of one (autocommit)
+    it is written right away. Either way it is sealed into the hash
+    chain just before the INSERT.
+    """
+
+    def create(self, **kwargs: Any) -> AuditLogEntry:  # noqa: ANN401
+        using = self._db or router.db_for_write(self.model)
+        entry = self.model(**kwargs)
+        # bulk_create() skips pre_save, but AuditlogMiddleware relies on
+        # it to attach actor and remote address. Send it now, while the
+        # request context is still active.
+        pre_save.send(
+            sender=self.model,
+            instance=entry,
+            raw=False,
+            using=using,
+            update_fields=None,
+        )
+        connection = transaction.get_connection(using)
+        if buffering_enabled() and connection.in_atomic_block:
+            audit_buffer.add(entry, using)
+        else:
+            write_entries([entry], using)
+        return entry
+
+    def for_period(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+    ) -> QuerySet[AuditLogEntry]:
+        """
+        Return entries with ``start <= timestamp < end``.
+
+        The half-open range matches the monthly partition bounds, so
+        PostgreSQL only scans the partitions overlapping the period.
+        """
+        return self.filter(timestamp__gte=start, timestamp__lt=end)
+
+    def for_cid(self, cid: str) -> QuerySet[AuditLogEntry]:
+        """
+        Return entries recorded under correlation ID ``cid``.
+
+        Besides exact matches this finds concatenated IDs that start
+        with ``cid`` (``'external-lab-1, <uuid>'`` for
+        ``'external-lab-1'``), so an external workflow ID resolves to
+        all requests made on its behalf. Both branches are served by
+        the B-tree and ``varchar_pattern_ops`` indexes on ``cid``.
+        """
+        return self.filter(
+            Q(cid=cid) | Q(cid__startswith=f'{cid}{CID_SEPARATOR}')
+        )
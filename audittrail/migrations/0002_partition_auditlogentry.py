@@ -0,0 +1,31 @@
+# Converts the audit table into a monthly range-partitioned table.
+
+from django.db import migrations
+from django.utils import timezone
+
+from audittrail import partitioning
+
+
+def partition_table(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    partitioning.convert_to_partitioned(connection, timezone.now().date())
+
+
+def unpartition_table(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    partitioning.convert_to_plain(connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audittrail', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_table, unpartition_table),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0.4 on 2026-10-17 10:34
+
+import django.utils.timezone
+from django.db import migrations, models
+
+from audittrail import chain
+
+
+def seal_existing_entries(apps, schema_editor):
+    """Link entries written before the hash chain existed, in ID order."""
+    AuditLogEntry = apps.get_model('audittrail', 'AuditLogEntry')
+    using = schema_editor.connection.alias
+    entries = AuditLogEntry.objects.using(using).order_by('id')
+    previous = chain.GENESIS_HASH
+    batch = []
+    for entry in entries.iterator(chunk_size=2000):
+        values = {name: getattr(entry, name) for name in chain.HASHED_FIELDS}
+        entry.previous_hash = previous
+        entry.entry_hash = chain.entry_digest(AuditLogEntry, values, previous)
+        previous = entry.entry_hash
+        batch.append(entry)
+        if len(batch) >= 2000:
+            AuditLogEntry.objects.using(using).bulk_update(
+                batch, ['previous_hash', 'entry_hash']
+            )
+            batch = []
+    AuditLogEntry.objects.using(using).bulk_update(
+        batch, ['previous_hash', 'entry_hash']
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audittrail', '0002_partition_auditlogentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_entry_id', models.BigIntegerField(verbose_name='first entry ID')),
+                ('last_entry_id', models.BigIntegerField(unique=True, verbose_name='last entry ID')),
+                ('entry_count', models.PositiveIntegerField(verbose_name='entry count')),
+                ('chain_hash', models.CharField(max_length=64, verbose_name='chain hash')),
+                ('merkle_root', models.CharField(max_length=64, verbose_name='Merkle root')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='created at')),
+            ],
+            options={
+                'verbose_name': 'audit checkpoint',
+                'verbose_name_plural': 'audit checkpoints',
+                'ordering': ['-last_entry_id'],
+                'get_latest_by': 'last_entry_id',
+            },
+        ),
+        migrations.AddField(
+            model_name='auditlogentry',
+            name='entry_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='entry hash'),
+        ),
+        migrations.AddField(
+            model_name='auditlogentry',
+            name='previous_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='previous hash'),
+        ),
+        migrations.RunPython(seal_existing_entries, migrations.RunPython.noop),
+    ]
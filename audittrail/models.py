@@ -1,3 +1,89 @@
-#from django.db import models
+# audittrail/models.py
+from typing import Any
 
-# Create your models here.
+from auditlog.models import AbstractLogEntry
+from django.db import models, router, transaction
+from django.db.models.signals import pre_save
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from audittrail.chain import seal_entries
+from audittrail.managers import BufferedLogEntryManager
+
+
+class AuditLogEntry(AbstractLogEntry):
+    """
+    Audit log entry for ForenLIMS, written in per-transaction batches.
+
+    Every entry is linked into a SHA-256 hash chain (see
+    :mod:`audittrail.chain`) when it is inserted.
+    """
+
+    previous_hash = models.CharField(
+        _('previous hash'),
+        max_length=64,
+        blank=True,
+        editable=False,
+    )
+    entry_hash = models.CharField(
+        _('entry hash'),
+        max_length=64,
+        blank=True,
+        editable=False,
+    )
+
+    objects = BufferedLogEntryManager()
+
+    class Meta(AbstractLogEntry.Meta):
+        pass
+
+    def save(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        if not self._state.adding or self.entry_hash:
+            super().save(*args, **kwargs)
+            return
+        using = kwargs.get('using') or router.db_for_write(
+            type(self), instance=self
+        )
+        with transaction.atomic(using=using):
+            # Let AuditlogMiddleware fill in actor and remote address
+            # before the content is hashed. Its receivers are idempotent,
+            # so the second pre_save sent by Model.save() is harmless.
+            pre_save.send(
+                sender=type(self),
+                instance=self,
+                raw=False,
+                using=using,
+                update_fields=None,
+            )
+            seal_entries([self], using)
+            super().save(*args, **kwargs)
+
+
+class AuditCheckpoint(models.Model):
+    """
+    A verified stretch of the audit hash chain.
+
+    ``chain_hash`` is the hash of the last covered entry and therefore
+    commits to the whole chain up to it; ``merkle_root`` covers the
+    entry hashes of this checkpoint's range only. Publishing either
+    value outside the database makes later tampering provable.
+    """
+
+    first_entry_id = models.BigIntegerField(_('first entry ID'))
+    last_entry_id = models.BigIntegerField(_('last entry ID'), unique=True)
+    entry_count = models.PositiveIntegerField(_('entry count'))
+    chain_hash = models.CharField(_('chain hash'), max_length=64)
+    merkle_root = models.CharField(_('Merkle root'), max_length=64)
+    created_at = models.DateTimeField(_('created at'), default=timezone.now)
+
+    class Meta:
+        ordering = ['-last_entry_id']
+        get_latest_by = 'last_entry_id'
+        verbose_name = _('audit checkpoint')
+        verbose_name_plural = _('audit checkpoints')
+
+    def __str__(self) -> str:
+        return (
+            f'{self.first_entry_id}-{self.last_entry_id} '
+            f'({self.chain_hash[:12]})'
+        )
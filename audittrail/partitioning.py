@@ -0,0 +1,361 @@
+# audittrail/partitioning.py
+"""
+Monthly range partitioning of the audit log table on PostgreSQL.
+
+The audit table is partitioned by ``timestamp`` into one partition per
+calendar month (UTC), named ``<table>_yYYYYmMM``. A ``DEFAULT``
+partition catches rows for months that have no partition yet, so an
+audit write can never fail because maintenance was skipped; creating
+the missing partition later moves those rows into place.
+
+Django keeps treating ``id`` as the primary key. On the database side
+the key is ``(id, timestamp)`` because PostgreSQL requires the
+partition key to be part of every unique constraint.
+"""
+from __future__ import annotations
+
+import datetime
+import re
+from dataclasses import dataclass
+
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+AUDIT_TABLE = 'audittrail_auditlogentry'
+PARTITION_KEY = 'timestamp'
+DEFAULT_SUFFIX = 'default'
+DEFAULT_MONTHS_AHEAD = 3
+
+_PARTITION_RE = re.compile(r'_y(\d{4})m(\d{2})$')
+
+
+@dataclass(frozen=True)
+class Partition:
+    """A monthly partition of the audit table."""
+
+    name: str
+    month: datetime.date
+
+    @property
+    def end(self) -> datetime.date:
+        return add_months(self.month, 1)
+
+
+def month_start(day: datetime.date) -> datetime.date:
+    """Return the first day of the month containing ``day``."""
+    return datetime.date(day.year, day.month, 1)
+
+
+def add_months(month: datetime.date, count: int) -> datetime.date:
+    """Return the first day of the month ``count`` months after ``month``."""
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime.date, table: str = AUDIT_TABLE) -> str:
+    return f'{table}_y{month.year:04d}m{month.month:02d}'
+
+
+def default_partition_name(table: str = AUDIT_TABLE) -> str:
+    return f'{table}_{DEFAULT_SUFFIX}'
+
+
+def _bound(month: datetime.date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def _quote(connection: BaseDatabaseWrapper, name: str) -> str:
+    return connection.ops.quote_name(name)
+
+
+def is_partitioned(
+    connection: BaseDatabaseWrapper,
+    table: str = AUDIT_TABLE,
+) -> bool:
+    """Return True if ``table`` is a partitioned PostgreSQL table."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table pt '
+            'JOIN pg_class c ON c.oid = pt.partrelid '
+            'WHERE c.relname = %s AND pg_table_is_visible(c.oid)',
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(
+    connection: BaseDatabaseWrapper,
+    table: str = AUDIT_TABLE,
+) -> list[Partition]:
+    """Return the attached monthly partitions of ``table``, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits i '
+            'JOIN pg_class parent ON parent.oid = i.inhparent '
+            'JOIN pg_class child ON child.oid = i.inhrelid '
+            'WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)',
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = _PARTITION_RE.search(name)
+        if match:
+            year, month = (int(g) for g in match.groups())
+            partitions.append(Partition(name, datetime.date(year, month, 1)))
+    return sorted(partitions, key=lambda p: p.month)
+
+
+def create_partition(
+    connection: BaseDatabaseWrapper,
+    month: datetime.date,
+    table: str = AUDIT_TABLE,
+) -> bool:
+    """
+    Create the partition for ``month`` unless it already exists.
+
+    Rows that landed in the default partition for that month are moved
+    into the new partition before it is attached. Returns True if a
+    partition was created.
+    """
+    month = month_start(month)
+    name = partition_name(month, table)
+    if any(p.name == name for p in list_partitions(connection, table)):
+        return False
+
+    parent = _quote(connection, table)
+    child = _quote(connection, name)
+    default = default_partition_name(table)
+    key = _quote(connection, PARTITION_KEY)
+    start, end = _bound(month), _bound(add_months(month, 1))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE {child} (LIKE {parent} INCLUDING DEFAULTS '
+            f'INCLUDING CONSTRAINTS)'
+        )
+        if _table_exists(connection, default):
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {_quote(connection, default)} '  # noqa: S608
+                f'WHERE {key} >= {start} AND {key} < {end} RETURNING *) '
+                f'INSERT INTO {child} SELECT * FROM moved'
+            )
+        cursor.execute(
+            f'ALTER TABLE {parent} ATTACH PARTITION {child} '
+            f'FOR VALUES FROM ({start}) TO ({end})'
+        )
+    return True
+
+
+def detach_partition(
+    connection: BaseDatabaseWrapper,
+    partition: Partition,
+    table: str = AUDIT_TABLE,
+    archive_schema: str | None = None,
+) -> str:
+    """
+    Detach ``partition`` from the audit table and keep it as a table.
+
+    Detached partitions are never dropped; they stay available for
+    archival (e.g. ``pg_dump -t``). With ``archive_schema`` the table
+    is moved into that schema. Returns the qualified table name.
+    """
+    parent = _quote(connection, table)
+    child = _quote(connection, partition.name)
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {parent} DETACH PARTITION {child}')
+        if archive_schema:
+            schema = _quote(connection, archive_schema)
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {schema}')
+            cursor.execute(f'ALTER TABLE {child} SET SCHEMA {schema}')
+            return f'{archive_schema}.{partition.name}'
+    return partition.name
+
+
+def ensure_partitions(
+    connection: BaseDatabaseWrapper,
+    today: datetime.date,
+    months_ahead: int = DEFAULT_MONTHS_AHEAD,
+    table: str = AUDIT_TABLE,
+) -> list[str]:
+    """Create partitions for the current and next ``months_ahead`` months."""
+    current = month_start(today)
+    return [
+        partition_name(add_months(current, n), table)
+        for n in range(months_ahead + 1)
+        if create_partition(connection, add_months(current, n), table)
+    ]
+
+
+def _table_exists(connection: BaseDatabaseWrapper, table: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_class WHERE relname = %s '
+            'AND pg_table_is_visible(oid)',
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def _constraint_defs(
+    connection: BaseDatabaseWrapper,
+    table: str,
+    kind: str,
+) -> list[tuple[str, str]]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT con.conname, pg_get_constraintdef(con.oid) '
+            'FROM pg_constraint con JOIN pg_class c ON c.oid = con.conrelid '
+            'WHERE c.relname = %s AND pg_table_is_visible(c.oid) '
+            'AND con.contype = %s ORDER BY con.conname',
+            [table, kind],
+        )
+        return cursor.fetchall()
+
+
+def _index_defs(
+    connection: BaseDatabaseWrapper,
+    table: str,
+) -> list[tuple[str, str]]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x '
+            'JOIN pg_class c ON c.oid = x.indrelid '
+            'JOIN pg_class i ON i.oid = x.indexrelid '
+            'WHERE c.relname = %s AND pg_table_is_visible(c.oid) '
+            'AND NOT x.indisprimary ORDER BY i.relname',
+            [table],
+        )
+        # Indexes of a partitioned parent are reported as "ON ONLY".
+        return [
+            (name, definition.replace(' ON ONLY ', ' ON ', 1))
+            for name, definition in cursor.fetchall()
+        ]
+
+
+def _existing_months(
+    connection: BaseDatabaseWrapper,
+    table: str,
+) -> set[datetime.date]:
+    key = _quote(connection, PARTITION_KEY)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT date_trunc('month', {key} AT TIME ZONE 'UTC') "  # noqa: S608
+            f'FROM {_quote(connection, table)}'
+        )
+        return {month_start(row[0].date()) for row in cursor.fetchall()}
+
+
+def _rebuild_table(
+    connection: BaseDatabaseWrapper,
+    table: str,
+    partition_months: list[datetime.date] | None,
+) -> None:
+    """
+    Recreate ``table`` with identical columns and copy all rows over.
+
+    With ``partition_months`` the new table is range partitioned and
+    gets a default partition plus one partition per given month;
+    with ``None`` it becomes a plain table again. Indexes and foreign
+    keys are captured from the old table and recreated afterwards.
+    """
+    old = f'{table}_old'
+    sequence = f'{table}_id_seq'
+    q_table, q_old = _quote(connection, table), _quote(connection, old)
+    q_pkey = _quote(connection, f'{table}_pkey')
+    q_sequence = _quote(connection, sequence)
+    key = _quote(connection, PARTITION_KEY)
+    foreign_keys = _constraint_defs(connection, table, 'f')
+    indexes = _index_defs(connection, table)
+
+    with connection.cursor() as cursor:
+        for name, _ in foreign_keys:
+            cursor.execute(
+                f'ALTER TABLE {q_table} DROP CONSTRAINT '
+                f'{_quote(connection, name)}'
+            )
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX {_quote(connection, name)}')
+        cursor.execute(f'ALTER TABLE {q_table} RENAME TO {q_old}')
+        cursor.execute(
+            f'ALTER TABLE {q_old} RENAME CONSTRAINT {q_pkey} '
+            f'TO {_quote(connection, f"{old}_pkey")}'
+        )
+        # Free the sequence name; ids are copied over explicitly.
+        cursor.execute(
+            f'ALTER TABLE {q_old} ALTER COLUMN id DROP IDENTITY IF EXISTS'
+        )
+        cursor.execute(f'ALTER TABLE {q_old} ALTER COLUMN id DROP DEFAULT')
+        cursor.execute(f'DROP SEQUENCE IF EXISTS {q_sequence}')
+
+        create = (
+            f'CREATE TABLE {q_table} '
+            f'(LIKE {q_old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+        if partition_months is None:
+            cursor.execute(create)
+            cursor.execute(
+                f'ALTER TABLE {q_table} ADD CONSTRAINT {q_pkey} '
+                f'PRIMARY KEY (id)'
+            )
+        else:
+            cursor.execute(f'{create} PARTITION BY RANGE ({key})')
+            cursor.execute(
+                f'ALTER TABLE {q_table} ADD CONSTRAINT {q_pkey} '
+                f'PRIMARY KEY (id, {key})'
+            )
+            cursor.execute(
+                f'CREATE TABLE '
+                f'{_quote(connection, default_partition_name(table))} '
+                f'PARTITION OF {q_table} DEFAULT'
+            )
+
+    for month in partition_months or []:
+        create_partition(connection, month, table)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'INSERT INTO {q_table} SELECT * FROM {q_old}')  # noqa: S608
+        cursor.execute(f'DROP TABLE {q_old}')
+        cursor.execute(f'CREATE SEQUENCE {q_sequence} OWNED BY {q_table}.id')
+        cursor.execute(
+            f'ALTER TABLE {q_table} ALTER COLUMN id '
+            f"SET DEFAULT nextval('{sequence}')"
+        )
+        cursor.execute(
+            f"SELECT setval('{sequence}', COALESCE(MAX(id), 0) + 1, false) "  # noqa: S608
+            f'FROM {q_table}'
+        )
+        for _, definition in indexes:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(
+                f'ALTER TABLE {q_table} ADD CONSTRAINT '
+                f'{_quote(connection, name)} {definition}'
+            )
+
+
+def convert_to_partitioned(
+    connection: BaseDatabaseWrapper,
+    today: datetime.date,
+    months_ahead: int = DEFAULT_MONTHS_AHEAD,
+    table: str = AUDIT_TABLE,
+) -> None:
+    """Turn the plain audit table into a monthly partitioned table."""
+    if is_partitioned(connection, table):
+        return
+    current = month_start(today)
+    months = _existing_months(connection, table) | {
+        add_months(current, n) for n in range(months_ahead + 1)
+    }
+    _rebuild_table(connection, table, sorted(months))
+
+
+def convert_to_plain(
+    connection: BaseDatabaseWrapper,
+    table: str = AUDIT_TABLE,
+) -> None:
+    """Fold all partitions back into a single plain table."""
+    if not is_partitioned(connection, table):
+        return
+    _rebuild_table(connection, table, None)
@@ -8,8 +8,11 @@ import uuid
 from typing import Callable, Generator
 
 import pytest
+from auditlog.registry import auditlog
 from cid import locals as cid_locals
 from cid.locals import set_cid
+from django.contrib.auth import get_user_model
+from django.db.models import Model
 
 
 @pytest.fixture
@@ -102,3 +105,22 @@ def external_cid() -> str:
             assert external_cid in response['X-Correlation-ID']
     """
     return f"external-lab-{uuid.uuid4()}"
+
+
+@pytest.fixture
+def audited_user_model() -> Generator[type[Model], None, None]:
+    """
+    Register the user model with auditlog for the duration of a test.
+
+    No ForenLIMS model is audited by default yet, so tests that need
+    real log entries borrow the user model.
+
+    Usage:
+        def test_something(audited_user_model):
+            audited_user_model.objects.create_user(email='a@b.de')
+            assert AuditLogEntry.objects.exists()
+    """
+    user_model = get_user_model()
+    auditlog.register(user_model)
+    yield user_model
+    auditlog.unregister(user_model)
@@ -0,0 +1,136 @@
+"""
+Tests for the buffered audit log writer.
+
+Entries created inside a transaction must only reach the database
+once the transaction commits, all at once and with their CID intact.
+"""
+from collections.abc import Callable
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from audittrail.buffer import audit_buffer
+from audittrail.models import AuditLogEntry
+
+TABLE = AuditLogEntry._meta.db_table
+
+
+def _audit_inserts(queries: CaptureQueriesContext) -> list[str]:
+    return [
+        q['sql']
+        for q in queries.captured_queries
+        if q['sql'].lstrip().startswith(f'INSERT INTO "{TABLE}"')
+    ]
+
+
+@pytest.mark.django_db
+class TestBufferedWriter:
+    """Log entries are collected per transaction and bulk inserted."""
+
+    def test_entries_are_deferred_until_commit(
+        self,
+        audited_user_model: type,
+        django_capture_on_commit_callbacks: Callable,
+    ) -> None:
+        """Nothing is written while the transaction is still open."""
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                for i in range(5):
+                    audited_user_model.objects.create_user(
+                        email=f'analyst{i}@example.com'
+                    )
+                assert AuditLogEntry.objects.count() == 0
+                assert audit_buffer.pending('default') == 5
+
+        assert AuditLogEntry.objects.count() == 5
+        assert audit_buffer.pending('default') == 0
+
+    def test_one_insert_per_transaction(
+        self,
+        audited_user_model: type,
+        django_capture_on_commit_callbacks: Callable,
+    ) -> None:
+        """A bulk edit of N records costs a single audit INSERT."""
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks(execute=True):
+                with transaction.atomic():
+                    for i in range(10):
+                        audited_user_model.objects.create_user(
+                            email=f'analyst{i}@example.com'
+                        )
+
+        assert len(_audit_inserts(queries)) == 1
+        assert AuditLogEntry.objects.count() == 10
+
+    def test_cid_is_kept_on_every_row(
+        self,
+        audited_user_model: type,
+        correlation_id: str,
+        django_capture_on_commit_callbacks: Callable,
+    ) -> None:
+        """Every buffered row carries the CID of the originating request."""
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                for i in range(3):
+                    audited_user_model.objects.create_user(
+                        email=f'analyst{i}@example.com'
+                    )
+
+        cids = set(AuditLogEntry.objects.values_list('cid', flat=True))
+        assert cids == {correlation_id}
+
+    def test_rolled_back_savepoint_is_discarded(
+        self,
+        audited_user_model: type,
+        django_capture_on_commit_callbacks: Callable,
+    ) -> None:
+        """Entries of a rolled back savepoint are never written."""
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                audited_user_model.objects.create_user(
+                    email='kept@example.com'
+                )
+                try:
+                    with transaction.atomic():
+                        audited_user_model.objects.create_user(
+                            email='dropped@example.com'
+                        )
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+
+        reprs = AuditLogEntry.objects.values_list('object_repr', flat=True)
+        assert list(reprs) == ['kept@example.com']
+
+    @override_settings(AUDITTRAIL_BUFFERED_WRITES=False)
+    def test_buffering_can_be_disabled(self, audited_user_model: type) -> None:
+        """With buffering off, entries are written immediately."""
+        with transaction.atomic():
+            audited_user_model.objects.create_user(email='now@example.com')
+            assert AuditLogEntry.objects.count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_autocommit_writes_immediately(audited_user_model: type) -> None:
+    """Outside of an atomic block there is nothing to batch."""
+    audited_user_model.objects.create_user(email='auto@example.com')
+    assert AuditLogEntry.objects.count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_transaction_is_released(
+    audited_user_model: type,
+) -> None:
+    """Entries of a rolled back transaction do not stay in the buffer."""
+    try:
+        with transaction.atomic():
+            audited_user_model.objects.create_user(
+                email='dropped@example.com'
+            )
+            assert audit_buffer.pending('default') == 1
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert audit_buffer.pending('default') == 0
+    assert not AuditLogEntry.objects.exists()
@@ -0,0 +1,102 @@
+"""
+Tests for looking up audit entries by correlation ID.
+"""
+import warnings
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from audittrail.models import AuditLogEntry
+
+EXTERNAL = 'external-lab-abc123'
+INTERNAL = '0b1c2d3e-0000-4000-8000-000000000001'
+
+
+def _entry(cid: str, repr_: str = 'sample') -> AuditLogEntry:
+    # save() bypasses the transaction buffer of objects.create().
+    entry = AuditLogEntry(
+        content_type=ContentType.objects.get_for_model(AuditLogEntry),
+        object_pk='1',
+        object_repr=repr_,
+        action=AuditLogEntry.Action.UPDATE,
+        cid=cid,
+    )
+    entry.save()
+    return entry
+
+
+@pytest.mark.django_db
+class TestForCid:
+    """AuditLogEntry.objects.for_cid()"""
+
+    def test_exact_match(self) -> None:
+        entry = _entry(INTERNAL)
+        _entry('someone-else')
+        assert list(AuditLogEntry.objects.for_cid(INTERNAL)) == [entry]
+
+    def test_external_id_resolves_concatenated_cids(self) -> None:
+        first = _entry(f'{EXTERNAL}, {INTERNAL}')
+        second = _entry(f'{EXTERNAL}, 11111111-2222-4333-8444-555555555555')
+        found = set(AuditLogEntry.objects.for_cid(EXTERNAL))
+        assert found == {first, second}
+
+    def test_prefix_must_end_at_separator(self) -> None:
+        """'external-lab-abc' must not match 'external-lab-abc123, ...'."""
+        _entry(f'{EXTERNAL}, {INTERNAL}')
+        assert not AuditLogEntry.objects.for_cid('external-lab-abc').exists()
+
+    @pytest.mark.skipif(
+        connection.vendor != 'postgresql',
+        reason='Index usage is PostgreSQL specific',
+    )
+    def test_lookup_uses_indexes(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = AuditLogEntry.objects.for_cid(EXTERNAL).explain()
+        assert 'Seq Scan' not in plan
+
+
+@pytest.mark.django_db
+class TestCorrelationIdLookupView:
+    """GET /audit/cid/<cid>/"""
+
+    def test_requires_permission(self, client: Client) -> None:
+        url = reverse('audittrail:cid-lookup', args=[INTERNAL])
+        assert client.get(url).status_code == 403
+
+    def test_returns_entries_as_json(self, admin_client: Client) -> None:
+        _entry(f'{EXTERNAL}, {INTERNAL}', repr_='Sample 42')
+        url = reverse('audittrail:cid-lookup', args=[EXTERNAL])
+
+        data = admin_client.get(url).json()
+
+        assert data['count'] == 1
+        assert not data['truncated']
+        entry = data['entries'][0]
+        assert entry['object_repr'] == 'Sample 42'
+        assert entry['cid'] == f'{EXTERNAL}, {INTERNAL}'
+        assert entry['content_type'] == 'audittrail.auditlogentry'
+
+    def test_time_window(self, admin_client: Client) -> None:
+        _entry(INTERNAL)
+        url = reverse('audittrail:cid-lookup', args=[INTERNAL])
+        response = admin_client.get(url, {'until': '2000-01-01T00:00:00Z'})
+        assert response.json()['count'] == 0
+
+    @pytest.mark.parametrize('since', ['yesterday', '2024-02-30T00:00:00'])
+    def test_invalid_timestamp(self, admin_client: Client, since: str) -> None:
+        url = reverse('audittrail:cid-lookup', args=[INTERNAL])
+        response = admin_client.get(url, {'since': since})
+        assert response.status_code == 400
+
+    def test_naive_timestamp(self, admin_client: Client) -> None:
+        """Naive values are made aware instead of warning."""
+        _entry(INTERNAL)
+        url = reverse('audittrail:cid-lookup', args=[INTERNAL])
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            response = admin_client.get(url, {'until': '2000-01-01T00:00'})
+        assert response.json()['count'] == 0
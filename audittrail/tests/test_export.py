@@ -0,0 +1,261 @@
+"""
+Tests for the streaming audit log export.
+"""
+import asyncio
+import csv
+import datetime
+import gzip
+import io
+import json
+import warnings
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.contenttypes.models import ContentType
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import CommandError, call_command
+from django.test import Client
+from django.urls import reverse
+
+from audittrail import export
+from audittrail.models import AuditCheckpoint, AuditLogEntry
+
+URL = reverse('audittrail:export')
+
+
+def _entry(
+    repr_: str,
+    model: type = AuditLogEntry,
+    cid: str = 'lab-1',
+    timestamp: datetime.datetime | None = None,
+) -> AuditLogEntry:
+    # save() bypasses the transaction buffer of objects.create().
+    entry = AuditLogEntry(
+        content_type=ContentType.objects.get_for_model(model),
+        object_pk='1',
+        object_repr=repr_,
+        action=AuditLogEntry.Action.UPDATE,
+        changes={'status': ['open', 'closed']},
+        cid=cid,
+    )
+    if timestamp is not None:
+        entry.timestamp = timestamp
+    entry.save()
+    return entry
+
+
+def _utc(year: int, month: int, day: int = 1) -> datetime.datetime:
+    return datetime.datetime(year, month, day, tzinfo=datetime.UTC)
+
+
+def _content(response: object) -> bytes:
+    return b''.join(response.streaming_content)
+
+
+@pytest.mark.django_db
+class TestExport:
+    """The export generators."""
+
+    def test_ndjson_has_one_document_per_entry(self) -> None:
+        _entry('Sample 1')
+        _entry('Sample 2')
+        data = b''.join(export.export(export.filter_entries(), 'ndjson'))
+        rows = [json.loads(line) for line in data.decode().splitlines()]
+        assert [row['object_repr'] for row in rows] == ['Sample 1', 'Sample 2']
+        assert rows[0]['changes'] == {'status': ['open', 'closed']}
+        assert rows[0]['content_type'] == 'audittrail.auditlogentry'
+        assert rows[0]['entry_hash']
+
+    def test_csv_encodes_json_columns(self) -> None:
+        _entry('Sample, "quoted"')
+        data = b''.join(export.export(export.filter_entries(), 'csv'))
+        rows = list(csv.DictReader(io.StringIO(data.decode())))
+        assert rows[0]['object_repr'] == 'Sample, "quoted"'
+        assert json.loads(rows[0]['changes']) == {
+            'status': ['open', 'closed']
+        }
+
+    def test_gzip_round_trip(self) -> None:
+        _entry('Sample 1')
+        data = b''.join(
+            export.export(export.filter_entries(), 'ndjson', gzip=True)
+        )
+        assert b'Sample 1' in gzip.decompress(data)
+
+    def test_output_is_produced_in_blocks(self) -> None:
+        """Small rows are joined instead of yielded one by one."""
+        blocks = list(export.encode(['a' * 10] * 100, buffer_size=256))
+        assert len(blocks) == 4
+        assert b''.join(blocks) == b'a' * 1000
+
+    def test_filters(self) -> None:
+        _entry('old', timestamp=_utc(2024, 6))
+        _entry('other model', model=AuditCheckpoint)
+        _entry('other cid', cid='lab-2, 1234')
+        _entry('match')
+        entries = export.filter_entries(
+            since=_utc(2025, 1),
+            model='audittrail.AuditLogEntry',
+            cid='lab-1',
+        )
+        assert [e.object_repr for e in entries] == ['match']
+
+    def test_unknown_model(self) -> None:
+        with pytest.raises(ValueError, match='Unknown model'):
+            export.filter_entries(model='lims.nothing')
+
+
+@pytest.mark.django_db
+class TestExportView:
+    """GET /audit/export/"""
+
+    def test_requires_permission(self, client: Client) -> None:
+        assert client.get(URL).status_code == 403
+
+    def test_streams_csv_attachment(self, admin_client: Client) -> None:
+        _entry('Sample 1')
+        response = admin_client.get(URL)
+        assert response.streaming
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        assert response['Content-Disposition'].endswith('.csv"')
+        assert b'Sample 1' in _content(response)
+
+    def test_gzipped_ndjson(self, admin_client: Client) -> None:
+        _entry('Sample 1')
+        response = admin_client.get(URL, {'format': 'ndjson', 'gzip': '1'})
+        assert response['Content-Type'] == 'application/gzip'
+        assert response['Content-Disposition'].endswith('.ndjson.gz"')
+        line = gzip.decompress(_content(response)).decode().splitlines()[0]
+        assert json.loads(line)['object_repr'] == 'Sample 1'
+
+    def test_filters_by_cid(self, admin_client: Client) -> None:
+        _entry('wanted', cid='lab-7, 1234')
+        _entry('unwanted', cid='lab-8')
+        response = admin_client.get(URL, {'format': 'ndjson', 'cid': 'lab-7'})
+        lines = _content(response).decode().splitlines()
+        assert [json.loads(line)['object_repr'] for line in lines] == [
+            'wanted'
+        ]
+
+    @pytest.mark.parametrize(
+        'params',
+        [
+            {'format': 'xml'},
+            {'since': 'yesterday'},
+            {'since': '2024-02-30T00:00:00'},
+            {'model': 'lims.nothing'},
+        ],
+    )
+    def test_rejects_bad_parameters(
+        self,
+        admin_client: Client,
+        params: dict,
+    ) -> None:
+        assert admin_client.get(URL, params).status_code == 400
+
+    def test_naive_timestamp(self, admin_client: Client) -> None:
+        """Naive values are made aware instead of warning."""
+        _entry('Sample 1', timestamp=_utc(2025, 1, 2))
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            response = admin_client.get(
+                URL, {'format': 'ndjson', 'since': '2025-01-01T00:00:00'}
+            )
+            lines = _content(response).decode().splitlines()
+        assert len(lines) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_streams_under_asgi(
+    admin_client: Client,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The ASGI handler sends blocks while rows are still being read."""
+    total, read = 200, []
+
+    def iter_rows(entries: object, chunk_size: int) -> Iterator[dict]:
+        for i in range(total):
+            read.append(i)
+            yield dict.fromkeys(export.COLUMNS, 'x' * 100)
+
+    monkeypatch.setattr(export, 'iter_rows', iter_rows)
+    messages = iter([{'type': 'http.request', 'body': b''}])
+    read_before_first_block, body = [], []
+
+    async def receive() -> dict:
+        try:
+            return next(messages)
+        except StopIteration:
+            # The client never disconnects; the handler cancels this.
+            await asyncio.Event().wait()
+            raise
+
+    async def send(message: dict) -> None:
+        if message['type'] == 'http.response.body':
+            read_before_first_block.append(len(read))
+            body.append(message.get('body', b''))
+
+    cookie = '; '.join(
+        f'{name}={morsel.value}'
+        for name, morsel in admin_client.cookies.items()
+    )
+    async_to_sync(ASGIHandler())(
+        {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': URL,
+            'raw_path': URL.encode(),
+            'root_path': '',
+            'query_string': b'format=ndjson',
+            'headers': [
+                (b'host', b'testserver'),
+                (b'cookie', cookie.encode()),
+            ],
+            'client': ('127.0.0.1', 50000),
+            'server': ('testserver', 80),
+        },
+        receive,
+        send,
+    )
+    assert len(b''.join(body).decode().splitlines()) == total
+    assert read_before_first_block[0] < total
+
+
+@pytest.mark.django_db
+class TestExportCommand:
+    """manage.py export_audit_log"""
+
+    def test_writes_gzipped_file(self, tmp_path: Path) -> None:
+        _entry('Sample 1')
+        target = tmp_path / 'audit.ndjson.gz'
+        call_command(
+            'export_audit_log',
+            '--format=ndjson',
+            '--gzip',
+            f'--output={target}',
+            stdout=io.StringIO(),
+        )
+        line = gzip.decompress(target.read_bytes()).decode().splitlines()[0]
+        assert json.loads(line)['object_repr'] == 'Sample 1'
+
+    def test_writes_to_stdout(self) -> None:
+        _entry('in range', timestamp=_utc(2025, 3))
+        _entry('too late', timestamp=_utc(2025, 5))
+        out = io.StringIO()
+        call_command(
+            'export_audit_log',
+            '--since=2025-01-01',
+            '--until=2025-04-01',
+            stdout=out,
+        )
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        assert [row['object_repr'] for row in rows] == ['in range']
+
+    def test_gzip_needs_output_file(self) -> None:
+        with pytest.raises(CommandError, match='--output'):
+            call_command('export_audit_log', '--gzip')
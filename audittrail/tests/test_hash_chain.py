@@ -0,0 +1,268 @@
+"""
+Tests for the tamper-evident audit hash chain.
+
+Every inserted entry must link to its predecessor, and
+``verify_audit_chain`` must notice modified, deleted or unsealed rows
+while only re-checking entries written since the last checkpoint.
+"""
+from collections.abc import Callable
+from itertools import pairwise
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import CommandError, call_command
+from django.db import transaction
+
+from audittrail import chain
+from audittrail.models import AuditCheckpoint, AuditLogEntry
+
+
+def _entries(count: int, **extra: object) -> list[AuditLogEntry]:
+    # save() bypasses the transaction buffer of objects.create().
+    content_type = ContentType.objects.get_for_model(AuditLogEntry)
+    entries = []
+    for i in range(count):
+        entry = AuditLogEntry(
+            content_type=content_type,
+            object_pk=str(i),
+            object_repr=f'sample {i}',
+            action=AuditLogEntry.Action.CREATE,
+            changes={'name': [None, f'sample {i}']},
+            **extra,
+        )
+        entry.save()
+        entries.append(entry)
+    return entries
+
+
+def _verify(*args: str) -> AuditCheckpoint:
+    call_command('verify_audit_chain', *args)
+    return AuditCheckpoint.objects.first()
+
+
+class TestMerkleRoot:
+    """Merkle roots over entry hashes."""
+
+    def test_root_depends_on_order(self) -> None:
+        a, b = 'a' * 64, 'b' * 64
+        assert chain.merkle_root([a, b]) != chain.merkle_root([b, a])
+
+    def test_single_leaf_is_not_the_leaf_itself(self) -> None:
+        leaf = 'c' * 64
+        assert chain.merkle_root([leaf]) != leaf
+
+    def test_odd_number_of_leaves(self) -> None:
+        hashes = [f'{i:064x}' for i in range(5)]
+        assert chain.merkle_root(hashes) != chain.merkle_root(hashes[:4])
+
+    def test_builder_matches(self) -> None:
+        hashes = [f'{i:064x}' for i in range(40)]
+        builder = chain.MerkleBuilder()
+        assert builder.root() == chain.merkle_root([])
+        for count, entry_hash in enumerate(hashes, 1):
+            builder.add(entry_hash)
+            assert builder.count == count
+            assert builder.root() == chain.merkle_root(hashes[:count])
+
+
+@pytest.mark.django_db
+class TestSealing:
+    """Entries are linked when they are inserted."""
+
+    def test_entries_link_to_their_predecessor(self) -> None:
+        first, second, third = _entries(3)
+        assert first.previous_hash == chain.GENESIS_HASH
+        assert second.previous_hash == first.entry_hash
+        assert third.previous_hash == second.entry_hash
+
+    def test_buffered_entries_are_sealed_on_commit(
+        self,
+        audited_user_model: type,
+        django_capture_on_commit_callbacks: Callable,
+    ) -> None:
+        """The bulk insert of the buffer extends the same chain."""
+        (existing,) = _entries(1)
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                for i in range(3):
+                    audited_user_model.objects.create_user(
+                        email=f'analyst{i}@example.com'
+                    )
+
+        rows = list(
+            AuditLogEntry.objects.order_by('id').values_list(
+                'previous_hash', 'entry_hash'
+            )
+        )
+        assert rows[0] == (chain.GENESIS_HASH, existing.entry_hash)
+        for (_, previous), (link, _) in pairwise(rows):
+            assert link == previous
+
+    def test_stored_values_reproduce_the_hash(self) -> None:
+        """Database round trips do not change the hashed content."""
+        (entry,) = _entries(
+            1,
+            remote_addr='::ffff:10.0.0.1',
+            additional_data={'reason': 'Überprüfung', 'n': 1.5},
+        )
+        row = AuditLogEntry.objects.values(*chain.VERIFY_FIELDS).get()
+        assert chain.entry_digest(
+            AuditLogEntry, row, row['previous_hash']
+        ) == entry.entry_hash
+
+
+@pytest.mark.django_db
+class TestVerifyCommand:
+    """verify_audit_chain checks incrementally and records checkpoints."""
+
+    def test_intact_chain_records_checkpoint(self) -> None:
+        entries = _entries(4)
+        checkpoint = _verify()
+        assert checkpoint.first_entry_id == entries[0].id
+        assert checkpoint.last_entry_id == entries[-1].id
+        assert checkpoint.entry_count == 4
+        assert checkpoint.chain_hash == entries[-1].entry_hash
+        assert checkpoint.merkle_root == chain.merkle_root(
+            e.entry_hash for e in entries
+        )
+
+    def test_only_new_entries_are_verified(
+        self,
+        capsys: pytest.CaptureFixture,
+    ) -> None:
+        _entries(3)
+        _verify()
+        new = _entries(2)
+        checkpoint = _verify('--range-size', '1')
+        assert checkpoint.first_entry_id == new[0].id
+        assert checkpoint.entry_count == 2
+        assert 'Verified 2 entries' in capsys.readouterr().out
+
+    def test_nothing_new_records_no_checkpoint(self) -> None:
+        _entries(2)
+        _verify()
+        _verify()
+        assert AuditCheckpoint.objects.count() == 1
+
+    def test_modified_entry_is_detected(self) -> None:
+        entries = _entries(3)
+        AuditLogEntry.objects.filter(pk=entries[1].pk).update(
+            object_repr='forged'
+        )
+        with pytest.raises(CommandError, match='1 problem'):
+            _verify()
+        assert not AuditCheckpoint.objects.exists()
+
+    def test_deleted_entry_is_detected(self) -> None:
+        entries = _entries(3)
+        AuditLogEntry.objects.filter(pk=entries[1].pk).delete()
+        with pytest.raises(CommandError, match='1 problem'):
+            _verify()
+
+    def test_deletion_across_ranges_is_detected(self) -> None:
+        """The links between worker ranges are checked as well."""
+        entries = _entries(4)
+        AuditLogEntry.objects.filter(pk=entries[2].pk).delete()
+        with pytest.raises(CommandError):
+            _verify('--range-size', '2')
+
+    def test_unsealed_entry_is_detected(self) -> None:
+        entries = _entries(2)
+        AuditLogEntry.objects.filter(pk=entries[1].pk).update(entry_hash='')
+        with pytest.raises(CommandError, match='problem'):
+            _verify()
+
+    def test_full_run_detects_tampering_before_checkpoint(self) -> None:
+        """Incremental runs skip checkpointed entries, --full does not."""
+        entries = _entries(3)
+        _verify()
+        AuditLogEntry.objects.filter(pk=entries[0].pk).update(
+            object_repr='forged'
+        )
+        _verify()
+        with pytest.raises(CommandError):
+            _verify('--full')
+
+    def test_full_run_checkpoints_only_uncovered_entries(self) -> None:
+        _entries(2)
+        _verify()
+        new = _entries(1)
+        checkpoint = _verify('--full')
+        assert AuditCheckpoint.objects.count() == 2
+        assert checkpoint.first_entry_id == new[0].id
+        assert checkpoint.entry_count == 1
+
+    def test_full_run_detects_deleted_checkpointed_entry(self) -> None:
+        entries = _entries(3)
+        _verify()
+        _entries(1)
+        AuditLogEntry.objects.filter(pk=entries[1].pk).delete()
+        with pytest.raises(CommandError, match='2 problem'):
+            _verify('--full')
+
+
+@pytest.mark.django_db
+class TestDetachedPartitions:
+    """--full after audit_partitions detached the oldest entries."""
+
+    @pytest.fixture
+    def entries(self) -> list[AuditLogEntry]:
+        """Three checkpoints, over three, three and two entries."""
+        entries = []
+        for count in (3, 3, 2):
+            entries += _entries(count)
+            _verify()
+        return entries
+
+    def _detach(self, entries: list[AuditLogEntry]) -> None:
+        AuditLogEntry.objects.filter(pk__lte=entries[-1].pk).delete()
+
+    def test_skips_checkpoints_of_detached_entries(
+        self,
+        entries: list[AuditLogEntry],
+        capsys: pytest.CaptureFixture,
+    ) -> None:
+        self._detach(entries[:3])
+        _verify('--full', '--range-size', '2')
+        out = capsys.readouterr().out
+        assert f'before {entries[3].pk} are detached; skipped 1' in out
+        assert 'Verified 5 entries' in out
+
+    def test_checkpoint_partly_detached(
+        self,
+        entries: list[AuditLogEntry],
+        capsys: pytest.CaptureFixture,
+    ) -> None:
+        self._detach(entries[:4])
+        _verify('--full')
+        assert 'Verified 4 entries' in capsys.readouterr().out
+        AuditLogEntry.objects.filter(pk=entries[5].pk).update(
+            object_repr='forged'
+        )
+        with pytest.raises(CommandError, match='1 problem'):
+            _verify('--full')
+
+    def test_chain_must_continue_the_detached_one(
+        self,
+        entries: list[AuditLogEntry],
+    ) -> None:
+        """Detached entries no checkpoint covered leave a break."""
+        AuditCheckpoint.objects.filter(last_entry_id=entries[5].pk).delete()
+        self._detach(entries[:6])
+        with pytest.raises(CommandError, match='1 problem'):
+            _verify('--full')
+
+    def test_without_checkpoints(self) -> None:
+        entries = _entries(3)
+        self._detach(entries[:1])
+        with pytest.raises(CommandError, match='1 problem'):
+            _verify('--full')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_verification_in_worker_processes() -> None:
+    """Ranges can be verified by a process pool."""
+    entries = _entries(6)
+    checkpoint = _verify('--workers', '2', '--range-size', '2')
+    assert checkpoint.entry_count == 6
+    assert checkpoint.chain_hash == entries[-1].entry_hash
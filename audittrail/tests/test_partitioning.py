@@ -0,0 +1,138 @@
+"""
+Tests for the monthly partitioned audit log table.
+
+The test database is created without migrations, so each test converts
+the plain table itself. DDL is transactional in PostgreSQL and is
+rolled back with the test.
+"""
+import datetime
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from audittrail import partitioning
+from audittrail.models import AuditLogEntry
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'postgresql',
+        reason='Partitioning requires PostgreSQL',
+    ),
+]
+
+TODAY = datetime.date(2026, 3, 15)
+
+
+def _entry_at(when: datetime.datetime) -> AuditLogEntry:
+    # save() bypasses the transaction buffer of objects.create().
+    entry = AuditLogEntry(
+        content_type=ContentType.objects.get_for_model(AuditLogEntry),
+        object_pk='1',
+        object_repr='sample',
+        action=AuditLogEntry.Action.CREATE,
+        timestamp=when,
+    )
+    entry.save()
+    return entry
+
+
+def _utc(year: int, month: int, day: int = 1) -> datetime.datetime:
+    return datetime.datetime(year, month, day, tzinfo=datetime.UTC)
+
+
+@pytest.fixture
+def partitioned() -> None:
+    """Convert the audit table and check foreign keys immediately."""
+    with connection.cursor() as cursor:
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+    partitioning.convert_to_partitioned(connection, TODAY, months_ahead=2)
+
+
+class TestMonthArithmetic:
+    """Pure date helpers."""
+
+    def test_add_months_wraps_year(self) -> None:
+        assert partitioning.add_months(
+            datetime.date(2026, 11, 1), 3
+        ) == datetime.date(2027, 2, 1)
+        assert partitioning.add_months(
+            datetime.date(2026, 1, 1), -1
+        ) == datetime.date(2025, 12, 1)
+
+    def test_partition_name(self) -> None:
+        name = partitioning.partition_name(datetime.date(2026, 3, 1))
+        assert name == 'audittrail_auditlogentry_y2026m03'
+
+
+@pytest.mark.usefixtures('partitioned')
+class TestPartitionedTable:
+    """Behaviour of the converted table."""
+
+    def test_conversion_creates_current_and_future_months(self) -> None:
+        assert partitioning.is_partitioned(connection)
+        months = [p.month for p in partitioning.list_partitions(connection)]
+        assert months == [
+            datetime.date(2026, 3, 1),
+            datetime.date(2026, 4, 1),
+            datetime.date(2026, 5, 1),
+        ]
+
+    def test_orm_reads_and_writes_through_partitions(self) -> None:
+        entry = _entry_at(_utc(2026, 4, 2))
+        assert AuditLogEntry.objects.get(pk=entry.pk) == entry
+
+    def test_date_filter_prunes_partitions(self) -> None:
+        plan = AuditLogEntry.objects.for_period(
+            _utc(2026, 4, 1), _utc(2026, 5, 1)
+        ).explain()
+        assert 'y2026m04' in plan
+        assert 'y2026m03' not in plan
+        assert 'y2026m05' not in plan
+
+    def test_missing_month_lands_in_default_and_moves(self) -> None:
+        entry = _entry_at(_utc(2027, 1, 5))
+        default = partitioning.default_partition_name()
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {default}')  # noqa: S608
+            assert cursor.fetchone()[0] == 1
+
+        assert partitioning.create_partition(
+            connection, datetime.date(2027, 1, 1)
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {default}')  # noqa: S608
+            assert cursor.fetchone()[0] == 0
+        assert AuditLogEntry.objects.get(pk=entry.pk)
+
+    def test_create_partition_is_idempotent(self) -> None:
+        assert not partitioning.create_partition(
+            connection, datetime.date(2026, 3, 1)
+        )
+
+    def test_detach_keeps_rows_in_archive_table(self) -> None:
+        _entry_at(_utc(2026, 3, 20))
+        oldest = partitioning.list_partitions(connection)[0]
+
+        name = partitioning.detach_partition(
+            connection, oldest, archive_schema='audit_archive'
+        )
+
+        assert not AuditLogEntry.objects.exists()
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {name}')  # noqa: S608
+            assert cursor.fetchone()[0] == 1
+
+    def test_command_creates_partitions_ahead(self) -> None:
+        call_command('audit_partitions', months_ahead=12)
+        months = [p.month for p in partitioning.list_partitions(connection)]
+        assert len(months) >= 12
+
+
+def test_command_requires_partitioned_table() -> None:
+    """Without the migration the command refuses to run."""
+    with pytest.raises(CommandError, match='not partitioned'):
+        call_command('audit_partitions')
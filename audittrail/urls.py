@@ -0,0 +1,14 @@
+from django.urls import path
+
+from .views import AuditExportView, CorrelationIdLookupView
+
+app_name = 'audittrail'
+
+urlpatterns = [
+    path('export/', AuditExportView.as_view(), name='export'),
+    path(
+        'cid/<path:cid>/',
+        CorrelationIdLookupView.as_view(),
+        name='cid-lookup',
+    ),
+]
@@ -1,3 +1,145 @@
-#from django.shortcuts import render
+# audittrail/views.py
+import datetime
 
-# Create your views here.
+from django.contrib.auth.mixins import PermissionRequiredMixin
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views import View
+
+from audittrail import export
+from audittrail.models import AuditLogEntry
+
+MAX_CID_RESULTS = 1000
+
+CID_FIELDS = (
+    'id',
+    'timestamp',
+    'cid',
+    'action',
+    'content_type__app_label',
+    'content_type__model',
+    'object_pk',
+    'object_repr',
+    'changes',
+    'actor_id',
+    'actor_email',
+    'remote_addr',
+)
+
+
+def _timestamp(value: str) -> datetime.datetime | None:
+    """
+    Parse an ISO 8601 datetime, or return None if it is invalid.
+
+    Naive values are taken to be in ``TIME_ZONE``.
+    """
+    try:
+        moment = parse_datetime(value)
+    except ValueError:
+        # Well formed, but not a date (e.g. February 30th).
+        return None
+    if moment is not None and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class CorrelationIdLookupView(PermissionRequiredMixin, View):
+    """
+    Return every audit entry recorded under a correlation ID as JSON.
+
+    Optional ``since`` / ``until`` query parameters (ISO 8601) restrict
+    the search to a time window, which lets PostgreSQL skip partitions.
+    """
+
+    permission_required = 'audittrail.view_auditlogentry'
+    raise_exception = True
+
+    def get(self, request: HttpRequest, cid: str) -> JsonResponse:
+        entries = AuditLogEntry.objects.for_cid(cid)
+        for param, lookup in (('since', 'gte'), ('until', 'lt')):
+            value = request.GET.get(param)
+            if value is None:
+                continue
+            moment = _timestamp(value)
+            if moment is None:
+                return JsonResponse(
+                    {'error': f'Invalid {param!r} timestamp.'}, status=400
+                )
+            entries = entries.filter(**{f'timestamp__{lookup}': moment})
+
+        rows = list(
+            entries.order_by('timestamp', 'id').values(*CID_FIELDS)[
+                : MAX_CID_RESULTS + 1
+            ]
+        )
+        truncated = len(rows) > MAX_CID_RESULTS
+        return JsonResponse({
+            'cid': cid,
+            'count': min(len(rows), MAX_CID_RESULTS),
+            'truncated': truncated,
+            'entries': [
+                export.flatten_content_type(row)
+                for row in rows[:MAX_CID_RESULTS]
+            ],
+        })
+
+
+class AuditExportView(PermissionRequiredMixin, View):
+    """
+    Stream audit entries as a CSV or NDJSON download.
+
+    Query parameters: ``format`` (``csv`` or ``ndjson``), ``gzip=1``,
+    ``since`` / ``until`` (ISO 8601), ``model`` (``app_label.model``)
+    and ``cid``. Rows are streamed straight from a server-side cursor,
+    so exports of any size use constant memory, under ASGI as well.
+    """
+
+    permission_required = 'audittrail.view_auditlogentry'
+    raise_exception = True
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in export.FORMATS:
+            return HttpResponseBadRequest(
+                f'Unsupported format {export_format!r}.'
+            )
+        bounds = {}
+        for param in ('since', 'until'):
+            value = request.GET.get(param)
+            if value is None:
+                continue
+            bounds[param] = _timestamp(value)
+            if bounds[param] is None:
+                return HttpResponseBadRequest(f'Invalid {param!r} timestamp.')
+        try:
+            entries = export.filter_entries(
+                model=request.GET.get('model'),
+                cid=request.GET.get('cid'),
+                **bounds,
+            )
+        except ValueError as exc:
+            return HttpResponseBadRequest(str(exc))
+
+        gzip = request.GET.get('gzip') in ('1', 'true')
+        stream = export.export(entries, export_format, gzip=gzip)
+        if isinstance(request, ASGIRequest):
+            stream = export.aiter_blocks(stream)
+        response = StreamingHttpResponse(
+            stream,
+            content_type=(
+                'application/gzip'
+                if gzip
+                else f'{export.CONTENT_TYPES[export_format]}; charset=utf-8'
+            ),
+        )
+        name = export.filename(export_format, gzip=gzip)
+        response['Content-Disposition'] = f'attachment; filename="{name}"'
+        return response
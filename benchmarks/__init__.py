@@ -0,0 +1,13 @@
+"""
+Standalone performance benchmarks for ForenLIMS.
+
+Run a benchmark from the project root, e.g.::
+
+    poetry run python -m benchmarks.bench_audit_writer
+
+Benchmarks use a throwaway test database and never touch dev data.
+
+``bench_http`` is the regression gate: it compares request latency and
+queries per request with ``baselines/bench_http.json`` and exits with
+status 1 on a regression.
+"""
@@ -0,0 +1,157 @@
+# benchmarks/bench_asgi.py
+"""
+Home page throughput under WSGI and ASGI.
+
+``--requests`` anonymous GETs of ``/`` are pushed through Django's own
+handlers, ``--concurrency`` at a time, with the full middleware stack:
+
+* WSGI: ``WSGIHandler`` on a thread pool, the sync ``HomeView``;
+* ASGI with the same middleware and view, as before the ASGI profile;
+* the ASGI profile of ``core/asgi.py``: ``ASGI_MIDDLEWARE`` and
+  ``AsyncHomeView``.
+
+No server is involved, so the numbers show the cost of the Django
+stack itself. Anonymous requests without a session need no database.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import types
+import wsgiref.util
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.harness import print_table, setup_django, webpack_manifest
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.core.handlers.asgi import ASGIHandler  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import path  # noqa: E402
+
+from core import urls  # noqa: E402
+from pages.views import AsyncHomeView, HomeView  # noqa: E402
+
+# The stack as configured without DJANGO_ASGI, and with it.
+STOCK = {new: old for old, new in settings.ASGI_MIDDLEWARE.items()}
+WSGI_MIDDLEWARE = [STOCK.get(m, m) for m in settings.MIDDLEWARE]
+ASGI_MIDDLEWARE = [settings.ASGI_MIDDLEWARE.get(m, m) for m in WSGI_MIDDLEWARE]
+SCOPE = {
+    'type': 'http',
+    'asgi': {'version': '3.0'},
+    'http_version': '1.1',
+    'method': 'GET',
+    'scheme': 'http',
+    'path': '/',
+    'raw_path': b'/',
+    'root_path': '',
+    'query_string': b'',
+    'headers': [(b'host', b'localhost')],
+    'client': ('127.0.0.1', 50000),
+    'server': ('localhost', 80),
+}
+
+
+def _urlconf(view: type[HomeView]) -> types.ModuleType:
+    module = types.ModuleType('bench_asgi_urls')
+    module.urlpatterns = [
+        path('', view.as_view(), name='home'),
+        *urls.urlpatterns,
+    ]
+    return module
+
+
+def _wsgi_request(handler: WSGIHandler) -> float:
+    environ = {'PATH_INFO': '/', 'HTTP_HOST': 'localhost'}
+    wsgiref.util.setup_testing_defaults(environ)
+    started = time.perf_counter()
+    response = handler(environ, lambda status, headers: None)
+    b''.join(response)
+    response.close()
+    return time.perf_counter() - started
+
+
+async def _asgi_request(handler: ASGIHandler) -> float:
+    messages = iter([{'type': 'http.request', 'body': b''}])
+
+    async def receive() -> dict:
+        try:
+            return next(messages)
+        except StopIteration:
+            # The client never disconnects; the handler cancels this.
+            await asyncio.Event().wait()
+            raise
+
+    async def send(message: dict) -> None:
+        pass
+
+    started = time.perf_counter()
+    await handler(dict(SCOPE), receive, send)
+    return time.perf_counter() - started
+
+
+def load_wsgi(requests: int, concurrency: int) -> list[float]:
+    handler = WSGIHandler()
+    with ThreadPoolExecutor(concurrency) as pool:
+        return list(
+            pool.map(lambda _: _wsgi_request(handler), range(requests))
+        )
+
+
+def load_asgi(requests: int, concurrency: int) -> list[float]:
+    handler = ASGIHandler()
+
+    async def one(limit: asyncio.Semaphore) -> float:
+        async with limit:
+            return await _asgi_request(handler)
+
+    async def all_requests() -> list[float]:
+        limit = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(one(limit) for _ in range(requests)))
+
+    return asyncio.run(all_requests())
+
+
+Variant = tuple[str, Callable[[int, int], list[float]], Sequence[str], type]
+
+VARIANTS: tuple[Variant, ...] = (
+    ('WSGI', load_wsgi, WSGI_MIDDLEWARE, HomeView),
+    ('ASGI, WSGI middleware and view', load_asgi, WSGI_MIDDLEWARE, HomeView),
+    ('ASGI profile', load_asgi, ASGI_MIDDLEWARE, AsyncHomeView),
+)
+
+
+def run(requests: int, concurrency: int) -> None:
+    rows = []
+    for label, load, middleware, view in VARIANTS:
+        with override_settings(
+            MIDDLEWARE=list(middleware),
+            ROOT_URLCONF=_urlconf(view),
+        ):
+            load(min(requests, 50), concurrency)  # warm-up
+            started = time.perf_counter()
+            latencies = sorted(load(requests, concurrency))
+            elapsed = time.perf_counter() - started
+        rows.append((
+            label,
+            f'{requests / elapsed:.0f}',
+            statistics.median(latencies) * 1000,
+            latencies[int(len(latencies) * 0.95)] * 1000,
+        ))
+    print_table(('profile', 'req/s', 'p50 ms', 'p95 ms'), rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+    with webpack_manifest():
+        run(args.requests, args.concurrency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_audit_writer.py
+"""
+Audit log write latency: one INSERT per entry vs. one per transaction.
+
+For each batch size N, N audited records are created inside a single
+transaction, once with ``AUDITTRAIL_BUFFERED_WRITES`` disabled and once
+with it enabled. The table shows the total transaction time and the
+audit overhead per record.
+"""
+import argparse
+import itertools
+
+from benchmarks.harness import (
+    benchmark_database,
+    measure,
+    print_table,
+    setup_django,
+)
+
+setup_django()
+
+# NOW safe to import Django models
+from auditlog.registry import auditlog  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from audittrail.models import AuditLogEntry  # noqa: E402
+
+BATCH_SIZES = (1, 10, 100, 1000)
+
+
+def run(batch_sizes: tuple[int, ...], repeat: int) -> None:
+    user_model = get_user_model()
+    auditlog.register(user_model)
+    counter = itertools.count()
+
+    def reset() -> None:
+        AuditLogEntry.objects.all().delete()
+        user_model.objects.all().delete()
+
+    def edit(size: int) -> None:
+        # Plain model instances keep the password hasher out of the numbers.
+        with transaction.atomic():
+            for _ in range(size):
+                user_model(email=f'analyst{next(counter)}@example.com').save()
+
+    rows = []
+    for size in batch_sizes:
+        timings = {}
+        for buffered in (False, True):
+            with override_settings(AUDITTRAIL_BUFFERED_WRITES=buffered):
+                timings[buffered] = measure(
+                    lambda size=size: edit(size), repeat=repeat, setup=reset
+                )
+        direct, batched = timings[False].median, timings[True].median
+        rows.append((
+            size,
+            direct,
+            batched,
+            direct / size,
+            batched / size,
+            f'{direct / batched:.2f}x',
+        ))
+
+    auditlog.unregister(user_model)
+    print_table(
+        (
+            'records',
+            'direct ms',
+            'buffered ms',
+            'direct ms/rec',
+            'buffered ms/rec',
+            'speed-up',
+        ),
+        rows,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=list(BATCH_SIZES),
+        help='Number of audited records per transaction.',
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        run(tuple(args.sizes), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
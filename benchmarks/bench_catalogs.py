@@ -0,0 +1,146 @@
+# benchmarks/bench_catalogs.py
+"""
+Cold start and memory of Django's translations vs merged catalogs.
+
+Loading every configured language with Django's ``DjangoTranslation``
+(each ``.mo`` file parsed into dictionaries) is compared with
+``core.catalogs.install()``, which maps the files ``build_catalogs``
+wrote to a temporary directory: time to load, Python memory held after
+loading, and time to look up every German message once and a second
+time.
+
+Then the first and second German request for ``/`` are timed in a
+process whose translations are cold, without and with ``warm_up()``,
+with the page cache off.
+"""
+import argparse
+import gettext
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from benchmarks.harness import (
+    benchmark_database,
+    measure,
+    print_table,
+    setup_django,
+    webpack_manifest,
+)
+
+setup_django()
+
+from django.core.management import call_command  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.utils import formats  # noqa: E402
+from django.utils.translation import trans_real  # noqa: E402
+
+from core import catalogs  # noqa: E402
+
+
+def _cold() -> None:
+    """Forget every loaded translation and format module."""
+    gettext._translations.clear()
+    trans_real._translations.clear()
+    formats._format_cache.clear()
+    formats._format_modules_cache.clear()
+
+
+def _allocated(load: Callable[[], object]) -> tuple[object, int]:
+    tracemalloc.start()
+    loaded = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return loaded, size
+
+
+def _lookups(translation: object, messages: list[str]) -> float:
+    started = time.perf_counter()
+    for message in messages:
+        translation.gettext(message)
+    return (time.perf_counter() - started) * 1000
+
+
+def _load_django() -> None:
+    for language in catalogs.languages():
+        trans_real.translation(language)
+
+
+def run_catalogs(repeat: int) -> None:
+    messages = [
+        key
+        for key in trans_real.DjangoTranslation('de')._catalog.keys()
+        if isinstance(key, str)
+    ]
+    rows = []
+    for label, load in (
+        ('DjangoTranslation', _load_django),
+        ('MappedTranslation', catalogs.install),
+    ):
+        timing = measure(load, repeat=repeat, setup=_cold)
+        _cold()
+        _, size = _allocated(load)
+        german = trans_real.translation('de')
+        rows.append((
+            label,
+            round(timing.median, 2),
+            f'{size / 1024:.0f} KiB',
+            round(_lookups(german, messages), 2),
+            round(_lookups(german, messages), 2),
+        ))
+    print(
+        f'{", ".join(catalogs.languages())} loaded; '
+        f'{len(messages)} German messages looked up twice.\n'
+    )
+    print_table(
+        (
+            'translations',
+            'load ms',
+            'memory',
+            'lookups ms, 1st',
+            'lookups ms, 2nd',
+        ),
+        rows,
+    )
+
+
+def run_requests() -> None:
+    # Load templates and everything else unrelated to translations.
+    Client().get('/', headers={'accept-language': 'de'})
+    rows = []
+    for label, warm in (('cold', False), ('warm_up()', True)):
+        _cold()
+        if warm:
+            catalogs.warm_up()
+        client = Client()
+        timings = []
+        for _ in range(2):
+            started = time.perf_counter()
+            client.get('/', headers={'accept-language': 'de'})
+            timings.append((time.perf_counter() - started) * 1000)
+        rows.append((label, round(timings[0], 2), round(timings[1], 2)))
+    print()
+    print_table(('start', '1st request ms', '2nd request ms'), rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        override_settings(
+            TRANSLATION_CATALOG_DIR=directory,
+            TRANSLATION_CATALOGS=True,
+            PAGE_CACHE=False,
+        ),
+    ):
+        call_command('build_catalogs', verbosity=0)
+        run_catalogs(args.repeat)
+        with benchmark_database(), webpack_manifest():
+            run_requests()
+
+
+if __name__ == '__main__':
+    main()
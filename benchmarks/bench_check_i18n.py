@@ -0,0 +1,369 @@
+# benchmarks/bench_check_i18n.py
+"""
+Matching engine of scripts/check_i18n.py on a synthetic project.
+
+A tree of ``--files`` generated Python modules and templates is written
+to a temporary directory. The exclusion test, the template cleaner and
+the line lookup are timed against straightforward reference versions
+(one ``re.match`` per pattern, one ``re.sub`` per kind of markup, a
+line-by-line search), followed by a full uncached, single-process
+scan.
+
+The Python scanner is timed separately on single modules of
+``--module-lines`` lines: the former three visitors (imports, calls,
+constants) against the single ``TranslationVisitor`` pass.
+
+Startup is timed in fresh interpreters: importing the scanner with
+Django set up eagerly, as it used to be, against the lazy import, and
+whole runs over Python files only, over the project, and with
+``--no-django``.
+"""
+import argparse
+import ast
+import random
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.harness import (
+    PROJECT_ROOT,
+    measure,
+    print_table,
+    setup_django,
+)
+
+setup_django()
+
+from scripts import check_i18n  # noqa: E402
+
+WORDS = (
+    'sample', 'analysis', 'profile', 'extract', 'report', 'batch',
+    'locus', 'allele', 'review', 'result', 'pending', 'approved',
+)
+
+TEMPLATE = """{{% extends "base.html" %}}
+{{% load i18n %}}
+{{% block content %}}
+{sections}{{% endblock content %}}
+"""
+
+SECTION = """    <!-- {comment} -->
+    <h2 class="title">{{% trans "{translated}" %}}</h2>
+    <p title="{attribute}">{text}</p>
+    {{% if user.is_authenticated %}}
+        <a href="{{% url 'home' %}}">{{{{ user.email }}}}</a>
+    {{% endif %}}
+    {{% blocktrans %}}{block} {{{{ count }}}}{{% endblocktrans %}}
+    <div {{% if flag > 1 %}}class="wide"{{% endif %}}>{text}</div>
+"""
+SECTIONS = 6
+
+MODULE = """from django.utils.translation import gettext_lazy as _
+
+LABEL = _({translated!r})
+HELP_TEXT = {text!r}
+FIELD = {identifier!r}
+URL = 'https://example.com/{identifier}'
+
+
+def describe(value):
+    return f'{{value}}: ' + {attribute!r}
+"""
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _values(rng: random.Random) -> dict[str, str]:
+    return {
+        'comment': _sentence(rng, 4),
+        'translated': _sentence(rng, 3),
+        'attribute': _sentence(rng, 2),
+        'text': _sentence(rng, 5),
+        'block': _sentence(rng, 3),
+        'identifier': '_'.join(rng.sample(WORDS, 2)),
+    }
+
+
+def build_tree(root: Path, files: int, seed: int = 0) -> None:
+    """Write ``files`` modules and templates below ``root``."""
+    rng = random.Random(seed)  # noqa: S311
+    for n in range(files):
+        package = root / f'app{n // 100}'
+        package.mkdir(exist_ok=True)
+        if n % 3:
+            source = MODULE.format(**_values(rng))
+            (package / f'module{n}.py').write_text(source)
+        else:
+            sections = ''.join(
+                SECTION.format(**_values(rng)) for _ in range(SECTIONS)
+            )
+            source = TEMPLATE.format(sections=sections)
+            (package / f'page{n}.html').write_text(source)
+
+
+def exclude_reference(s: str) -> bool:
+    s = s.strip()
+    if len(s) < check_i18n.MIN_STRING_LENGTH:
+        return True
+    return any(
+        re.match(pattern, s, re.IGNORECASE)
+        for pattern in check_i18n.EXCLUDE_PATTERNS
+    )
+
+
+def clean_reference(raw_text: str) -> str:
+    text = re.sub(r'<!--.*?-->', '', raw_text, flags=re.DOTALL)
+    text = re.sub(r'\{%.*?%\}', '', text, flags=re.DOTALL)
+    text = re.sub(r'\{\{[^}]*\}\}', '', text, flags=re.DOTALL)
+    text = re.sub(r'<[^>]+>', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def line_reference(content: str, text: str) -> int | None:
+    for i, line in enumerate(content.splitlines(), 1):
+        if text.lower() in line.lower():
+            return i
+    return None
+
+
+def python_reference(tree: ast.AST) -> list[tuple[int, str]]:
+    """check_python_file() with one traversal per kind of node."""
+    aliases: dict[str, set[str]] = {}
+    known = check_i18n.KNOWN_TRANSLATION_FUNCS
+
+    class ImportCollector(ast.NodeVisitor):
+        def visit_Import(self, node: ast.Import) -> None:
+            for alias in node.names:
+                if alias.name == 'gettext' or alias.name.startswith(
+                    'django.utils.translation'
+                ):
+                    local_name = alias.asname or alias.name.split('.')[-1]
+                    aliases[local_name] = set(known)
+
+        def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+            if node.module in ('gettext', 'django.utils.translation'):
+                for alias in node.names:
+                    if alias.name in known:
+                        local_name = alias.asname or alias.name
+                        aliases.setdefault(local_name, set()).add(alias.name)
+
+    translated = set()
+
+    class CallCollector(ast.NodeVisitor):
+        def visit_Call(self, node: ast.Call) -> None:
+            func = node.func
+            if isinstance(func, ast.Name):
+                is_translation = bool(aliases.get(func.id))
+            else:
+                is_translation = (
+                    isinstance(func, ast.Attribute)
+                    and isinstance(func.value, ast.Name)
+                    and func.attr in aliases.get(func.value.id, ())
+                )
+            if is_translation:
+                translated.update(
+                    arg.value
+                    for arg in node.args
+                    if isinstance(arg, ast.Constant)
+                    and isinstance(arg.value, str)
+                )
+            self.generic_visit(node)
+
+    unmarked = []
+
+    class StringFinder(ast.NodeVisitor):
+        def visit_Constant(self, node: ast.Constant) -> None:
+            value = node.value
+            if (
+                isinstance(value, str)
+                and value not in translated
+                and not check_i18n.should_exclude_string(value)
+            ):
+                unmarked.append((node.lineno, value))
+
+    ImportCollector().visit(tree)
+    CallCollector().visit(tree)
+    StringFinder().visit(tree)
+    return unmarked
+
+
+def build_module(lines: int, seed: int = 0) -> str:
+    """Return a module of roughly ``lines`` lines."""
+    rng = random.Random(seed)  # noqa: S311
+    blocks = []
+    count = 0
+    while count < lines:
+        block = MODULE.format(**_values(rng)).replace(
+            'def describe(', f'def describe{count}('
+        )
+        blocks.append(block)
+        count += block.count('\n')
+    return '\n'.join(blocks)
+
+
+def run_visitor(sizes: tuple[int, ...], repeat: int) -> None:
+    rows = []
+    for lines in sizes:
+        tree = ast.parse(build_module(lines))
+        visitor = check_i18n.TranslationVisitor
+        if python_reference(tree) != visitor().scan(tree):
+            raise AssertionError('Scanners disagree')
+        before = measure(lambda t=tree: python_reference(t), repeat=repeat)
+        after = measure(lambda t=tree: visitor().scan(t), repeat=repeat)
+        rows.append((
+            lines,
+            before.median,
+            after.median,
+            f'{before.median / after.median:.2f}x',
+        ))
+    print()
+    print_table(
+        ('module lines', 'three passes ms', 'one pass ms', 'speed-up'),
+        rows,
+    )
+
+
+def _string_constants(sources: list[str]) -> list[str]:
+    return [
+        node.value
+        for source in sources
+        for node in ast.walk(ast.parse(source))
+        if isinstance(node, ast.Constant) and isinstance(node.value, str)
+    ]
+
+
+def run(files: int, repeat: int, full_scan: bool) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        build_tree(root, files)
+        paths = sorted(root.rglob('*.*'))
+        sources = [p.read_text() for p in paths if p.suffix == '.py']
+        templates = [p.read_text() for p in paths if p.suffix == '.html']
+        strings = _string_constants(sources)
+        # What the scanner looks up: every text phrase of a template.
+        lookups = [
+            (content, phrase)
+            for content in templates
+            for line in content.splitlines()
+            for phrase in check_i18n.extract_phrases_from_text(
+                check_i18n.clean_template_text(line)
+            )
+        ]
+
+        exclude = check_i18n.should_exclude_string
+        clean = check_i18n.clean_template_text
+        find_line = check_i18n.find_approx_line
+        cases = (
+            (
+                f'exclusions ({len(strings)} strings)',
+                lambda: [exclude_reference(s) for s in strings],
+                lambda: [exclude(s) for s in strings],
+            ),
+            (
+                f'template cleaning ({len(templates)} templates)',
+                lambda: [clean_reference(t) for t in templates],
+                lambda: [clean(t) for t in templates],
+            ),
+            (
+                f'line lookup ({len(lookups)} phrases)',
+                lambda: [line_reference(c, p) for c, p in lookups],
+                lambda: [find_line(c, p) for c, p in lookups],
+            ),
+        )
+        rows = []
+        for label, reference, engine in cases:
+            before = measure(reference, repeat=repeat).median
+            after = measure(engine, repeat=repeat).median
+            rows.append((label, before, after, f'{before / after:.2f}x'))
+        print_table(('step', 'reference ms', 'engine ms', 'speed-up'), rows)
+
+        if full_scan:
+            check_i18n.VERBOSITY = 0
+            timing = measure(
+                lambda: check_i18n.scan_project(
+                    directory, cache_file=None, workers=1
+                ),
+                repeat=1,
+            )
+            print(f'\nFull scan of {len(paths)} files: {timing.best:.0f} ms')
+
+
+SCRIPT = 'scripts/check_i18n.py'
+STARTUP_CASES = (
+    (
+        'import + Django setup (eager)',
+        ['-c', 'import scripts.check_i18n as c; c.setup_django()'],
+        None,
+    ),
+    ('import (lazy)', ['-c', 'import scripts.check_i18n'], None),
+    (
+        'run, Python files only',
+        [SCRIPT, '-q', '--no-cache', '--files-from', '-'],
+        'python',
+    ),
+    ('run, whole project', [SCRIPT, '-q', '--no-cache'], None),
+    (
+        'run, whole project --no-django',
+        [SCRIPT, '-q', '--no-cache', '--no-django'],
+        None,
+    ),
+)
+
+
+def run_startup(repeat: int) -> None:
+    python_files = '\n'.join(
+        str(path.relative_to(PROJECT_ROOT))
+        for path in sorted(PROJECT_ROOT.glob('*/*.py'))
+        if 'migrations' not in path.parts
+    )
+    rows = []
+    for label, args, stdin in STARTUP_CASES:
+        command = [sys.executable, *args]
+        text = python_files if stdin else ''
+
+        def start(command: list[str] = command, text: str = text) -> None:
+            subprocess.run(  # noqa: S603
+                command,
+                input=text,
+                text=True,
+                cwd=PROJECT_ROOT,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=True,
+            )
+
+        timing = measure(start, repeat=repeat)
+        rows.append((label, timing.median, timing.best))
+    print()
+    print_table(('startup', 'p50 ms', 'best ms'), rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--module-lines',
+        type=int,
+        nargs='+',
+        default=[1000, 10000, 50000],
+        help='Sizes of the modules the Python scanner is timed on.',
+    )
+    parser.add_argument(
+        '--no-full-scan',
+        action='store_false',
+        dest='full_scan',
+        help='Only time the matching steps.',
+    )
+    args = parser.parse_args()
+    run(args.files, args.repeat, args.full_scan)
+    run_visitor(tuple(args.module_lines), args.repeat)
+    run_startup(args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+# benchmarks/bench_http.py
+"""
+Latency and queries per request of the main pages, against a baseline.
+
+Each scenario is driven with Django's test client from ``--concurrency``
+threads at a time, ``--requests`` requests per level, on a throwaway
+test database (PostgreSQL as configured, or SQLite with ``--sqlite``):
+
+* ``home``: ``GET /``, anonymous;
+* ``login``: ``GET /accounts/login/``, anonymous;
+* ``setlang``: ``POST /i18n/setlang/``, anonymous;
+* ``admin-users``: the user changelist, as a superuser, with
+  ``--users`` accounts in the database;
+* ``admin-search``: the same changelist, searching for a last name.
+
+The results are compared with ``--baseline``. A scenario fails when it
+makes more queries per request than the baseline, or when its p95
+latency exceeds the baseline by more than ``--tolerance``; the run
+then exits with status 1. Latencies depend on the machine, so record
+the baseline (``--save-baseline``) where it is checked.
+"""
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from benchmarks.harness import (
+    PROJECT_ROOT,
+    Timing,
+    benchmark_database,
+    print_table,
+    setup_django,
+    use_sqlite,
+    webpack_manifest,
+)
+
+setup_django()
+
+# NOW safe to import Django models
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.http import HttpResponse  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+BASELINE = PROJECT_ROOT / 'benchmarks' / 'baselines' / 'bench_http.json'
+CONCURRENCY = (1, 8)
+ADMIN_EMAIL = 'bench-admin@example.com'
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One kind of request, sent by every client thread."""
+
+    name: str
+    method: str
+    url: str
+    data: dict[str, str] | None = None
+    superuser: bool = False
+
+    def send(self, client: Client) -> HttpResponse:
+        if self.method == 'post':
+            return client.post(reverse(self.url), self.data)
+        return client.get(reverse(self.url), self.data)
+
+
+SCENARIOS = (
+    Scenario('home', 'get', 'home'),
+    Scenario('login', 'get', 'account_login'),
+    Scenario(
+        'setlang',
+        'post',
+        'set_language',
+        {'language': 'de', 'next': '/'},
+    ),
+    Scenario(
+        'admin-users',
+        'get',
+        'admin:accounts_customuser_changelist',
+        superuser=True,
+    ),
+    Scenario(
+        'admin-search',
+        'get',
+        'admin:accounts_customuser_changelist',
+        {'q': 'last42'},
+        superuser=True,
+    ),
+)
+
+
+def _client(scenario: Scenario) -> Client:
+    client = Client()
+    if scenario.superuser:
+        client.force_login(
+            get_user_model().objects.get(email=ADMIN_EMAIL)
+        )
+    return client
+
+
+def _worker(scenario: Scenario, requests: int) -> tuple[list[float], int]:
+    """Send ``requests`` requests; return latencies (ms) and queries."""
+    queries = 0
+
+    def count(
+        execute: Callable,
+        sql: str,
+        params: Any,  # noqa: ANN401
+        many: bool,
+        context: dict,
+    ) -> object:
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    latencies = []
+    try:
+        client = _client(scenario)
+        with connection.execute_wrapper(count):
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = scenario.send(client)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:  # noqa: PLR2004
+                    raise AssertionError(
+                        f'{scenario.name}: HTTP {response.status_code}'
+                    )
+    finally:
+        # Threads end here; give their connections back.
+        connection.close()
+    return latencies, queries
+
+
+def run_scenario(
+    scenario: Scenario,
+    concurrency: int,
+    requests: int,
+) -> dict[str, float]:
+    per_thread = max(1, requests // concurrency)
+    with ThreadPoolExecutor(concurrency) as pool:
+        started = time.perf_counter()
+        results = list(pool.map(
+            lambda _: _worker(scenario, per_thread), range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+    timing = Timing([ms for latencies, _ in results for ms in latencies])
+    total = len(timing.samples)
+    return {
+        'rps': round(total / elapsed, 1),
+        'p50': round(timing.percentile(50), 3),
+        'p95': round(timing.percentile(95), 3),
+        'p99': round(timing.percentile(99), 3),
+        'queries': round(sum(q for _, q in results) / total, 2),
+    }
+
+
+def seed(users: int) -> None:
+    user_model = get_user_model()
+    user_model.objects.create_superuser(email=ADMIN_EMAIL)
+    password = make_password(None)
+    user_model.objects.bulk_create(
+        user_model(
+            email=f'user{n}@example.com',
+            first_name=f'First{n}',
+            last_name=f'Last{n}',
+            password=password,
+        )
+        for n in range(users)
+    )
+
+
+def compare(
+    results: dict[str, dict[str, dict[str, float]]],
+    baseline: dict[str, dict[str, dict[str, float]]],
+    tolerance: float,
+) -> list[str]:
+    """Return a message for every regression against ``baseline``."""
+    failures = []
+    for name, levels in results.items():
+        for level, result in levels.items():
+            expected = baseline.get(name, {}).get(level)
+            if expected is None:
+                continue
+            label = f'{name} at concurrency {level}'
+            if result['queries'] > expected['queries']:
+                failures.append(
+                    f'{label}: {result["queries"]} queries per request, '
+                    f'baseline {expected["queries"]}'
+                )
+            limit = expected['p95'] * (1 + tolerance)
+            if result['p95'] > limit:
+                failures.append(
+                    f'{label}: p95 {result["p95"]:.1f} ms, baseline '
+                    f'{expected["p95"]:.1f} ms (limit {limit:.1f} ms)'
+                )
+    return failures
+
+
+def run(
+    concurrency: tuple[int, ...],
+    requests: int,
+    baseline: dict[str, Any],
+    tolerance: float,
+) -> tuple[dict[str, Any], list[str]]:
+    results: dict[str, Any] = {}
+    rows = []
+    for scenario in SCENARIOS:
+        # Warm caches and compiled templates outside the measurement.
+        _worker(scenario, 3)
+        results[scenario.name] = {}
+        for level in concurrency:
+            result = run_scenario(scenario, level, requests)
+            results[scenario.name][str(level)] = result
+            expected = baseline.get(scenario.name, {}).get(str(level), {})
+            rows.append((
+                scenario.name,
+                level,
+                result['rps'],
+                result['p50'],
+                result['p95'],
+                result['p99'],
+                result['queries'],
+                expected.get('p95', '-'),
+                expected.get('queries', '-'),
+            ))
+    print_table(
+        (
+            'scenario',
+            'threads',
+            'req/s',
+            'p50 ms',
+            'p95 ms',
+            'p99 ms',
+            'queries',
+            'baseline p95',
+            'baseline queries',
+        ),
+        rows,
+    )
+    return results, compare(results, baseline, tolerance)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        nargs='+',
+        default=list(CONCURRENCY),
+    )
+    parser.add_argument(
+        '--requests',
+        type=int,
+        default=200,
+        help='Requests per scenario and concurrency level.',
+    )
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.5,
+        help='Allowed p95 increase over the baseline (default: 0.5).',
+    )
+    parser.add_argument(
+        '--save-baseline',
+        action='store_true',
+        help='Write the results to --baseline instead of comparing.',
+    )
+    parser.add_argument(
+        '--sqlite',
+        action='store_true',
+        help='Use SQLite instead of the configured PostgreSQL server.',
+    )
+    args = parser.parse_args()
+
+    if args.sqlite:
+        use_sqlite()
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())
+    with benchmark_database(), webpack_manifest():
+        seed(args.users)
+        results, failures = run(
+            tuple(args.concurrency),
+            args.requests,
+            baseline,
+            args.tolerance,
+        )
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + '\n')
+        print(f'\nBaseline written to {args.baseline}')
+        return
+    if failures:
+        print('\nRegressions:', *failures, sep='\n  ')
+        sys.exit(1)
+    print('\nNo regressions.' if baseline else '\nNo baseline to compare.')
+
+
+if __name__ == '__main__':
+    main()
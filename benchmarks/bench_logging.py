@@ -0,0 +1,136 @@
+# benchmarks/bench_logging.py
+"""
+Request latency with synchronous vs. queue-based logging.
+
+Every request is an authenticated GET of the correlation-ID lookup,
+with SQL statement logging enabled as in DEBUG. Log output goes to a
+sink that sleeps for ``--sink-latency`` ms per write, standing in for
+a slow terminal or log collector. With the queue handler, request
+threads only enqueue records and the sink latency moves to the
+listener thread.
+"""
+import argparse
+import copy
+import time
+
+from benchmarks.harness import (
+    benchmark_database,
+    measure,
+    print_table,
+    setup_django,
+)
+
+setup_django()
+
+# NOW safe to import Django models
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from core.log import configure_logging  # noqa: E402
+
+SINK_LATENCIES = (0.0, 0.05, 0.2)
+
+
+class SlowSink:
+    """Write-only stream that blocks for ``latency`` ms per write."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency / 1000
+
+    def write(self, text: str) -> int:
+        if self.latency:
+            time.sleep(self.latency)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _logging_config(queued: bool, sink: SlowSink) -> dict:
+    config = copy.deepcopy(
+        {k: v for k, v in settings.LOGGING.items() if k != 'handlers'}
+    )
+    handler = 'queue' if queued else 'console'
+    config['handlers'] = {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'filters': ['correlation_id'],
+            'formatter': 'standard',
+            'stream': sink,
+        },
+    }
+    if queued:
+        config['handlers']['queue'] = {
+            'class': 'core.log.CidQueueHandler',
+            'handlers': ['console'],
+        }
+    config['root']['handlers'] = [handler]
+    for logger in config['loggers'].values():
+        logger['handlers'] = [handler]
+    config['loggers']['django.db.backends']['level'] = 'DEBUG'
+    return config
+
+
+def run(latencies: tuple[float, ...], requests: int) -> None:
+    admin = get_user_model().objects.create_superuser(
+        email='bench@example.com'
+    )
+    client = Client()
+    client.force_login(admin)
+    url = reverse('audittrail:cid-lookup', args=['bench-cid'])
+    # Log every SQL statement, as DEBUG=True would.
+    connection.force_debug_cursor = True
+
+    rows = []
+    for latency in latencies:
+        timings = {}
+        for queued in (False, True):
+            configure_logging(_logging_config(queued, SlowSink(latency)))
+            client.get(url)  # warm-up
+            timings[queued] = measure(lambda: client.get(url), repeat=requests)
+        sync, queue = timings[False], timings[True]
+        rows.append((
+            latency,
+            sync.median,
+            sync.percentile(95),
+            queue.median,
+            queue.percentile(95),
+            f'{sync.median / queue.median:.2f}x',
+        ))
+
+    connection.force_debug_cursor = False
+    configure_logging(settings.LOGGING)
+    print_table(
+        (
+            'sink ms/write',
+            'sync p50',
+            'sync p95',
+            'queue p50',
+            'queue p95',
+            'speed-up',
+        ),
+        rows,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--sink-latency',
+        type=float,
+        nargs='+',
+        default=list(SINK_LATENCIES),
+        help='Simulated milliseconds per log write.',
+    )
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        run(tuple(args.sink_latency), args.requests)
+
+
+if __name__ == '__main__':
+    main()
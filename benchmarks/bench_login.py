@@ -0,0 +1,151 @@
+# benchmarks/bench_login.py
+"""
+Password verification and login throughput per hasher.
+
+Verification is timed without a database for Django's PBKDF2 default,
+Argon2 with Django's parameters and Argon2 with ``PASSWORD_ARGON2``:
+serially (logins per second on one core) and from ``--threads``
+threads through the pool of ``accounts.hashers`` (logins per second in
+total and per core used).
+
+``--logins`` full logins (``POST /accounts/login/``) are then timed on
+a throwaway test database with each ``PASSWORD_HASHER_PROFILES``
+entry, and a PBKDF2 hash is checked to be replaced by the preferred
+hasher on login.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import wait
+
+from benchmarks.harness import (
+    benchmark_database,
+    print_table,
+    setup_django,
+    webpack_manifest,
+)
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model, hashers  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from accounts import hashers as accounts_hashers  # noqa: E402
+
+PASSWORD = 'correct horse battery staple'  # noqa: S105
+EMAIL = 'bench-login@example.com'
+
+HASHERS = (
+    ('PBKDF2 (Django default)', hashers.PBKDF2PasswordHasher),
+    ('Argon2, Django parameters', hashers.Argon2PasswordHasher),
+    ('Argon2, PASSWORD_ARGON2', accounts_hashers.Argon2PasswordHasher),
+)
+
+
+def _rate(count: int, elapsed: float) -> float:
+    return round(count / elapsed, 1)
+
+
+def run_verify(count: int, threads: int) -> None:
+    cores = min(threads, os.cpu_count() or 1)
+    rows = []
+    for label, hasher_class in HASHERS:
+        hasher = hasher_class()
+        encoded = hasher.encode(PASSWORD, hasher.salt())
+        hasher.verify(PASSWORD, encoded)  # warm-up
+
+        started = time.perf_counter()
+        for _ in range(count):
+            hasher.verify(PASSWORD, encoded)
+        serial = _rate(count, time.perf_counter() - started)
+
+        with override_settings(PASSWORD_VERIFY_WORKERS=threads):
+            pool = accounts_hashers.verification_pool()
+            started = time.perf_counter()
+            wait([
+                pool.submit(hasher.verify, PASSWORD, encoded)
+                for _ in range(count * cores)
+            ])
+            pooled = _rate(count * cores, time.perf_counter() - started)
+        rows.append((label, serial, pooled, round(pooled / cores, 1)))
+    print_table(
+        (
+            'hasher',
+            'logins/s, 1 thread',
+            f'logins/s, {threads} threads',
+            'per core',
+        ),
+        rows,
+    )
+
+
+def run_login(count: int) -> None:
+    user_model = get_user_model()
+    url = reverse('account_login')
+    rows = []
+    for profile, hasher_paths in settings.PASSWORD_HASHER_PROFILES.items():
+        with override_settings(PASSWORD_HASHERS=hasher_paths):
+            user = user_model.objects.create_user(
+                email=f'{profile}-{EMAIL}', password=PASSWORD
+            )
+            data = {'login': user.email, 'password': PASSWORD}
+            Client().post(url, data)  # warm-up
+            started = time.perf_counter()
+            for _ in range(count):
+                response = Client().post(url, data)
+                if response.status_code != 302:  # noqa: PLR2004
+                    raise AssertionError(f'{profile}: login failed')
+            elapsed = time.perf_counter() - started
+        rows.append((
+            profile,
+            hashers.identify_hasher(user.password).algorithm,
+            _rate(count, elapsed),
+            round(elapsed / count * 1000, 1),
+        ))
+    print()
+    print_table(('profile', 'hash', 'logins/s', 'ms per login'), rows)
+
+    # A hash of the old default is replaced on the next login.
+    with override_settings(
+        PASSWORD_HASHERS=settings.PASSWORD_HASHER_PROFILES['pbkdf2']
+    ):
+        user = user_model.objects.create_user(
+            email=f'rehash-{EMAIL}', password=PASSWORD
+        )
+    with override_settings(
+        PASSWORD_HASHERS=settings.PASSWORD_HASHER_PROFILES['argon2']
+    ):
+        Client().post(url, {'login': user.email, 'password': PASSWORD})
+    user.refresh_from_db()
+    algorithm = hashers.identify_hasher(user.password).algorithm
+    print(f'\nPBKDF2 hash after a login with the argon2 profile: {algorithm}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--verifications',
+        type=int,
+        default=20,
+        help='Verifications per hasher and core.',
+    )
+    parser.add_argument('--threads', type=int, default=os.cpu_count())
+    parser.add_argument('--logins', type=int, default=20)
+    args = parser.parse_args()
+    if not accounts_hashers.argon2_available():
+        parser.error('argon2-cffi is not installed.')
+    run_verify(args.verifications, args.threads)
+    # allauth would throttle the repeated logins.
+    with (
+        benchmark_database(),
+        webpack_manifest(),
+        override_settings(ACCOUNT_RATE_LIMITS=False),
+    ):
+        run_login(args.logins)
+
+
+if __name__ == '__main__':
+    main()
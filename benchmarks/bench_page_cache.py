@@ -0,0 +1,84 @@
+# benchmarks/bench_page_cache.py
+"""
+Requests per second of the anonymous pages with and without the page cache.
+
+Each view in ``PAGE_CACHE_VIEWS`` is requested ``--requests`` times in
+each configured language, by first-time visitors (no cookies), once
+with ``PAGE_CACHE`` off and once with it on, on a throwaway test
+database. Before timing, a cached response is checked to equal a
+rendered one except for the CSRF token.
+"""
+import argparse
+import re
+import time
+
+from benchmarks.harness import (
+    benchmark_database,
+    print_table,
+    setup_django,
+    webpack_manifest,
+)
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+TOKEN = re.compile(rb'name="csrfmiddlewaretoken" value="\w+"')
+
+
+def _get(client: Client, url: str, language: str) -> bytes:
+    client.cookies.clear()
+    response = client.get(url, headers={'accept-language': language})
+    if response.status_code != 200:  # noqa: PLR2004
+        raise AssertionError(f'{url}: {response.status_code}')
+    return TOKEN.sub(b'', response.content)
+
+
+def _rate(url: str, language: str, requests: int, cached: bool) -> float:
+    with override_settings(PAGE_CACHE=cached):
+        client = Client()
+        _get(client, url, language)  # warm-up, fills the cache
+        started = time.perf_counter()
+        for _ in range(requests):
+            _get(client, url, language)
+        return round(requests / (time.perf_counter() - started), 1)
+
+
+def run(requests: int) -> None:
+    rows = []
+    for name in settings.PAGE_CACHE_VIEWS:
+        url = reverse(name)
+        for language, _ in settings.LANGUAGES:
+            caches['pages'].clear()
+            with override_settings(PAGE_CACHE=False):
+                rendered = _get(Client(), url, language)
+            with override_settings(PAGE_CACHE=True):
+                client = Client()
+                _get(client, url, language)
+                if _get(client, url, language) != rendered:
+                    raise AssertionError(f'{url}: cached page differs')
+            before = _rate(url, language, requests, cached=False)
+            after = _rate(url, language, requests, cached=True)
+            rows.append(
+                (name, language, before, after, f'{after / before:.1f}x')
+            )
+    print_table(
+        ('view', 'language', 'req/s uncached', 'req/s cached', 'speed-up'),
+        rows,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+    with benchmark_database(), webpack_manifest():
+        run(args.requests)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_static.py
+"""
+Size and serving cost of the hashed, pre-compressed static files.
+
+``collectstatic`` is run into a temporary ``STATIC_ROOT`` (the admin's
+files, plus ``frontend/build`` when webpack has run) and the bytes of
+the compressible files are summed as collected, as ``.gz`` and as
+``.br``. Then ``StaticFilesMiddleware`` serves the largest hashed file
+``--requests`` times for each ``Accept-Encoding``, through the test
+client, and the bytes sent and the headers are shown.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.harness import measure, print_table, setup_django
+
+setup_django()
+
+from django.contrib.staticfiles.storage import (  # noqa: E402
+    staticfiles_storage,
+)
+from django.core.management import call_command  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from core.staticfiles import COMPRESSIBLE  # noqa: E402
+
+
+def run_collectstatic(root: Path) -> str:
+    timing = measure(
+        lambda: call_command('collectstatic', interactive=False, verbosity=0),
+        repeat=1,
+    )
+    hashed = {
+        name: root / stored
+        for name, stored in staticfiles_storage.hashed_files.items()
+        if stored.endswith(COMPRESSIBLE)
+    }
+    rows = []
+    for label, suffix in (('collected', ''), ('.gz', '.gz'), ('.br', '.br')):
+        paths = [p.with_name(p.name + suffix) for p in hashed.values()]
+        size = sum(p.stat().st_size for p in paths if p.exists())
+        rows.append((label, f'{size / 1024:.0f} KiB'))
+    print(
+        f'collectstatic: {timing.median:.0f} ms, '
+        f'{len(hashed)} compressible files.\n'
+    )
+    print_table(('files', 'size'), rows)
+    return max(hashed, key=lambda name: hashed[name].stat().st_size)
+
+
+def run_requests(name: str, requests: int) -> None:
+    url = staticfiles_storage.url(name)
+    client = Client()
+    rows = []
+    for encoding in ('identity', 'gzip', 'br, gzip'):
+        headers = {'accept-encoding': encoding}
+        response = client.get(url, headers=headers)
+        sent = len(b''.join(response.streaming_content))
+        started = time.perf_counter()
+        for _ in range(requests):
+            b''.join(client.get(url, headers=headers).streaming_content)
+        elapsed = time.perf_counter() - started
+        rows.append((
+            encoding,
+            response.get('Content-Encoding', '-'),
+            f'{sent / 1024:.1f} KiB',
+            round(requests / elapsed),
+        ))
+    print(f'\n{url}\nCache-Control: {response["Cache-Control"]}\n')
+    print_table(('Accept-Encoding', 'sent as', 'bytes', 'req/s'), rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        override_settings(STATIC_ROOT=directory, STATIC_SERVE=True),
+    ):
+        largest = run_collectstatic(Path(directory))
+        run_requests(largest, args.requests)
+
+
+if __name__ == '__main__':
+    main()
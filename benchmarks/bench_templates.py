@@ -0,0 +1,108 @@
+# benchmarks/bench_templates.py
+"""
+Render time of the home page with and without template caching.
+
+``pages.views.HomeView`` is rendered for an anonymous request in each
+configured language, three ways: templates loaded and parsed on every
+render, compiled templates kept by the cached loader, and the cached
+loader plus the ``{% cache %}`` fragments of ``base.html``. Rendering
+needs no database, so none is created.
+"""
+import argparse
+import copy
+
+from benchmarks.harness import (
+    measure,
+    print_table,
+    setup_django,
+    webpack_manifest,
+)
+
+setup_django()
+
+# NOW safe to import Django models
+from django.conf import settings  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.utils import translation  # noqa: E402
+
+from pages.views import HomeView  # noqa: E402
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+LOCMEM = 'django.core.cache.backends.locmem.LocMemCache'
+DUMMY = 'django.core.cache.backends.dummy.DummyCache'
+VARIANTS = (
+    ('uncached', False, False),
+    ('cached loader', True, False),
+    ('cached loader + fragments', True, True),
+)
+
+
+def _settings(cached_loader: bool, fragments: bool) -> dict:
+    templates = copy.deepcopy(settings.TEMPLATES)
+    loaders = (
+        [('django.template.loaders.cached.Loader', LOADERS)]
+        if cached_loader else LOADERS
+    )
+    templates[0]['OPTIONS']['loaders'] = loaders
+    caches = copy.deepcopy(settings.CACHES)
+    caches['template_fragments'] = {
+        'BACKEND': LOCMEM if fragments else DUMMY,
+        'LOCATION': 'bench_template_fragments',
+    }
+    return {'TEMPLATES': templates, 'CACHES': caches}
+
+
+def run(languages: tuple[str, ...], renders: int) -> None:
+    view = HomeView.as_view()
+    factory = RequestFactory()
+
+    def render() -> None:
+        view(factory.get('/')).render()
+
+    rows = []
+    for language in languages:
+        timings = {}
+        with translation.override(language):
+            for label, cached_loader, fragments in VARIANTS:
+                with override_settings(
+                    **_settings(cached_loader, fragments)
+                ):
+                    render()  # warm-up
+                    timings[label] = measure(render, repeat=renders)
+        baseline = timings['uncached'].median
+        rows.extend(
+            (
+                language,
+                label,
+                timing.median,
+                timing.percentile(95),
+                f'{baseline / timing.median:.2f}x',
+            )
+            for label, timing in timings.items()
+        )
+    print_table(
+        ('language', 'configuration', 'p50', 'p95', 'speed-up'),
+        rows,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--languages',
+        nargs='+',
+        default=[code for code, _name in settings.LANGUAGES],
+    )
+    parser.add_argument('--renders', type=int, default=500)
+    args = parser.parse_args()
+
+    with webpack_manifest():
+        run(tuple(args.languages), args.renders)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_webpack.py
+"""
+Cost of the webpack asset tags of base.html per loader.
+
+``{% stylesheet_pack %}`` and ``{% javascript_pack %}`` for the
+``turbo_drive`` entrypoint (with ``runtime`` and vendor chunks) are
+resolved ``--calls`` times by ``webpack_boilerplate``'s loader and by
+``core.webpack.ManifestLoader``, each with ``CACHE`` off (DEBUG) and on,
+and the ``Link`` header of ``PreloadMiddleware`` is shown. Nothing is
+rendered and no database is needed.
+"""
+import argparse
+import json
+import tempfile
+from pathlib import Path
+
+from benchmarks.harness import measure, print_table, setup_django
+
+setup_django()
+
+from django.test.utils import override_settings  # noqa: E402
+from webpack_boilerplate import utils  # noqa: E402
+
+from core.webpack import preload_links  # noqa: E402
+
+ASSETS = {
+    'js': [
+        '/static/js/runtime.js',
+        '/static/js/vendors-node_modules_hotwired_turbo.js',
+        '/static/js/turbo_drive.js',
+    ],
+    'css': ['/static/css/turbo_drive.css'],
+}
+LOADERS = (
+    ('webpack_boilerplate', 'webpack_boilerplate.loader.WebpackLoader'),
+    ('ManifestLoader', 'core.webpack.ManifestLoader'),
+)
+
+
+def _manifest(directory: str) -> Path:
+    path = Path(directory) / 'manifest.json'
+    files = {
+        url.rpartition('/')[2]: url for urls in ASSETS.values() for url in urls
+    }
+    path.write_text(json.dumps({
+        'entrypoints': {'turbo_drive': {'assets': ASSETS}},
+        **files,
+    }))
+    return path
+
+
+def _tags() -> None:
+    utils.get_as_tags('turbo_drive', extension='css')
+    utils.get_as_tags('turbo_drive', extension='js', attrs='defer')
+
+
+def run(manifest: Path, calls: int) -> None:
+    rows = []
+    for cache in (False, True):
+        for label, loader_class in LOADERS:
+            with override_settings(WEBPACK_LOADER={
+                'MANIFEST_FILE': manifest,
+                'LOADER_CLASS': loader_class,
+                'CACHE': cache,
+            }):
+                _tags()  # warm-up
+                timing = measure(lambda: [_tags() for _ in range(calls)])
+            rows.append((
+                'on' if cache else 'off (DEBUG)',
+                label,
+                round(timing.median / calls * 1000, 1),
+            ))
+    print_table(('CACHE', 'loader', 'us per page'), rows)
+    with override_settings(WEBPACK_LOADER={'MANIFEST_FILE': manifest}):
+        print(f'\nLink: {preload_links(["turbo_drive"])}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        run(_manifest(directory), args.calls)
+
+
+if __name__ == '__main__':
+    main()
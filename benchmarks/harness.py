@@ -0,0 +1,157 @@
+# benchmarks/harness.py
+"""Shared helpers for the standalone benchmarks."""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.db import connection, connections
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MANIFEST = PROJECT_ROOT / 'frontend' / 'build' / 'manifest.json'
+
+
+def setup_django() -> None:
+    """Configure Django exactly like manage.py does."""
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    django.setup()
+
+
+def use_sqlite() -> None:
+    """
+    Run on SQLite instead of the configured PostgreSQL server.
+
+    A stand-in for machines without PostgreSQL; call it before the
+    first database access.
+    """
+    settings.DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(PROJECT_ROOT / 'benchmark.sqlite3'),
+        # A file, so that every thread sees the same database.
+        'TEST': {'NAME': str(PROJECT_ROOT / 'bench_benchmark.sqlite3')},
+    }
+    # Fill in the defaults Django adds when it reads the setting, and
+    # drop the PostgreSQL connection object if one was created.
+    connections.configure_settings(settings.DATABASES)
+    with suppress(AttributeError):
+        del connections['default']
+
+
+@contextmanager
+def benchmark_database() -> Iterator[None]:
+    """Run the enclosed block against a freshly migrated test database."""
+    setup_django()
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    # Keep clear of the database pytest-django reuses between runs.
+    test_settings = connection.settings_dict['TEST']
+    if not test_settings['NAME']:
+        test_settings['NAME'] = f'bench_{old_name}'
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def _write_manifest(directory: str) -> Path:
+    path = Path(directory) / 'manifest.json'
+    files = {
+        'turbo_drive.js': '/static/js/turbo_drive.js',
+        'turbo_drive.css': '/static/css/turbo_drive.css',
+    }
+    assets = {
+        'js': [files['turbo_drive.js']],
+        'css': [files['turbo_drive.css']],
+    }
+    manifest = {'entrypoints': {'turbo_drive': {'assets': assets}}, **files}
+    path.write_text(json.dumps(manifest))
+    return path
+
+
+@contextmanager
+def webpack_manifest() -> Iterator[None]:
+    """
+    Make the pages renderable on a checkout without a webpack build.
+
+    Uses the real manifest if there is one, a stand-in otherwise.
+    """
+    if MANIFEST.exists():
+        yield
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        with override_settings(
+            WEBPACK_LOADER={
+                **settings.WEBPACK_LOADER,
+                'MANIFEST_FILE': _write_manifest(directory),
+            }
+        ):
+            yield
+
+
+@dataclass
+class Timing:
+    """Summary statistics of repeated measurements, in milliseconds."""
+
+    samples: list[float]
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def best(self) -> float:
+        return min(self.samples)
+
+    def percentile(self, pct: float) -> float:
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+        return ordered[index]
+
+
+def measure(
+    func: Callable[[], object],
+    repeat: int = 5,
+    setup: Callable[[], object] | None = None,
+) -> Timing:
+    """Call ``func`` ``repeat`` times and return the wall-clock timings."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return Timing(samples)
+
+
+def print_table(
+    headers: Sequence[str],
+    rows: Sequence[Sequence[object]],
+) -> None:
+    """Print ``rows`` as a plain-text table."""
+    cells = [[str(h) for h in headers]] + [
+        [f'{c:.3f}' if isinstance(c, float) else str(c) for c in row]
+        for row in rows
+    ]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for n, row in enumerate(cells):
+        print('  '.join(c.rjust(w) for c, w in zip(row, widths, strict=True)))
+        if n == 0:
+            print('  '.join('-' * w for w in widths))
@@ -0,0 +1,26 @@
+from django.apps import AppConfig
+from django.core import checks
+
+from core.checks import (
+    check_async_middleware,
+    check_database_connections,
+    check_permission_cache,
+    check_session_cache,
+    check_static_compression,
+    check_static_manifest,
+    check_translation_catalogs,
+)
+
+
+class CoreConfig(AppConfig):
+    name = 'core'
+    verbose_name = 'ForenLIMS Core'
+
+    def ready(self) -> None:
+        checks.register(check_database_connections)
+        checks.register(check_async_middleware)
+        checks.register(check_session_cache)
+        checks.register(check_permission_cache)
+        checks.register(check_translation_catalogs)
+        checks.register(check_static_manifest)
+        checks.register(check_static_compression)
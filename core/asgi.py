@@ -2,6 +2,8 @@
 ASGI config for django_forenlims_core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+It also turns on ``DJANGO_ASGI``, which routes requests to the async views
+and makes the system checks report middleware that cannot run async.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -11,6 +13,10 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from core.catalogs import warm_up
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('DJANGO_ASGI', 'True')
 
 application = get_asgi_application()
+warm_up()
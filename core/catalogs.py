@@ -0,0 +1,402 @@
+# core/catalogs.py
+"""
+Precompiled translation catalogs, memory-mapped by every worker.
+
+On first use of a language, Django's ``DjangoTranslation`` finds and
+parses the ``.mo`` file of every ``LOCALE_PATHS`` entry, every
+installed app and Django itself, and merges them into dictionaries
+private to the process. That costs the first request in each language
+and a copy of every catalog in every worker.
+
+``manage.py build_catalogs`` merges those files per language, with
+Django's precedence, into a single ``.mo`` file in
+``TRANSLATION_CATALOG_DIR``. With ``TRANSLATION_CATALOGS`` on,
+``warm_up()`` replaces Django's translation of each language that has
+an up-to-date merged file with a ``MappedTranslation``: it maps the
+file read-only and looks messages up by binary search in its sorted
+table, so workers share the catalogs through the page cache and keep
+only the messages they actually used. A merged file older than one of
+its sources is ignored until it is rebuilt.
+
+``warm_up()`` runs from ``core/wsgi.py`` and ``core/asgi.py``. It
+also loads the translations and format modules of every configured
+language, so the first request in any language is no slower than the
+next one.
+"""
+from __future__ import annotations
+
+import gettext
+import logging
+import mmap
+import struct
+import sys
+import tempfile
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.utils import formats
+from django.utils.translation import to_language, to_locale, trans_real
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0x950412DE
+HEADER = struct.Struct('<7I')
+DOMAIN = 'django'
+DEFAULT_PLURAL = '(n != 1)'
+# Plural formulas agreeing on these counts are taken to be the same.
+PLURAL_SAMPLES = range(200)
+
+
+def languages() -> list[str]:
+    """Codes of the configured languages and of ``LANGUAGE_CODE``."""
+    codes = [code for code, _ in settings.LANGUAGES]
+    if settings.LANGUAGE_CODE not in codes:
+        codes.append(settings.LANGUAGE_CODE)
+    return codes
+
+
+def catalog_path(language: str) -> Path:
+    return Path(settings.TRANSLATION_CATALOG_DIR) / f'{language}.mo'
+
+
+def source_files(language: str) -> list[Path]:
+    """
+    The ``.mo`` files ``DjangoTranslation`` would merge, first one wins.
+
+    ``LOCALE_PATHS`` come first, then the installed apps in order, then
+    Django. Catalogs of the generic language (``en`` for ``en-gb``)
+    follow all of them, as they are fallbacks in Django too.
+    """
+    localedirs = [
+        *settings.LOCALE_PATHS,
+        *(
+            Path(app_config.path) / 'locale'
+            for app_config in apps.get_app_configs()
+        ),
+        Path(sys.modules[settings.__module__].__file__).parent / 'locale',
+    ]
+    found = [
+        gettext.find(DOMAIN, str(d), [to_locale(language)], all=True)
+        for d in localedirs
+    ]
+    primary = [files[0] for files in found if files]
+    generic = [f for files in reversed(found) for f in files[1:]]
+    return [Path(f) for f in primary + generic]
+
+
+def is_stale(language: str) -> bool:
+    """Return True if the merged file is missing or older than a source."""
+    path = catalog_path(language)
+    if not path.exists():
+        return True
+    built = path.stat().st_mtime
+    return any(f.stat().st_mtime > built for f in source_files(language))
+
+
+def _read_mo(path: Path) -> dict[bytes, bytes]:
+    """Messages of a ``.mo`` file, re-encoded as UTF-8."""
+    data = path.read_bytes()
+    order = '<' if struct.unpack_from('<I', data)[0] == MAGIC else '>'
+    count, originals, translations = struct.unpack_from(f'{order}3I', data, 8)
+    entry = struct.Struct(f'{order}2I')
+    messages = {}
+    for i in range(count):
+        length, offset = entry.unpack_from(data, originals + 8 * i)
+        original = data[offset:offset + length]
+        length, offset = entry.unpack_from(data, translations + 8 * i)
+        messages[original] = data[offset:offset + length]
+    charset = _info(messages.get(b'', b'')).get('content-type', '')
+    charset = charset.partition('charset=')[2] or 'utf-8'
+    if charset.lower() not in ('utf-8', 'utf8'):
+        messages = {
+            k.decode(charset).encode(): v.decode(charset).encode()
+            for k, v in messages.items()
+        }
+    return messages
+
+
+def _info(header: bytes) -> dict[str, str]:
+    info = {}
+    for line in header.decode(errors='replace').splitlines():
+        key, _, value = line.partition(':')
+        if value:
+            info[key.strip().lower()] = value.strip()
+    return info
+
+
+def _plural_formula(info: dict[str, str]) -> str | None:
+    plural_forms = info.get('plural-forms')
+    if plural_forms is None:
+        return None
+    return plural_forms.partition('plural=')[2].rstrip(' ;')
+
+
+def merge(language: str) -> tuple[dict[bytes, bytes], list[Path]]:
+    """
+    Merge the catalogs of ``language`` into one.
+
+    Returns the messages and the files whose plural forms were left out
+    because their formula differs from Django's.
+    """
+    sources = source_files(language)
+    catalogs = [(path, _read_mo(path)) for path in sources]
+    formulas = [_plural_formula(_info(c.get(b'', b''))) for _, c in catalogs]
+    # Django takes the plural formula of its own catalog.
+    formula = next(
+        (f for f in reversed(formulas) if f is not None), DEFAULT_PLURAL
+    )
+    plural = gettext.c2py(formula)
+
+    merged: dict[bytes, bytes] = {}
+    seen: set[tuple[bytes, bool]] = set()
+    skipped = []
+    for (path, catalog), own in zip(catalogs, formulas, strict=True):
+        own_plural = gettext.c2py(own or DEFAULT_PLURAL)
+        same_plural = all(own_plural(n) == plural(n) for n in PLURAL_SAMPLES)
+        if not same_plural:
+            skipped.append(path)
+        for original, translation in catalog.items():
+            msgid, is_plural, _ = original.partition(b'\0')
+            if not msgid or (msgid, bool(is_plural)) in seen:
+                continue
+            if is_plural and not same_plural:
+                continue
+            seen.add((msgid, bool(is_plural)))
+            merged[original] = translation
+    merged[b''] = (
+        'Content-Type: text/plain; charset=UTF-8\n'
+        f'Language: {language}\n'
+        f'Plural-Forms: nplurals={max(map(plural, PLURAL_SAMPLES)) + 1}; '
+        f'plural={formula};\n'
+    ).encode()
+    return merged, skipped
+
+
+def write_mo(path: Path, messages: dict[bytes, bytes]) -> None:
+    """Write ``messages`` as a ``.mo`` file, replacing ``path`` atomically."""
+    originals = sorted(messages)
+    count = len(originals)
+    offset = HEADER.size + 16 * count
+    tables = []
+    blobs = []
+    for strings in (originals, [messages[o] for o in originals]):
+        table = []
+        for string in strings:
+            table.append((len(string), offset))
+            blobs.append(string + b'\0')
+            offset += len(string) + 1
+        tables.append(table)
+    header = HEADER.pack(
+        MAGIC, 0, count, HEADER.size, HEADER.size + 8 * count, 0, 0
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Workers keep mapping the old file until they restart.
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+        f.write(header)
+        for table in tables:
+            f.write(b''.join(struct.pack('<2I', *entry) for entry in table))
+        f.write(b''.join(blobs))
+    Path(f.name).chmod(0o644)
+    Path(f.name).replace(path)
+
+
+class MappedCatalog(Mapping):
+    """
+    The ``_catalog`` of a ``MappedTranslation``, read on access.
+
+    Keys are shaped like those of ``DjangoTranslation._catalog``:
+    messages, and ``(msgid, form)`` for plural forms.
+    """
+
+    def __init__(self, translation: MappedTranslation) -> None:
+        self._translation = translation
+
+    def __getitem__(self, key: str | tuple[str, int]) -> str:
+        if isinstance(key, tuple):
+            msgid, form = key
+            found = self._translation._lookup(msgid.encode(), plural=True)
+            forms = [] if found is None else found.decode().split('\0')
+            if 0 <= form < len(forms):
+                return forms[form]
+        else:
+            found = self._translation._lookup(key.encode())
+            if found is not None:
+                return found.decode()
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str | tuple[str, int]]:
+        translation = self._translation
+        for index in range(translation._count):
+            original = translation._string(translation._originals, index)
+            msgid, is_plural, _ = original.decode().partition('\0')
+            if not is_plural:
+                yield msgid
+                continue
+            forms = translation._string(translation._translations, index)
+            for form in range(forms.count(b'\0') + 1):
+                yield msgid, form
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class MappedTranslation(gettext.NullTranslations):
+    """
+    A translation that looks messages up in a memory-mapped ``.mo`` file.
+
+    Stands in for ``DjangoTranslation``; falls back to the translation
+    of ``LANGUAGE_CODE`` like it does. ``_catalog`` is a read-only
+    ``MappedCatalog`` for code that reads the whole catalog, such as
+    callers of ``trans_real.catalog()``.
+    """
+
+    def __init__(self, path: Path, language: str) -> None:
+        super().__init__()
+        self._language = language
+        self._to_language = to_language(language)
+        with path.open('rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        order = '<' if struct.unpack_from('<I', self._map)[0] == MAGIC else '>'
+        self._entry = struct.Struct(f'{order}2I')
+        self._count, self._originals, self._translations = (
+            struct.unpack_from(f'{order}3I', self._map, 8)
+        )
+        # Messages found so far, a worker's working set. Misses are not
+        # kept: arbitrary strings would grow these without bound.
+        self._memo: dict[str, str] = {}
+        self._plural_memo: dict[str, list[str]] = {}
+        self._catalog = MappedCatalog(self)
+        self._info = _info(self._lookup(b'') or b'')
+        self.plural = gettext.c2py(
+            _plural_formula(self._info) or DEFAULT_PLURAL
+        )
+        if not (
+            language == settings.LANGUAGE_CODE or language.startswith('en')
+        ):
+            self.add_fallback(trans_real.translation(settings.LANGUAGE_CODE))
+
+    def __repr__(self) -> str:
+        return f'<MappedTranslation lang:{self._language}>'
+
+    def _string(self, table: int, index: int) -> bytes:
+        length, offset = self._entry.unpack_from(self._map, table + 8 * index)
+        return self._map[offset:offset + length]
+
+    def _search(self, key: bytes) -> int:
+        """Index of the first original not less than ``key``."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._string(self._originals, middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _lookup(self, key: bytes, plural: bool = False) -> bytes | None:
+        if plural:
+            key += b'\0'
+        index = self._search(key)
+        if index == self._count:
+            return None
+        original = self._string(self._originals, index)
+        if original == key or (plural and original.startswith(key)):
+            return self._string(self._translations, index)
+        return None
+
+    def gettext(self, message: str) -> str:
+        translated = self._memo.get(message)
+        if translated is None:
+            found = self._lookup(message.encode())
+            if found is not None:
+                translated = self._memo[message] = found.decode()
+        if translated is not None:
+            return translated
+        if self._fallback:
+            return self._fallback.gettext(message)
+        return message
+
+    def ngettext(self, msgid1: str, msgid2: str, n: int) -> str:
+        forms = self._plural_memo.get(msgid1)
+        if forms is None:
+            found = self._lookup(msgid1.encode(), plural=True)
+            if found is not None:
+                forms = found.decode().split('\0')
+                self._plural_memo[msgid1] = forms
+        index = self.plural(n)
+        if forms is not None and index < len(forms):
+            return forms[index]
+        if self._fallback:
+            return self._fallback.ngettext(msgid1, msgid2, n)
+        return msgid1 if n == 1 else msgid2
+
+    def pgettext(self, context: str, message: str) -> str:
+        translated = self.gettext(
+            f'{context}{trans_real.CONTEXT_SEPARATOR}{message}'
+        )
+        return message if trans_real.CONTEXT_SEPARATOR in translated else (
+            translated
+        )
+
+    def npgettext(
+        self,
+        context: str,
+        msgid1: str,
+        msgid2: str,
+        n: int,
+    ) -> str:
+        translated = self.ngettext(
+            f'{context}{trans_real.CONTEXT_SEPARATOR}{msgid1}',
+            f'{context}{trans_real.CONTEXT_SEPARATOR}{msgid2}',
+            n,
+        )
+        if trans_real.CONTEXT_SEPARATOR in translated:
+            return msgid1 if n == 1 else msgid2
+        return translated
+
+    def language(self) -> str:
+        return self._language
+
+    def to_language(self) -> str:
+        return self._to_language
+
+
+def install() -> list[str]:
+    """
+    Use the merged files of the languages that have an up-to-date one.
+
+    Returns the languages now served from memory-mapped files.
+    """
+    installed = []
+    # LANGUAGE_CODE first: the others fall back to it.
+    for language in sorted(
+        languages(), key=lambda code: code != settings.LANGUAGE_CODE
+    ):
+        if is_stale(language):
+            if catalog_path(language).exists():
+                logger.warning(
+                    'Ignoring %s, which is older than its sources; run '
+                    'manage.py build_catalogs.',
+                    catalog_path(language),
+                )
+            continue
+        trans_real._translations[language] = MappedTranslation(
+            catalog_path(language), language
+        )
+        installed.append(language)
+    return installed
+
+
+def warm_up() -> None:
+    """Load everything the first request in each language needs."""
+    if not settings.USE_I18N:
+        return
+    if getattr(settings, 'TRANSLATION_CATALOGS', False):
+        install()
+    for language in languages():
+        trans_real.translation(language)
+        trans_real.check_for_language(language)
+        # Imports and caches the language's format modules.
+        formats.get_format('DATE_FORMAT', language)
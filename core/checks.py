@@ -0,0 +1,253 @@
+# core/checks.py
+from typing import Any, List
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestFilesMixin,
+    staticfiles_storage,
+)
+from django.core.checks import Error, Warning
+from django.utils.module_loading import import_string
+
+from core import catalogs
+from core.db import pool_available
+from core.staticfiles import (
+    CompressedManifestStaticFilesStorage,
+    brotli_available,
+)
+
+POOL_BACKEND = 'django.db.backends.postgresql'
+
+
+def _check_pool(alias: str, database: dict[str, Any]) -> List[Error]:
+    pool = database.get('OPTIONS', {}).get('pool')
+    errors: List[Error] = []
+    if database.get('ENGINE') != POOL_BACKEND:
+        return [
+            Error(
+                f'DATABASES[{alias!r}] enables pooling on a backend '
+                'other than PostgreSQL.',
+                id='core.E001',
+            )
+        ]
+    if not pool_available():
+        errors.append(
+            Error(
+                f'DATABASES[{alias!r}] enables pooling, but psycopg_pool '
+                'is not installed.',
+                hint='Install "psycopg[pool]" or set POSTGRES_POOL=false.',
+                id='core.E002',
+            )
+        )
+    if database.get('CONN_MAX_AGE'):
+        errors.append(
+            Error(
+                f'DATABASES[{alias!r}] sets CONN_MAX_AGE together with a '
+                'connection pool.',
+                hint='Pooled connections are already persistent; '
+                'set CONN_MAX_AGE to 0.',
+                id='core.E003',
+            )
+        )
+    if not isinstance(pool, dict):
+        return errors
+
+    min_size = pool.get('min_size', 4)
+    max_size = pool.get('max_size', min_size)
+    if min_size < 0 or max_size < 1 or max_size < min_size:
+        errors.append(
+            Error(
+                f'DATABASES[{alias!r}] pool sizes are invalid '
+                f'(min_size={min_size}, max_size={max_size}).',
+                hint='Require 0 <= POSTGRES_POOL_MIN_SIZE <= '
+                'POSTGRES_POOL_MAX_SIZE and a max size of at least 1.',
+                id='core.E004',
+            )
+        )
+    for option in ('timeout', 'max_idle', 'max_lifetime'):
+        value = pool.get(option)
+        if value is not None and value <= 0:
+            errors.append(
+                Error(
+                    f'DATABASES[{alias!r}] pool option {option!r} must be '
+                    f'positive, got {value}.',
+                    id='core.E005',
+                )
+            )
+    return errors
+
+
+def _check_database(
+    alias: str,
+    database: dict[str, Any],
+) -> List[Error | Warning]:
+    if database.get('OPTIONS', {}).get('pool'):
+        return _check_pool(alias, database)
+    if not database.get('CONN_MAX_AGE') and not settings.DEBUG:
+        return [
+            Warning(
+                f'DATABASES[{alias!r}] opens a new connection for '
+                'every request.',
+                hint='Enable POSTGRES_POOL or set POSTGRES_CONN_MAX_AGE.',
+                id='core.W001',
+            )
+        ]
+    return []
+
+
+def check_database_connections(
+    app_configs: Any = None,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> List[Error | Warning]:
+    """Validate connection pooling and persistence settings."""
+    errors: List[Error | Warning] = []
+    for alias, database in settings.DATABASES.items():
+        errors.extend(_check_database(alias, database))
+    return errors
+
+
+def check_async_middleware(
+    app_configs: Any = None,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> List[Warning]:
+    """Under ASGI, report middleware that forces a thread hop."""
+    if not getattr(settings, 'ASGI', False):
+        return []
+    warnings: List[Warning] = []
+    for path in settings.MIDDLEWARE:
+        # Like Django, treat middleware without the flag as sync only.
+        if not getattr(import_string(path), 'async_capable', False):
+            warnings.append(
+                Warning(
+                    f'{path} only supports synchronous requests.',
+                    hint='Under ASGI, every request switches to a worker '
+                    'thread and back to pass it. Use an async capable '
+                    'version or subclass (see core.middleware).',
+                    id='core.W002',
+                )
+            )
+    return warnings
+
+
+LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def check_session_cache(
+    app_configs: Any = None,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> List[Warning]:
+    """Outside DEBUG, cached sessions need a cache shared by workers."""
+    if settings.DEBUG or not settings.SESSION_ENGINE.startswith(
+        ('core.sessions', 'django.contrib.sessions.backends.cache')
+    ):
+        return []
+    backend = settings.CACHES[settings.SESSION_CACHE_ALIAS]['BACKEND']
+    if backend not in LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            f'Sessions are cached in {backend}, which is local to each '
+            'process.',
+            hint='With more than one worker process, a session changed in '
+            'one can be read stale from another. Set '
+            'DJANGO_SESSION_CACHE_BACKEND to a shared cache.',
+            id='core.W003',
+        )
+    ]
+
+
+def check_permission_cache(
+    app_configs: Any = None,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> List[Warning]:
+    """Outside DEBUG, cached permissions need a cache shared by workers."""
+    if settings.DEBUG or 'accounts.backends.CachedPermissionBackend' not in (
+        settings.AUTHENTICATION_BACKENDS
+    ):
+        return []
+    # Imported here: the backend needs the app registry.
+    from accounts.backends import cache_alias  # noqa: PLC0415
+
+    backend = settings.CACHES[cache_alias()]['BACKEND']
+    if backend not in LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            f'Permissions are cached in {backend}, which is local to each '
+            'process.',
+            hint='With more than one worker process, a revoked permission '
+            'is still granted by the others until their entry expires. Set '
+            'DJANGO_PERMISSION_CACHE_BACKEND to a shared cache.',
+            id='core.W007',
+        )
+    ]
+
+
+def check_translation_catalogs(
+    app_configs: Any = None,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> List[Warning]:
+    """Report merged translation catalogs that are missing or stale."""
+    if not settings.USE_I18N or not getattr(
+        settings, 'TRANSLATION_CATALOGS', False
+    ):
+        return []
+    stale = [
+        language for language in catalogs.languages()
+        if catalogs.is_stale(language)
+    ]
+    if not stale:
+        return []
+    return [
+        Warning(
+            'The merged translation catalogs of '
+            f'{", ".join(stale)} are missing or older than their sources.',
+            hint='Run manage.py build_catalogs; until then these '
+            'languages are loaded by every worker on first use.',
+            id='core.W004',
+        )
+    ]
+
+
+def check_static_manifest(
+    app_configs: Any = None,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> List[Warning]:
+    """Outside DEBUG, hashed static files need a collected manifest."""
+    if settings.DEBUG or not isinstance(
+        staticfiles_storage, ManifestFilesMixin
+    ):
+        return []
+    if staticfiles_storage.hashed_files:
+        return []
+    return [
+        Warning(
+            f'{staticfiles_storage.manifest_name} was not found in '
+            'STATIC_ROOT; static URLs are not hashed.',
+            hint='Run manage.py collectstatic. Without hashed names, '
+            'static files cannot be cached for long.',
+            id='core.W005',
+        )
+    ]
+
+
+def check_static_compression(
+    app_configs: Any = None,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> List[Warning]:
+    """collectstatic can only write .br files with brotli installed."""
+    if brotli_available() or not isinstance(
+        staticfiles_storage, CompressedManifestStaticFilesStorage
+    ):
+        return []
+    return [
+        Warning(
+            'brotli is not installed; collectstatic writes .gz static '
+            'files only.',
+            hint='Install the project dependencies, which include brotli.',
+            id='core.W006',
+        )
+    ]
@@ -0,0 +1,25 @@
+# core/context_processors.py
+"""Template context shared by every page."""
+from django.conf import settings
+from django.http import HttpRequest
+
+from core import page_cache
+
+
+def fragment_cache(request: HttpRequest) -> dict[str, int]:
+    """Expose the ``{% cache %}`` timeout used by the base templates."""
+    return {
+        'FRAGMENT_CACHE_TIMEOUT': settings.TEMPLATE_FRAGMENT_CACHE_TIMEOUT,
+    }
+
+
+def page_cache_csrf(request: HttpRequest) -> dict[str, str]:
+    """
+    Render a placeholder for the CSRF token into pages being cached.
+
+    ``core.page_cache.PageCacheMiddleware`` puts each visitor's own
+    token in its place.
+    """
+    if getattr(request, page_cache.FILL_ATTRIBUTE, False):
+        return {'csrf_token': page_cache.CSRF_PLACEHOLDER}
+    return {}
@@ -0,0 +1,27 @@
+# core/db.py
+"""Database connection helpers referenced from settings."""
+import importlib.util
+
+from psycopg import Connection
+
+
+def pool_available() -> bool:
+    """Return True if psycopg's connection pool package is installed."""
+    return importlib.util.find_spec('psycopg_pool') is not None
+
+
+def check_connection(connection: Connection) -> None:
+    """
+    Health check run by the pool before a connection is handed out.
+
+    Same as ``psycopg_pool.ConnectionPool.check_connection``; defined
+    here so settings do not need to import psycopg_pool.
+    """
+    if connection.autocommit:
+        connection.execute('')
+        return
+    connection.autocommit = True
+    try:
+        connection.execute('')
+    finally:
+        connection.autocommit = False
@@ -0,0 +1,313 @@
+# core/instrumentation.py
+"""
+Per-request query, template and cache metrics.
+
+``InstrumentationMiddleware`` collects, for every request, the number
+of SQL queries and their total time, the time spent rendering
+templates and the cache hits and misses. It reports them in a
+``Server-Timing`` header together with the correlation ID, logs a
+sample of requests to ``core.instrumentation`` as structured records,
+and optionally warns about statements that run again and again in one
+request (the N+1 pattern).
+
+With ``INSTRUMENTATION`` off the middleware removes itself from the
+stack at startup and no hooks are installed, so requests pay nothing.
+When it is on, the hooks are installed once, process-wide:
+
+* an execute wrapper on every database connection (added when the
+  connection is opened, so queries run in ``sync_to_async`` threads
+  count too);
+* a wrapper around ``Template.render`` that times the outermost render;
+* wrappers around ``get()`` and ``get_many()`` of the configured cache
+  backends.
+
+They find the metrics of the current request through a context
+variable and do nothing outside a request.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import random
+import re
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from cid.locals import get_cid
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+from django.template.base import Template
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[RequestMetrics | None] = ContextVar(
+    'instrumentation_metrics', default=None
+)
+_MISSING = object()
+_WHITESPACE_RE = re.compile(r'\s+')
+_CID_UNSAFE_RE = re.compile(r'[^A-Za-z0-9._:-]+')
+_installed = False
+
+
+@dataclass
+class RequestMetrics:
+    """What one request did; times are in seconds."""
+
+    queries: int = 0
+    db_time: float = 0.0
+    template_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    # SQL without parameters, only with duplicate detection on.
+    statements: Counter[str] | None = None
+    rendering: bool = field(default=False, repr=False)
+
+    def duplicates(self, threshold: int) -> dict[str, int]:
+        """Statements that ran at least ``threshold`` times."""
+        if self.statements is None:
+            return {}
+        return {
+            sql: count
+            for sql, count in self.statements.most_common()
+            if count >= threshold
+        }
+
+    def server_timing(self, total: float, cid: str | None) -> str:
+        entries = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+            # No commas inside: naive parsers split the header on them.
+            f'cache;desc="{self.cache_hits} hits / '
+            f'{self.cache_misses} misses"',
+            f'total;dur={total * 1000:.1f}',
+        ]
+        # The CID starts with the client's X-Correlation-ID header;
+        # quotes or backslashes in it could forge entries.
+        cid = _CID_UNSAFE_RE.sub(' ', cid or '').strip()
+        if cid:
+            entries.append(f'cid;desc="{cid}"')
+        return ', '.join(entries)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 3),
+            'template_ms': round(self.template_time * 1000, 3),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
+
+def _record_query(
+    execute: Callable,
+    sql: str,
+    params: Any,  # noqa: ANN401
+    many: bool,
+    context: dict[str, Any],
+) -> object:
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - started
+        metrics.queries += 1
+        if metrics.statements is not None:
+            metrics.statements[_WHITESPACE_RE.sub(' ', sql)] += 1
+
+
+def _wrap_connection(connection: Any, **kwargs: object) -> None:  # noqa: ANN401
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _timed_render(render: Callable) -> Callable:
+    @functools.wraps(render)
+    def wrapper(self: Template, context: Any) -> str:  # noqa: ANN401
+        metrics = _current.get()
+        # Includes render inside their parent; time the outermost only.
+        if metrics is None or metrics.rendering:
+            return render(self, context)
+        metrics.rendering = True
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            metrics.template_time += time.perf_counter() - started
+            metrics.rendering = False
+
+    return wrapper
+
+
+def _counted_get(get: Callable) -> Callable:
+    @functools.wraps(get)
+    def wrapper(
+        self: object,
+        key: str,
+        default: object = None,
+        version: int | None = None,
+    ) -> object:
+        metrics = _current.get()
+        if metrics is None:
+            return get(self, key, default, version)
+        value = get(self, key, _MISSING, version)
+        if value is _MISSING:
+            metrics.cache_misses += 1
+            return default
+        metrics.cache_hits += 1
+        return value
+
+    return wrapper
+
+
+def _counted_get_many(get_many: Callable) -> Callable:
+    @functools.wraps(get_many)
+    def wrapper(
+        self: object,
+        keys: Iterable[str],
+        version: int | None = None,
+    ) -> dict[str, Any]:
+        metrics = _current.get()
+        if metrics is None:
+            return get_many(self, keys, version)
+        keys = list(keys)
+        found = get_many(self, keys, version)
+        metrics.cache_hits += len(found)
+        metrics.cache_misses += len(keys) - len(found)
+        return found
+
+    return wrapper
+
+
+def install() -> None:
+    """Install the hooks; idempotent."""
+    global _installed  # noqa: PLW0603
+    if _installed:
+        return
+    _installed = True
+    connection_created.connect(_wrap_connection)
+    for connection in connections.all(initialized_only=True):
+        _wrap_connection(connection)
+    Template.render = _timed_render(Template.render)
+    for backend in {type(caches[alias]) for alias in settings.CACHES}:
+        # get_many() of BaseCache calls get(); count those calls once.
+        if 'get_many' in vars(backend):
+            backend.get_many = _counted_get_many(backend.get_many)
+        if not getattr(backend.get, 'counted', False):
+            backend.get = _counted_get(backend.get)
+            backend.get.counted = True
+
+
+class InstrumentationMiddleware:
+    """Measure every request; see the module docstring."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if not getattr(settings, 'INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        install()
+        self.get_response = get_response
+        self.sample_rate = settings.INSTRUMENTATION_SAMPLE_RATE
+        self.duplicate_threshold = (
+            settings.INSTRUMENTATION_DUPLICATE_QUERY_THRESHOLD
+        )
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _start(self) -> RequestMetrics:
+        metrics = RequestMetrics()
+        if self.duplicate_threshold:
+            metrics.statements = Counter()
+        return metrics
+
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponse | Awaitable[HttpResponse]:
+        if self.is_async:
+            return self.__acall__(request)
+        metrics = self._start()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, started)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        metrics = self._start()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, started)
+
+    def _finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        metrics: RequestMetrics,
+        started: float,
+    ) -> HttpResponse:
+        total = time.perf_counter() - started
+        response['Server-Timing'] = metrics.server_timing(total, get_cid())
+        if self.sample_rate and random.random() < self.sample_rate:  # noqa: S311
+            self._log(request, response, metrics, total)
+        duplicates = metrics.duplicates(self.duplicate_threshold)
+        if duplicates:
+            logger.warning(
+                '%s %s ran %d statements repeatedly (possible N+1)',
+                request.method,
+                request.path,
+                len(duplicates),
+                extra={
+                    'path': request.path,
+                    'duplicate_queries': duplicates,
+                },
+            )
+        return response
+
+    def _log(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        metrics: RequestMetrics,
+        total: float,
+    ) -> None:
+        logger.info(
+            '%s %s %s: %d queries in %.1f ms, templates %.1f ms, '
+            'cache %d/%d hits, total %.1f ms',
+            request.method,
+            request.path,
+            response.status_code,
+            metrics.queries,
+            metrics.db_time * 1000,
+            metrics.template_time * 1000,
+            metrics.cache_hits,
+            metrics.cache_hits + metrics.cache_misses,
+            total * 1000,
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'total_ms': round(total * 1000, 3),
+                **metrics.as_dict(),
+            },
+        )
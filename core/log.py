@@ -0,0 +1,136 @@
+# core/log.py
+"""
+Non-blocking logging for ForenLIMS.
+
+Request threads only put records on a queue (``CidQueueHandler``); a
+``QueueListener`` thread does the slow part of formatting and writing
+them out. The correlation ID lives in a context variable of the
+request, so it is copied onto the record *before* the hand-off.
+
+Django picks this up through ``LOGGING_CONFIG``, which is needed
+because ``dictConfig()`` creates queue listeners but does not start
+them. A forked child (gunicorn ``--preload``, uwsgi without
+``lazy-apps``) inherits the handlers but not the listener threads, so
+each child gets fresh queues and starts listeners of its own.
+"""
+import atexit
+import copy
+import datetime
+import json
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+from typing import Any
+
+from cid.locals import get_cid
+
+# Attributes every LogRecord has; anything else came in via ``extra``.
+_RECORD_ATTRS = frozenset(
+    logging.LogRecord('', 0, '', 0, '', (), None).__dict__
+) | {'message', 'asctime', 'cid'}
+
+_listeners: list[logging.handlers.QueueListener] = []
+
+
+class CidContextFilter(logging.Filter):
+    """
+    Attach the current correlation ID to records that do not have one.
+
+    Unlike ``cid.log.CidContextFilter`` this keeps a CID captured
+    earlier, so it is safe on handlers fed by a queue listener, where
+    the request's context is no longer available.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, 'cid', None) is None:
+            record.cid = get_cid()
+        return True
+
+
+class CidQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that captures the CID in the logging thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same as QueueHandler.prepare(), except that the traceback is
+        # kept in exc_text so downstream formatters can still render it
+        # separately from the message.
+        record = copy.copy(record)
+        if getattr(record, 'cid', None) is None:
+            record.cid = get_cid()
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: dict[str, Any] = {
+            'timestamp': datetime.datetime.fromtimestamp(
+                record.created, tz=datetime.UTC
+            ).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'cid': getattr(record, 'cid', None),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        if record.stack_info:
+            data['stack'] = self.formatStack(record.stack_info)
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                data[key] = value
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+def start_queue_listeners() -> None:
+    """Start the listener of every configured queue handler."""
+    for name in logging.getHandlerNames():
+        handler = logging.getHandlerByName(name)
+        listener = getattr(handler, 'listener', None)
+        if listener is not None and listener not in _listeners:
+            listener.start()
+            _listeners.append(listener)
+
+
+def stop_queue_listeners() -> None:
+    """Flush pending records and stop all listener threads."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def _restart_queue_listeners() -> None:
+    # Records the parent queued are the parent's to write, and the
+    # parent's listener may have held the queue's lock at fork time.
+    listeners = set(_listeners)
+    _listeners.clear()
+    for name in logging.getHandlerNames():
+        handler = logging.getHandlerByName(name)
+        listener = getattr(handler, 'listener', None)
+        if listener in listeners:
+            handler.queue = listener.queue = queue.Queue()
+    start_queue_listeners()
+
+
+def configure_logging(config: dict[str, Any]) -> None:
+    """``LOGGING_CONFIG`` callable: ``dictConfig()`` plus listener startup."""
+    stop_queue_listeners()
+    logging.config.dictConfig(config)
+    start_queue_listeners()
+
+
+atexit.register(stop_queue_listeners)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_queue_listeners)
@@ -0,0 +1,57 @@
+# core/management/commands/build_catalogs.py
+"""
+Merge the translation catalogs of each language into one file.
+
+Run it whenever the ``.mo`` files change, i.e. after
+``compilemessages`` and after upgrading Django or an app, and before
+starting the workers:
+
+    python manage.py compilemessages
+    python manage.py build_catalogs
+
+The files are written to ``TRANSLATION_CATALOG_DIR`` and used by
+workers started afterwards (see core/catalogs.py).
+"""
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import catalogs
+
+
+class Command(BaseCommand):
+    help = 'Merge the translation catalogs of each language into one file.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--language',
+            action='append',
+            dest='languages',
+            help='Language to build (default: LANGUAGES and '
+            'LANGUAGE_CODE). Can be repeated.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        configured = catalogs.languages()
+        languages = options['languages'] or configured
+        unknown = sorted(set(languages) - set(configured))
+        if unknown:
+            raise CommandError(
+                f'Unknown language(s): {", ".join(unknown)}.'
+            )
+        for language in languages:
+            messages, skipped = catalogs.merge(language)
+            path = catalogs.catalog_path(language)
+            catalogs.write_mo(path, messages)
+            for source in skipped:
+                self.stderr.write(
+                    f'{language}: left out the plural forms of {source}, '
+                    'whose plural formula differs from Django\'s.'
+                )
+            if options['verbosity']:
+                self.stdout.write(
+                    f'{language}: {len(messages) - 1} messages from '
+                    f'{len(catalogs.source_files(language))} catalogs '
+                    f'written to {path}.'
+                )
@@ -0,0 +1,28 @@
+# core/management/commands/invalidate_page_cache.py
+"""
+Drop every page of the full-page cache.
+
+Run it after deploying changed templates or translation catalogs,
+e.g. right after ``compilemessages``:
+
+    python manage.py invalidate_page_cache
+
+Pages are orphaned rather than deleted and expire from the cache on
+their own. With a per-process cache (the local memory default) this
+only reaches the process the command runs in; restarting the workers
+has the same effect there.
+"""
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from core import page_cache
+
+
+class Command(BaseCommand):
+    help = 'Drop every page of the full-page cache.'
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        page_cache.invalidate()
+        if options['verbosity']:
+            self.stdout.write('Page cache invalidated.')
@@ -0,0 +1,215 @@
+# core/middleware.py
+"""
+Middleware for the ASGI profile, switched in by ``ASGI_MIDDLEWARE``.
+
+Under ASGI, every middleware that is not async capable makes Django
+switch to a worker thread and back. Django's own ``MiddlewareMixin``
+classes are async capable, but call ``process_request`` and
+``process_response`` through ``sync_to_async``, one hop each. With the
+async view at the bottom of the stack, that is about twenty hops per
+request, all queued on the one thread ``thread_sensitive`` code runs
+in.
+
+* ``CidMiddleware`` and ``AuditlogMiddleware`` extend the django-cid
+  and auditlog classes, which only implement ``__call__``, with an
+  async path. Both packages keep their state (the correlation ID, the
+  audit actor) in ``contextvars``. An async request runs in its own
+  task, so the values stay with the request, and ``sync_to_async``
+  copies them into the thread of any sync code further down.
+* The other classes run the hooks of Django's middleware on the event
+  loop, and only switch to a thread when a hook is about to use the
+  database (a session or message store that has to be written).
+"""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from auditlog.cid import set_cid as set_auditlog_cid
+from auditlog.context import set_extra_data
+from auditlog.middleware import AuditlogMiddleware as BaseAuditlogMiddleware
+from cid.middleware import CidMiddleware as BaseCidMiddleware
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.middleware import (
+    AuthenticationMiddleware as BaseAuthenticationMiddleware,
+)
+from django.contrib.messages.middleware import (
+    MessageMiddleware as BaseMessageMiddleware,
+)
+from django.contrib.sessions.middleware import (
+    SessionMiddleware as BaseSessionMiddleware,
+)
+from django.http import HttpRequest, HttpResponse
+from django.middleware.clickjacking import (
+    XFrameOptionsMiddleware as BaseXFrameOptionsMiddleware,
+)
+from django.middleware.common import CommonMiddleware as BaseCommonMiddleware
+from django.middleware.csrf import CsrfViewMiddleware as BaseCsrfMiddleware
+from django.middleware.locale import LocaleMiddleware as BaseLocaleMiddleware
+from django.middleware.security import (
+    SecurityMiddleware as BaseSecurityMiddleware,
+)
+
+GetResponse = Callable[[HttpRequest], Any]
+
+
+class AsyncCapableMixin:
+    """Dispatch to ``__acall__`` when the next handler is async."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: GetResponse) -> None:
+        super().__init__(get_response)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponse | Awaitable[HttpResponse]:
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+
+class CidMiddleware(AsyncCapableMixin, BaseCidMiddleware):
+    """``cid.middleware.CidMiddleware`` without the thread hop."""
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        request = self._process_request(request)
+        response = await self.get_response(request)
+        return self._process_response(response)
+
+
+class AuditlogMiddleware(AsyncCapableMixin, BaseAuditlogMiddleware):
+    """``auditlog.middleware.AuditlogMiddleware`` without the thread hop."""
+
+    async def aget_extra_data(self, request: HttpRequest) -> dict[str, Any]:
+        # request.user would query the database lazily, which is not
+        # allowed on the event loop.
+        user = await request.auser()
+        actor = (
+            user
+            if isinstance(user, get_user_model()) and user.is_authenticated
+            else None
+        )
+        return {
+            'remote_addr': self._get_remote_addr(request),
+            'remote_port': self._get_remote_port(request),
+            'actor': actor,
+        }
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        set_auditlog_cid(request)
+        context_data = await self.aget_extra_data(request)
+        with set_extra_data(context_data=context_data):
+            return await self.get_response(request)
+
+
+class InlineHooksMixin:
+    """
+    Run the hooks of a ``MiddlewareMixin`` class on the event loop.
+
+    Only for hooks that do no I/O; subclasses return True from
+    ``request_needs_thread`` or ``response_needs_thread`` for the cases
+    that do.
+    """
+
+    def request_needs_thread(self, request: HttpRequest) -> bool:
+        return False
+
+    def response_needs_thread(self, request: HttpRequest) -> bool:
+        return False
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        response = None
+        if hasattr(self, 'process_request'):
+            if self.request_needs_thread(request):
+                response = await sync_to_async(
+                    self.process_request, thread_sensitive=True
+                )(request)
+            else:
+                response = self.process_request(request)
+        response = response or await self.get_response(request)
+        if hasattr(self, 'process_response'):
+            if self.response_needs_thread(request):
+                response = await sync_to_async(
+                    self.process_response, thread_sensitive=True
+                )(request, response)
+            else:
+                response = self.process_response(request, response)
+        return response
+
+
+class SecurityMiddleware(InlineHooksMixin, BaseSecurityMiddleware):
+    pass
+
+
+class LocaleMiddleware(InlineHooksMixin, BaseLocaleMiddleware):
+    pass
+
+
+class CommonMiddleware(InlineHooksMixin, BaseCommonMiddleware):
+    pass
+
+
+class AuthenticationMiddleware(
+    InlineHooksMixin,
+    BaseAuthenticationMiddleware,
+):
+    # Only installs the lazy request.user and request.auser().
+    pass
+
+
+class XFrameOptionsMiddleware(InlineHooksMixin, BaseXFrameOptionsMiddleware):
+    pass
+
+
+class SessionMiddleware(InlineHooksMixin, BaseSessionMiddleware):
+    def response_needs_thread(self, request: HttpRequest) -> bool:
+        # Saving is the only part of process_response that queries.
+        return (
+            request.session.modified or settings.SESSION_SAVE_EVERY_REQUEST
+        )
+
+
+class MessageMiddleware(InlineHooksMixin, BaseMessageMiddleware):
+    def response_needs_thread(self, request: HttpRequest) -> bool:
+        # Untouched storage writes nothing, not even to the session.
+        storage = getattr(request, '_messages', None)
+        return storage is not None and (storage.used or storage.added_new)
+
+
+class CsrfViewMiddleware(InlineHooksMixin, BaseCsrfMiddleware):
+    """
+    CSRF checks on the event loop, as long as the secret is kept in a
+    cookie; ``CSRF_USE_SESSIONS`` loads the session.
+    """
+
+    def request_needs_thread(self, request: HttpRequest) -> bool:
+        return settings.CSRF_USE_SESSIONS
+
+    response_needs_thread = request_needs_thread
+
+    async def process_view(
+        self,
+        request: HttpRequest,
+        callback: Callable,
+        callback_args: tuple,
+        callback_kwargs: dict[str, Any],
+    ) -> HttpResponse | None:
+        process_view = super().process_view
+        if self.request_needs_thread(request):
+            process_view = sync_to_async(process_view, thread_sensitive=True)
+            return await process_view(
+                request, callback, callback_args, callback_kwargs
+            )
+        return process_view(request, callback, callback_args, callback_kwargs)
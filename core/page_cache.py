@@ -0,0 +1,267 @@
+# core/page_cache.py
+"""
+Full-page cache for the pages anonymous visitors see.
+
+The views named in ``PAGE_CACHE_VIEWS`` render the same HTML for every
+anonymous visitor in a language. ``PageCacheMiddleware`` sits right
+below ``SecurityMiddleware`` and answers repeated requests for them
+from the ``pages`` cache, so the rest of the middleware stack, the view
+and the templates are skipped.
+
+A request is served from, and fills, the cache only if it is a
+``GET`` without a query string and carries neither a session nor a
+messages cookie: without a session there is no logged-in user and no
+per-visitor state the page could show. Anything else passes through
+untouched. Responses are stored only if they are a plain 200 that set
+no cookies other than the CSRF cookie and vary on nothing but the
+language and cookies. ``Cache-Control`` is replayed as sent, so
+browsers and proxies still obey it; allauth marks its pages
+``never_cache`` because of the CSRF token, which is filled in per
+visitor here.
+
+Entries are keyed on host, path and the language ``LocaleMiddleware``
+would activate, which it picks from the language cookie and the
+``Accept-Language`` header.
+
+The CSRF token differs per visitor. While a page is rendered for the
+cache, ``core.context_processors.page_cache_csrf`` gives templates a
+placeholder instead of the token; the middleware puts the visitor's
+own token in its place, and sets the CSRF cookie, on every response.
+The placeholder is random per process and stored with the page, so a
+page cached by another worker, or before a restart, is filled in too.
+
+Entries belong to a generation. ``invalidate()`` (or ``manage.py
+invalidate_page_cache``) starts a new one, orphaning every stored page;
+run it after deploying changed templates or translation catalogs. The
+key also contains a fingerprint of the template and catalog files seen
+when the process started, so a restart after a deploy never serves
+pages of the old files.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import secrets
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+from django.middleware.csrf import CsrfViewMiddleware, get_token
+from django.urls import Resolver404, resolve
+from django.utils.translation import get_language_from_request
+
+KEY_PREFIX = 'page'
+GENERATION_KEY = f'{KEY_PREFIX}:generation'
+# Rendered in place of the CSRF token while a page is cached.
+CSRF_PLACEHOLDER = f'csrf{secrets.token_hex(16)}'
+FILL_ATTRIBUTE = 'page_cache_fill'
+DEFAULT_TIMEOUT = 600
+# Request headers the cached pages may vary on; the key covers both.
+VARY_HEADERS = frozenset({'accept-language', 'cookie'})
+# Recomputed per response: the token is longer than the placeholder.
+SKIPPED_HEADERS = frozenset({'set-cookie', 'content-length'})
+# Settings that change what the cached pages would look like.
+PAGE_SETTINGS = frozenset({
+    'TEMPLATES', 'LANGUAGES', 'LANGUAGE_CODE', 'LOCALE_PATHS',
+    'PAGE_CACHE_VIEWS', 'STORAGES',
+})
+
+
+def _cache() -> BaseCache:
+    return caches[getattr(settings, 'PAGE_CACHE_ALIAS', 'pages')]
+
+
+def _generation(cache: BaseCache) -> int:
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+async def _ageneration(cache: BaseCache) -> int:
+    generation = await cache.aget(GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(GENERATION_KEY, 1, timeout=None)
+        generation = await cache.aget(GENERATION_KEY, 1)
+    return generation
+
+
+def invalidate() -> None:
+    """Drop every cached page."""
+    cache = _cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, _generation(cache) + 1, timeout=None)
+
+
+@receiver(setting_changed)
+def _reset(setting: str, **kwargs: object) -> None:
+    if setting in PAGE_SETTINGS:
+        source_fingerprint.cache_clear()
+        invalidate()
+
+
+def _source_files() -> list[Path]:
+    directories = [Path(d) for d in settings.TEMPLATES[0]['DIRS']]
+    directories += [Path(d) for d in settings.LOCALE_PATHS]
+    for app_config in apps.get_app_configs():
+        app = Path(app_config.path)
+        directories += [app / 'templates', app / 'locale']
+    return [
+        path
+        for directory in directories
+        if directory.is_dir()
+        for path in directory.rglob('*')
+        if path.suffix in ('.html', '.txt', '.mo')
+    ]
+
+
+@functools.cache
+def source_fingerprint() -> str:
+    """
+    Hash of the templates and catalogs, and of the static files manifest
+    that gives the asset URLs in the pages.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for path in sorted(_source_files()):
+        stat = path.stat()
+        digest.update(f'{path}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    digest.update(getattr(staticfiles_storage, 'manifest_hash', '').encode())
+    return digest.hexdigest()
+
+
+def cache_key(request: HttpRequest, generation: int) -> str:
+    location = hashlib.md5(
+        f'{request.get_host()}{request.path}'.encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    language = get_language_from_request(request)
+    return (
+        f'{KEY_PREFIX}:{generation}:{source_fingerprint()}:'
+        f'{language}:{location}'
+    )
+
+
+def is_cacheable_request(request: HttpRequest) -> bool:
+    if request.method != 'GET' or request.META.get('QUERY_STRING'):
+        return False
+    cookies = request.COOKIES
+    if settings.SESSION_COOKIE_NAME in cookies or 'messages' in cookies:
+        return False
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return False
+    return match.url_name in settings.PAGE_CACHE_VIEWS
+
+
+def is_cacheable_response(response: HttpResponse) -> bool:
+    if response.status_code != HTTPStatus.OK or response.streaming:
+        return False
+    if set(response.cookies) - {settings.CSRF_COOKIE_NAME}:
+        return False
+    vary = response.get('Vary', '').split(',')
+    headers = {header.strip().lower() for header in vary}
+    return headers - {''} <= VARY_HEADERS
+
+
+class PageCacheMiddleware:
+    """Serve ``PAGE_CACHE_VIEWS`` to anonymous visitors from the cache."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if not getattr(settings, 'PAGE_CACHE', False):
+            raise MiddlewareNotUsed
+        if settings.CSRF_USE_SESSIONS:
+            raise MiddlewareNotUsed(
+                'The page cache needs the CSRF secret in a cookie.'
+            )
+        self.get_response = get_response
+        self.timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+        # Reads the visitor's CSRF cookie and sets it on responses.
+        self.csrf = CsrfViewMiddleware(get_response)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponse | Awaitable[HttpResponse]:
+        if self.is_async:
+            return self.__acall__(request)
+        if not is_cacheable_request(request):
+            return self.get_response(request)
+        cache = _cache()
+        key = cache_key(request, _generation(cache))
+        page = cache.get(key)
+        if page is not None:
+            return self._respond(request, page)
+        setattr(request, FILL_ATTRIBUTE, True)
+        response = self.get_response(request)
+        if not is_cacheable_response(response):
+            return response
+        page = self._page(response)
+        cache.set(key, page, self.timeout)
+        return self._respond(request, page)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if not is_cacheable_request(request):
+            return await self.get_response(request)
+        cache = _cache()
+        key = cache_key(request, await _ageneration(cache))
+        page = await cache.aget(key)
+        if page is not None:
+            return self._respond(request, page)
+        setattr(request, FILL_ATTRIBUTE, True)
+        response = await self.get_response(request)
+        if not is_cacheable_response(response):
+            return response
+        page = self._page(response)
+        await cache.aset(key, page, self.timeout)
+        return self._respond(request, page)
+
+    def _page(self, response: HttpResponse) -> dict[str, Any]:
+        return {
+            'content': response.content,
+            'csrf_placeholder': CSRF_PLACEHOLDER.encode(),
+            'headers': [
+                (name, value)
+                for name, value in response.items()
+                if name.lower() not in SKIPPED_HEADERS
+            ],
+        }
+
+    def _respond(
+        self,
+        request: HttpRequest,
+        page: dict[str, Any],
+    ) -> HttpResponse:
+        response = HttpResponse(page['content'])
+        for name, value in page['headers']:
+            response[name] = value
+        placeholder = page['csrf_placeholder']
+        if placeholder in response.content:
+            if 'CSRF_COOKIE' not in request.META:
+                self.csrf.process_request(request)
+            response.content = response.content.replace(
+                placeholder, get_token(request).encode()
+            )
+            self.csrf.process_response(request, response)
+        response['Content-Length'] = len(response.content)
+        return response
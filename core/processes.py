@@ -0,0 +1,41 @@
+# core/processes.py
+"""Process pools that are safe to fork from a configured Django process."""
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import django
+from django.db import connections
+
+from core.log import start_queue_listeners, stop_queue_listeners
+
+
+def _init_worker() -> None:
+    # django.setup() is a no-op after fork; required when spawned.
+    django.setup()
+    start_queue_listeners()
+
+
+@contextmanager
+def process_pool(workers: int = 0) -> Iterator[ProcessPoolExecutor]:
+    """
+    Yield a ProcessPoolExecutor with ``workers`` processes (0: one per CPU).
+
+    Forked workers must not share the parent's database connections or
+    connection pools, and forking while the log listener thread runs
+    can deadlock. Both are shut down first and come back afterwards.
+    """
+    connections.close_all()
+    for connection in connections.all(initialized_only=True):
+        if getattr(connection, 'pool', None) is not None:
+            connection.close_pool()
+    stop_queue_listeners()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_worker,
+        ) as pool:
+            yield pool
+    finally:
+        start_queue_listeners()
@@ -0,0 +1,80 @@
+# core/sessions.py
+"""
+Cached database sessions that skip writes which change nothing.
+
+The ``cached_db`` engine reads sessions from ``SESSION_CACHE_ALIAS``
+and only falls back to the ``django_session`` table on a miss, but it
+still writes both on every save. ``SessionMiddleware`` saves whenever
+the session was marked modified, and code often marks it modified by
+assigning a value it already had, e.g. on every login. With
+``SESSION_SAVE_EVERY_REQUEST`` it saves on every request.
+
+``SessionStore`` remembers what it loaded and skips a save when the
+data is unchanged. ``SessionMiddleware`` still sends the cookie with a
+new expiry, so an unchanged session is saved anyway to push its
+expiry forward, but at most once every ``SESSION_SAVE_INTERVAL``
+seconds; the expiry stored on the server may trail the cookie by that
+long, and no longer. The time of the last write is kept in the
+session itself.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+
+SAVED_AT_KEY = '_session_saved_at'
+DEFAULT_SAVE_INTERVAL = 300
+
+
+class SessionStore(cached_db.SessionStore):
+    """``cached_db`` session store with coalesced writes."""
+
+    # Serialized data as loaded or last saved; None: unknown.
+    _stored: bytes | None = None
+
+    def _snapshot(self, data: dict[str, Any]) -> bytes:
+        return self.serializer().dumps(
+            {k: v for k, v in data.items() if k != SAVED_AT_KEY}
+        )
+
+    def load(self) -> dict[str, Any]:
+        data = super().load()
+        self._stored = self._snapshot(data)
+        return data
+
+    async def aload(self) -> dict[str, Any]:
+        data = await super().aload()
+        self._stored = self._snapshot(data)
+        return data
+
+    def _needs_write(self, data: dict[str, Any]) -> bool:
+        if self._stored is None or self._snapshot(data) != self._stored:
+            return True
+        interval = getattr(
+            settings, 'SESSION_SAVE_INTERVAL', DEFAULT_SAVE_INTERVAL
+        )
+        return time.time() - data.get(SAVED_AT_KEY, 0) >= interval
+
+    def _skip_write(self, data: dict[str, Any], must_create: bool) -> bool:
+        if self.session_key is None or must_create:
+            return False
+        return not self._needs_write(data)
+
+    def save(self, must_create: bool = False) -> None:
+        data = self._get_session()
+        if self._skip_write(data, must_create):
+            return
+        data[SAVED_AT_KEY] = int(time.time())
+        super().save(must_create)
+        self._stored = self._snapshot(self._get_session())
+
+    async def asave(self, must_create: bool = False) -> None:
+        data = await self._aget_session()
+        if self._skip_write(data, must_create):
+            return
+        data[SAVED_AT_KEY] = int(time.time())
+        await super().asave(must_create)
+        self._stored = self._snapshot(await self._aget_session())
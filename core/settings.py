@@ -16,6 +16,9 @@ from pathlib import Path
 import environ
 from django.utils.translation import gettext_lazy as _
 
+from accounts.hashers import argon2_available
+from core.db import check_connection, pool_available
+
 env = environ.Env(
     DJANGO_DEBUG=(bool, False)
 )
@@ -62,11 +65,16 @@ INSTALLED_APPS = [
     'pages.apps.PagesConfig',
     'accounts.apps.AccountsConfig',
     'audittrail.apps.AudittrailConfig',
+    'core.apps.CoreConfig',
 ]
 
 MIDDLEWARE = [
     'cid.middleware.CidMiddleware',
+    'core.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.staticfiles.StaticFilesMiddleware',
+    'core.page_cache.PageCacheMiddleware',
+    'core.webpack.PreloadMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -78,22 +86,127 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# ASGI profile, turned on by core/asgi.py: async views are routed where
+# they exist, and MIDDLEWARE is swapped for versions that run on the
+# event loop instead of switching threads (see core/middleware.py).
+ASGI = env.bool('DJANGO_ASGI', default=False)
+ASGI_MIDDLEWARE = {
+    path: f'core.middleware.{path.rpartition(".")[2]}'
+    for path in (
+        'cid.middleware.CidMiddleware',
+        'django.middleware.security.SecurityMiddleware',
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.locale.LocaleMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'auditlog.middleware.AuditlogMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    )
+}
+if ASGI:
+    MIDDLEWARE = [ASGI_MIDDLEWARE.get(path, path) for path in MIDDLEWARE]
+
+# Per-request query, template and cache metrics in a Server-Timing
+# header (see core/instrumentation.py). Off, the middleware drops out
+# of the stack. A share of requests is logged; with a threshold set,
+# statements repeated that often in one request are logged as N+1.
+INSTRUMENTATION = env.bool('DJANGO_INSTRUMENTATION', default=DEBUG)
+INSTRUMENTATION_SAMPLE_RATE = env.float(
+    'DJANGO_INSTRUMENTATION_SAMPLE_RATE', default=1.0 if DEBUG else 0.01
+)
+INSTRUMENTATION_DUPLICATE_QUERY_THRESHOLD = env.int(
+    'DJANGO_INSTRUMENTATION_DUPLICATE_QUERY_THRESHOLD', default=0
+)
+
+# Full-page cache for anonymous visitors (see core/page_cache.py): the
+# views named here are served from the 'pages' cache to requests
+# without a session, per host, path and language. Run
+# `manage.py invalidate_page_cache` after deploying changed templates
+# or translations.
+PAGE_CACHE = env.bool('DJANGO_PAGE_CACHE', default=not DEBUG)
+PAGE_CACHE_VIEWS = ['home', 'account_login', 'account_signup']
+PAGE_CACHE_TIMEOUT = env.int('DJANGO_PAGE_CACHE_TIMEOUT', default=600)
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [str(BASE_DIR.joinpath('templates'))],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.fragment_cache',
+                'core.context_processors.page_cache_csrf',
+            ],
+            'loaders': [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
             ],
         },
     },
 ]
+# Outside DEBUG, compiled templates are kept in memory for the lifetime
+# of the process instead of being read and parsed on every render.
+if not DEBUG:
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', TEMPLATES[0]['OPTIONS']['loaders']),
+    ]
+
+# Caches
+# Rendered template fragments ({% cache %} in base.html) get their own
+# cache so they can be turned off in DEBUG, where the webpack manifest
+# changes under a running server.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'template_fragments': {
+        'BACKEND': (
+            'django.core.cache.backends.dummy.DummyCache' if DEBUG
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': 'template_fragments',
+    },
+    # Sessions are read from here first (see SESSION_ENGINE). The local
+    # memory cache is a stand-in: each process has its own, so with
+    # several workers a session changed in one can be read stale from
+    # another. Point it at a shared cache (Redis, Memcached) there.
+    'sessions': {
+        'BACKEND': env(
+            'DJANGO_SESSION_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': env('DJANGO_SESSION_CACHE_LOCATION', default='sessions'),
+    },
+    # Whole pages (see PAGE_CACHE). Per process like the fragments;
+    # invalidate_page_cache only reaches a shared cache.
+    'pages': {
+        'BACKEND': env(
+            'DJANGO_PAGE_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': env('DJANGO_PAGE_CACHE_LOCATION', default='pages'),
+    },
+    # Cached user permissions (see ACCOUNTS_PERMISSION_CACHE). Changes
+    # only invalidate the entries of the process making them, so with
+    # several workers this must be a shared cache: otherwise a revoked
+    # permission is granted elsewhere until the entry expires.
+    'permissions': {
+        'BACKEND': env(
+            'DJANGO_PERMISSION_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': env(
+            'DJANGO_PERMISSION_CACHE_LOCATION', default='permissions'
+        ),
+    },
+}
+TEMPLATE_FRAGMENT_CACHE_TIMEOUT = env.int('DJANGO_TEMPLATE_FRAGMENT_CACHE_TIMEOUT', default=3600)
 
 WSGI_APPLICATION = 'core.wsgi.application'
 
@@ -112,6 +225,32 @@ DATABASES = {
     }
 }
 
+# Connection reuse
+# With POSTGRES_POOL (the default; psycopg[pool] is a dependency) each
+# worker process keeps a psycopg 3 pool of open connections. Without
+# it, connections persist for POSTGRES_CONN_MAX_AGE seconds. Either way
+# requests no longer pay for connection setup. Sizes are per process:
+# keep workers * POSTGRES_POOL_MAX_SIZE below the server's
+# max_connections.
+POSTGRES_POOL = env.bool('POSTGRES_POOL', default=pool_available())
+if POSTGRES_POOL:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': env.int('POSTGRES_POOL_MIN_SIZE', default=2),
+            'max_size': env.int('POSTGRES_POOL_MAX_SIZE', default=10),
+            # Seconds a request waits for a free connection.
+            'timeout': env.float('POSTGRES_POOL_TIMEOUT', default=10.0),
+            'max_idle': env.float('POSTGRES_POOL_MAX_IDLE', default=600.0),
+            'max_lifetime': env.float('POSTGRES_POOL_MAX_LIFETIME', default=3600.0),
+        },
+    }
+    if env.bool('POSTGRES_POOL_CHECK', default=True):
+        DATABASES['default']['OPTIONS']['pool']['check'] = check_connection
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = env.int('POSTGRES_CONN_MAX_AGE', default=60)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = env.bool('POSTGRES_CONN_HEALTH_CHECKS', default=True)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -131,6 +270,43 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing (see accounts/hashers.py). DJANGO_PASSWORD_HASHERS
+# picks the preferred hasher: 'argon2' (Argon2id with PASSWORD_ARGON2,
+# the default when argon2-cffi is installed) or 'pbkdf2' (Django's
+# default). The rest stay listed, so existing hashes keep working and
+# are replaced on the next login.
+PASSWORD_HASHER_PROFILES = {
+    'argon2': [
+        'accounts.hashers.Argon2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ],
+    'pbkdf2': [
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'accounts.hashers.Argon2PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ],
+}
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[
+    env(
+        'DJANGO_PASSWORD_HASHERS',
+        default='argon2' if argon2_available() else 'pbkdf2',
+    )
+]
+PASSWORD_ARGON2 = {
+    # Passes over memory; memory in KiB; lanes (threads) per hash.
+    'time_cost': env.int('ARGON2_TIME_COST', default=2),
+    'memory_cost': env.int('ARGON2_MEMORY_COST', default=19456),
+    'parallelism': env.int('ARGON2_PARALLELISM', default=1),
+}
+# Threads that verify passwords (0: in the request's own thread). Set
+# it to about the number of cores: at most that many logins hash at
+# once, the rest queue, and async logins never block the event loop.
+PASSWORD_VERIFY_WORKERS = env.int('DJANGO_PASSWORD_VERIFY_WORKERS', default=0)
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -153,6 +329,15 @@ LOCALE_PATHS = [
     BASE_DIR / 'locale',
 ]
 
+# Catalogs of LOCALE_PATHS, the apps and Django merged into one file
+# per language by `manage.py build_catalogs`, which the workers
+# memory-map and share (see core/catalogs.py). Files older than their
+# sources are ignored. A relative directory is taken from BASE_DIR.
+TRANSLATION_CATALOGS = env.bool('DJANGO_TRANSLATION_CATALOGS', default=not DEBUG)
+TRANSLATION_CATALOG_DIR = BASE_DIR / env(
+    'DJANGO_TRANSLATION_CATALOG_DIR', default='build/locale'
+)
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
@@ -166,9 +351,12 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Authentication
 AUTH_USER_MODEL = 'accounts.CustomUser'
 AUTHENTICATION_BACKENDS = [
-    'django.contrib.auth.backends.ModelBackend',
+    # ModelBackend with permissions cached between requests.
+    'accounts.backends.CachedPermissionBackend',
     'allauth.account.auth_backends.AuthenticationBackend',
 ]
+ACCOUNTS_PERMISSION_CACHE = 'permissions'
+ACCOUNTS_PERMISSION_CACHE_TIMEOUT = env.int('ACCOUNTS_PERMISSION_CACHE_TIMEOUT', default=300)
 SITE_ID = 1
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
@@ -182,15 +370,48 @@ ACCOUNT_SIGNUP_FIELDS = ['email*', 'password1*', 'password2*']
 ACCOUNT_UNIQUE_EMAIL = True
 ACCOUNT_SESSION_REMEMBER = True
 
+# Sessions: cached_db with writes skipped when nothing changed (see
+# core/sessions.py). An unchanged session, saved because it was marked
+# modified or by SESSION_SAVE_EVERY_REQUEST, is written at most every
+# SESSION_SAVE_INTERVAL seconds, to push its expiry forward.
+# Expired sessions are removed by "manage.py purge_sessions".
+SESSION_ENGINE = 'core.sessions'
+SESSION_CACHE_ALIAS = 'sessions'
+SESSION_SAVE_EVERY_REQUEST = env.bool('DJANGO_SESSION_SAVE_EVERY_REQUEST', default=False)
+SESSION_SAVE_INTERVAL = env.int('DJANGO_SESSION_SAVE_INTERVAL', default=300)
+
 STATICFILES_DIRS = [
     BASE_DIR.joinpath('frontend/build'),
 ]
 
 STATIC_ROOT = BASE_DIR.joinpath('static')
 
+# collectstatic writes content-hashed copies of every file, plus .br
+# and .gz siblings, and a staticfiles.json manifest that {% static %}
+# and the webpack tags read (see core/staticfiles.py). With
+# STATIC_SERVE the app serves STATIC_ROOT itself: hashed files are
+# cached for a year, others for STATIC_MAX_AGE seconds. Turn it off
+# when a web server serves STATIC_ROOT.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'core.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+}
+STATIC_SERVE = env.bool('DJANGO_STATIC_SERVE', default=not DEBUG)
+STATIC_MAX_AGE = env.int('DJANGO_STATIC_MAX_AGE', default=60)
+
+# The parsed manifest is kept in memory: read once outside DEBUG, and
+# again whenever the file changes in DEBUG (see core/webpack.py).
 WEBPACK_LOADER = {
     'MANIFEST_FILE': BASE_DIR.joinpath('frontend/build/manifest.json'),
+    'LOADER_CLASS': 'core.webpack.ManifestLoader',
 }
+# Entrypoints whose chunks HTML responses announce in a Link preload
+# header; the bundles base.html loads.
+WEBPACK_PRELOAD = ['turbo_drive']
 SECURE_SSL_REDIRECT = env.bool('DJANGO_SECURE_SSL_REDIRECT', default=False)
 SESSION_COOKIE_SECURE = env.bool('DJANGO_SESSION_COOKIE_SECURE', default=False)
 CSRF_COOKIE_SECURE = env.bool('DJANGO_CSRF_COOKIE_SECURE', default=False)
@@ -202,15 +423,34 @@ CID_HEADER = 'HTTP_X_CORRELATION_ID'
 CID_RESPONSE_HEADER = 'X-Correlation-ID'
 CID_SQL_COMMENTER_ENABLE = True
 
+# Audit Trail Configuration
+# Log entries are stored in the audittrail model and written in one
+# bulk INSERT per transaction, tagged with the django-cid correlation ID.
+AUDITLOG_LOGENTRY_MODEL = 'audittrail.AuditLogEntry'
+AUDITLOG_CID_GETTER = 'cid.locals.get_cid'
+AUDITTRAIL_BUFFERED_WRITES = env.bool('AUDITTRAIL_BUFFERED_WRITES', default=True)
+AUDITTRAIL_BUFFER_BATCH_SIZE = env.int('AUDITTRAIL_BUFFER_BATCH_SIZE', default=500)
+
 # ============================================
 # Logging Configuration with CID
 # ============================================
+# With DJANGO_LOG_QUEUE (default) request threads only enqueue records;
+# a background listener formats and writes them. DJANGO_LOG_FORMAT=json
+# switches to one JSON object per line.
+LOG_QUEUE = env.bool('DJANGO_LOG_QUEUE', default=True)
+LOG_FORMAT = env('DJANGO_LOG_FORMAT', default='text')
+LOG_HANDLER = 'queue' if LOG_QUEUE else 'console'
+# Every SQL statement on the console; INSTRUMENTATION is the quieter
+# way to see what requests query.
+LOG_SQL = env.bool('DJANGO_LOG_SQL', default=False)
+
+LOGGING_CONFIG = 'core.log.configure_logging'
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'filters': {
         'correlation_id': {
-            '()': 'cid.log.CidContextFilter'
+            '()': 'core.log.CidContextFilter'
         },
     },
     'formatters': {
@@ -218,28 +458,37 @@ LOGGING = {
             'format': '[{levelname}] [{asctime}] [CID: {cid}] {name}: {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'core.log.JsonFormatter',
+        },
     },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
             'filters': ['correlation_id'],
-            'formatter': 'standard',
+            'formatter': 'json' if LOG_FORMAT == 'json' else 'standard',
         },
     },
     'root': {
-        'handlers': ['console'],
+        'handlers': [LOG_HANDLER],
         'level': 'INFO',
     },
     'loggers': {
         'audittrail': {
-            'handlers': ['console'],
+            'handlers': [LOG_HANDLER],
             'level': 'DEBUG' if DEBUG else 'INFO',
             'propagate': False,
         },
         'django.db.backends': {
-            'handlers': ['console'],
-            'level': 'DEBUG' if DEBUG else 'WARNING',
+            'handlers': [LOG_HANDLER],
+            'level': 'DEBUG' if LOG_SQL else 'WARNING',
             'filters': ['correlation_id'],
         },
     },
 }
+if LOG_QUEUE:
+    LOGGING['handlers']['queue'] = {
+        'class': 'core.log.CidQueueHandler',
+        'handlers': ['console'],
+        'respect_handler_level': True,
+    }
@@ -0,0 +1,227 @@
+# core/staticfiles.py
+"""
+Content-hashed, pre-compressed static files with far-future caching.
+
+``CompressedManifestStaticFilesStorage`` is Django's
+``ManifestStaticFilesStorage``: ``collectstatic`` copies every file
+under a name containing a hash of its content and records the names
+in ``staticfiles.json``, which ``{% static %}`` and the webpack tags
+(through ``staticfiles_storage.url``) both read. Files webpack already
+named by content hash (``js/turbo_drive.1a2b3c4d.js``) keep their name.
+After hashing, a ``.gz`` and a ``.br`` sibling of each compressible
+file is written, unless compression saves less than 5%. Without the
+``brotli`` package there are no ``.br`` files; check ``core.W006``
+says so.
+
+Until ``collectstatic`` has written a manifest, URLs are left
+unhashed, so a checkout without collected files still renders.
+
+``StaticFilesMiddleware`` serves ``STATIC_ROOT`` at ``STATIC_URL`` for
+deployments without a web server in front. It picks the ``.br`` or
+``.gz`` sibling the client accepts and marks the files listed in the
+manifest ``immutable`` for a year; anything else may be cached for
+``STATIC_MAX_AGE`` seconds. A web server in front can do the same from
+the same files (nginx: ``brotli_static``/``gzip_static``).
+"""
+from __future__ import annotations
+
+import gzip
+import importlib.util
+import mimetypes
+import re
+from collections.abc import Awaitable, Callable, Iterator
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage,
+    staticfiles_storage,
+)
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import (
+    FileResponse,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+)
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+# Names webpack gave a [contenthash] (see frontend/webpack).
+WEBPACK_HASHED = re.compile(r'\.[0-9a-f]{8,32}(\.chunk)?\.\w+(\.map)?$')
+COMPRESSIBLE = (
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.xml', '.html',
+    '.ico', '.ttf', '.otf', '.eot',
+)
+# Smaller files fit a packet either way.
+MIN_SIZE = 256
+MIN_SAVING = 0.05
+# Preferred first.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE = 'public, max-age=31536000, immutable'
+DEFAULT_MAX_AGE = 60
+
+
+def brotli_available() -> bool:
+    """Return True if the brotli package is installed."""
+    return importlib.util.find_spec('brotli') is not None
+
+
+def compress(data: bytes) -> Iterator[tuple[str, bytes]]:
+    """Yield the suffix and content of each worthwhile compressed copy."""
+    variants = [('.gz', lambda: gzip.compress(data, mtime=0))]
+    if brotli_available():
+        import brotli  # noqa: PLC0415
+
+        variants.insert(0, ('.br', lambda: brotli.compress(data)))
+    for suffix, compressor in variants:
+        compressed = compressor()
+        if len(compressed) <= len(data) * (1 - MIN_SAVING):
+            yield suffix, compressed
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Hashed static files with ``.br`` and ``.gz`` siblings."""
+
+    def stored_name(self, name: str) -> str:
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def hashed_name(
+        self,
+        name: str,
+        content: Any = None,  # noqa: ANN401
+        filename: str | None = None,
+    ) -> str:
+        if WEBPACK_HASHED.search(name):
+            return name
+        return super().hashed_name(name, content, filename)
+
+    def post_process(
+        self,
+        paths: dict[str, Any],
+        dry_run: bool = False,
+        **options: Any,  # noqa: ANN401
+    ) -> Iterator[tuple[str, str | None, bool | Exception]]:
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files.values())):
+            for compressed in self._compress(name):
+                yield name, compressed, True
+
+    def _compress(self, name: str) -> Iterator[str]:
+        if not name.endswith(COMPRESSIBLE):
+            return
+        with self.open(name) as f:
+            data = f.read()
+        if len(data) < MIN_SIZE:
+            return
+        for suffix, compressed in compress(data):
+            path = name + suffix
+            if self.exists(path):
+                self.delete(path)
+            self._save(path, ContentFile(compressed))
+            yield path
+
+
+def _accepted_encodings(request: HttpRequest) -> set[str]:
+    accepted = set()
+    for item in request.headers.get('Accept-Encoding', '').split(','):
+        coding, _, params = item.partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00'):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticFilesMiddleware:
+    """Serve ``STATIC_ROOT`` with compression and long cache lifetimes."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if not getattr(settings, 'STATIC_SERVE', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.root = str(settings.STATIC_ROOT)
+        self.max_age = getattr(settings, 'STATIC_MAX_AGE', DEFAULT_MAX_AGE)
+        # Hashed names never change content; read once per process.
+        self.immutable = frozenset(
+            getattr(staticfiles_storage, 'hashed_files', {}).values()
+        )
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponse | Awaitable[HttpResponse]:
+        if self.is_async:
+            return self.__acall__(request)
+        response = self.serve(request)
+        return self.get_response(request) if response is None else response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        response = self.serve(request)
+        if response is None:
+            return await self.get_response(request)
+        return response
+
+    def serve(self, request: HttpRequest) -> HttpResponse | None:
+        """Return the response for a static file, or None to pass on."""
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        if not request.path.startswith(self.prefix):
+            return None
+        name = unquote(request.path.removeprefix(self.prefix))
+        try:
+            path = Path(safe_join(self.root, name))
+        except (SuspiciousFileOperation, ValueError):
+            return None
+        if not path.is_file():
+            return None
+
+        served, encoding = path, None
+        siblings = {
+            coding: path.with_name(path.name + suffix)
+            for coding, suffix in ENCODINGS
+        }
+        siblings = {c: p for c, p in siblings.items() if p.is_file()}
+        accepted = _accepted_encodings(request)
+        for coding, sibling in siblings.items():
+            if coding in accepted:
+                served, encoding = sibling, coding
+                break
+
+        stat = served.stat()
+        if not was_modified_since(
+            request.headers.get('If-Modified-Since'), stat.st_mtime
+        ):
+            response = HttpResponseNotModified()
+        else:
+            content_type = mimetypes.guess_type(name)[0]
+            response = FileResponse(
+                served.open('rb'),
+                content_type=content_type or 'application/octet-stream',
+            )
+            del response['Content-Disposition']
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if siblings:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        response['Cache-Control'] = (
+            IMMUTABLE if name in self.immutable
+            else f'public, max-age={self.max_age}'
+        )
+        return response
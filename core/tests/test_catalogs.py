@@ -0,0 +1,132 @@
+"""
+Tests for the merged translation catalogs in core/catalogs.py.
+"""
+import io
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.utils import translation
+from django.utils.translation import trans_real
+
+from core import catalogs, checks
+from core.catalogs import MappedTranslation
+
+
+@pytest.fixture
+def catalog_dir(tmp_path: Path) -> Iterator[Path]:
+    saved = dict(trans_real._translations)
+    with override_settings(
+        TRANSLATION_CATALOG_DIR=tmp_path, TRANSLATION_CATALOGS=True
+    ):
+        call_command('build_catalogs', verbosity=0)
+        yield tmp_path
+    trans_real._translations.clear()
+    trans_real._translations.update(saved)
+
+
+def _mapped(language: str) -> MappedTranslation:
+    return MappedTranslation(catalogs.catalog_path(language), language)
+
+
+class TestBuildCatalogs:
+    """manage.py build_catalogs"""
+
+    def test_writes_a_file_per_language(self, tmp_path: Path) -> None:
+        out = io.StringIO()
+        with override_settings(TRANSLATION_CATALOG_DIR=tmp_path):
+            call_command('build_catalogs', '--language', 'de', stdout=out)
+        assert [p.name for p in tmp_path.iterdir()] == ['de.mo']
+        assert out.getvalue().startswith('de: ')
+
+    def test_unknown_language(self) -> None:
+        with pytest.raises(CommandError, match='xx'):
+            call_command('build_catalogs', '--language', 'xx')
+
+
+class TestMappedTranslation:
+    """core.catalogs.MappedTranslation"""
+
+    def test_matches_django(self, catalog_dir: Path) -> None:
+        django, mapped = trans_real.DjangoTranslation('de'), _mapped('de')
+        default = trans_real.DjangoTranslation('en-gb')
+        keys = [*django._catalog.keys(), *default._catalog.keys()]
+        messages = {k for k in keys if isinstance(k, str) and k}
+        plurals = {k[0] for k in keys if isinstance(k, tuple)}
+        assert messages
+        assert plurals
+        for message in messages:
+            assert mapped.gettext(message) == django.gettext(message)
+        for msgid in plurals:
+            for n in (0, 1, 2):
+                assert mapped.ngettext(msgid, 'other', n) == (
+                    django.ngettext(msgid, 'other', n)
+                )
+
+    def test_context(self, catalog_dir: Path) -> None:
+        mapped = _mapped('de')
+        assert mapped.pgettext('abbrev. month', 'Dec.') == 'Dez.'
+        assert mapped.pgettext('no such context', 'Dec.') == 'Dec.'
+        assert mapped.npgettext('no such context', 'day', 'days', 2) == (
+            'days'
+        )
+
+    def test_missing_messages(self, catalog_dir: Path) -> None:
+        mapped = _mapped('de')
+        assert mapped.gettext('No such message') == 'No such message'
+        assert mapped.ngettext('one thing', 'things', 1) == 'one thing'
+        assert mapped.ngettext('one thing', 'things', 3) == 'things'
+
+    def test_only_found_messages_are_memoized(
+        self,
+        catalog_dir: Path,
+    ) -> None:
+        mapped = _mapped('de')
+        for i in range(3):
+            mapped.gettext(f'No such message {i}')
+            mapped.ngettext(f'one thing {i}', 'things', 2)
+        assert mapped._memo == {}
+        assert mapped._plural_memo == {}
+        mapped.gettext('Log in')
+        mapped.ngettext('%(num)d day', '%(num)d days', 2)
+        assert list(mapped._memo) == ['Log in']
+        assert list(mapped._plural_memo) == ['%(num)d day']
+
+    def test_catalog(self, catalog_dir: Path) -> None:
+        django, mapped = trans_real.DjangoTranslation('de'), _mapped('de')
+        keys = [k for k in django._catalog.keys() if k]
+        assert keys
+        for key in keys:
+            assert mapped._catalog[key] == django._catalog[key]
+        assert set(keys) <= set(mapped._catalog)
+        assert len(mapped._catalog) == len(list(mapped._catalog.items()))
+        assert 'Plural-Forms:' in mapped._catalog['']
+        assert 'No such message' not in mapped._catalog
+        assert ('%(num)d day', 5) not in mapped._catalog
+
+
+class TestWarmUp:
+    """core.catalogs.warm_up"""
+
+    def test_installs_mapped_translations(self, catalog_dir: Path) -> None:
+        catalogs.warm_up()
+        assert isinstance(trans_real._translations['de'], MappedTranslation)
+        with translation.override('de'):
+            assert translation.gettext('Log in') == 'Anmelden'
+            assert translation.get_language() == 'de'
+            assert trans_real.catalog()._catalog['Log in'] == 'Anmelden'
+
+    def test_stale_files_are_ignored(self, catalog_dir: Path) -> None:
+        path = catalogs.catalog_path('de')
+        os.utime(path, (0, 0))
+        assert catalogs.is_stale('de')
+        assert 'de' not in catalogs.install()
+        [warning] = checks.check_translation_catalogs()
+        assert warning.id == 'core.W004'
+        assert 'de' in warning.msg
+
+    def test_check_passes_when_built(self, catalog_dir: Path) -> None:
+        assert checks.check_translation_catalogs() == []
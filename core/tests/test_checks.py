@@ -0,0 +1,67 @@
+"""
+Tests for the database connection system checks.
+"""
+from typing import Any
+
+import pytest
+from django.test import override_settings
+
+from core import checks
+
+POSTGRES = 'django.db.backends.postgresql'
+
+
+def _pool_database(**pool: Any) -> dict[str, Any]:  # noqa: ANN401
+    return {
+        'ENGINE': POSTGRES,
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {'pool': {'min_size': 2, 'max_size': 10, **pool}},
+    }
+
+
+def _ids(database: dict[str, Any]) -> list[str]:
+    return [error.id for error in checks._check_pool('default', database)]
+
+
+class TestPoolCheck:
+    """core.E00x"""
+
+    def test_valid_configuration(self) -> None:
+        assert _ids(_pool_database(timeout=10.0)) == []
+
+    def test_pool_as_boolean(self) -> None:
+        database = _pool_database()
+        database['OPTIONS']['pool'] = True
+        assert _ids(database) == []
+
+    def test_other_backend(self) -> None:
+        database = _pool_database()
+        database['ENGINE'] = 'django.db.backends.sqlite3'
+        assert _ids(database) == ['core.E001']
+
+    def test_missing_package(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(checks, 'pool_available', lambda: False)
+        assert _ids(_pool_database()) == ['core.E002']
+
+    def test_persistent_connections_conflict(self) -> None:
+        database = _pool_database()
+        database['CONN_MAX_AGE'] = 60
+        assert _ids(database) == ['core.E003']
+
+    @pytest.mark.parametrize(
+        ('min_size', 'max_size'),
+        [(-1, 10), (5, 2), (0, 0)],
+    )
+    def test_invalid_sizes(self, min_size: int, max_size: int) -> None:
+        database = _pool_database(min_size=min_size, max_size=max_size)
+        assert _ids(database) == ['core.E004']
+
+    def test_non_positive_timeout(self) -> None:
+        assert _ids(_pool_database(timeout=0)) == ['core.E005']
+
+
+@override_settings(DEBUG=False)
+def test_warns_without_connection_reuse() -> None:
+    database = {'ENGINE': POSTGRES, 'CONN_MAX_AGE': 0}
+    ids = [e.id for e in checks._check_database('default', database)]
+    assert ids == ['core.W001']
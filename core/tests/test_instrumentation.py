@@ -0,0 +1,144 @@
+"""
+Tests for the request metrics in core/instrumentation.py.
+"""
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from cid.locals import set_cid
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from django.template import engines
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+
+from core.instrumentation import InstrumentationMiddleware
+
+ON = {
+    'INSTRUMENTATION': True,
+    'INSTRUMENTATION_SAMPLE_RATE': 0,
+    'INSTRUMENTATION_DUPLICATE_QUERY_THRESHOLD': 0,
+}
+
+
+def _timing(response: HttpResponse) -> dict[str, str]:
+    """Server-Timing entries by name."""
+    return dict(
+        entry.split(';', 1) for entry in response['Server-Timing'].split(', ')
+    )
+
+
+def _middleware(
+    view: object,
+    **overrides: object,
+) -> InstrumentationMiddleware:
+    with override_settings(**{**ON, **overrides}):
+        return InstrumentationMiddleware(view)
+
+
+def test_switched_off() -> None:
+    with (
+        override_settings(INSTRUMENTATION=False),
+        pytest.raises(MiddlewareNotUsed),
+    ):
+        InstrumentationMiddleware(lambda request: HttpResponse())
+
+
+@pytest.mark.django_db
+def test_queries() -> None:
+    def view(request: HttpRequest) -> HttpResponse:
+        get_user_model().objects.count()
+        get_user_model().objects.exists()
+        return HttpResponse()
+
+    response = _middleware(view)(RequestFactory().get('/'))
+    assert _timing(response)['db'].endswith('desc="2 queries"')
+
+
+def test_templates_and_cache() -> None:
+    template = engines['django'].from_string(
+        '{% for n in numbers %}{{ n }}{% endfor %}'
+    )
+
+    def view(request: HttpRequest) -> HttpResponse:
+        cache.set('instrumentation', 1)
+        cache.get('instrumentation')
+        cache.get('instrumentation-missing')
+        cache.get_many(['instrumentation', 'instrumentation-missing'])
+        return HttpResponse(template.render({'numbers': [1, 2]}))
+
+    response = _middleware(view)(RequestFactory().get('/'))
+    timing = _timing(response)
+    assert float(timing['tpl'].removeprefix('dur=')) > 0
+    assert timing['cache'] == 'desc="2 hits / 2 misses"'
+
+
+def test_correlation_id() -> None:
+    set_cid('lab-1')
+    try:
+        response = _middleware(lambda request: HttpResponse())(
+            RequestFactory().get('/')
+        )
+    finally:
+        set_cid(None)
+    assert _timing(response)['cid'] == 'desc="lab-1"'
+
+
+def test_correlation_id_is_sanitized() -> None:
+    set_cid('lab-1", evil;dur=0;desc="\\, generated-2')
+    try:
+        response = _middleware(lambda request: HttpResponse())(
+            RequestFactory().get('/')
+        )
+    finally:
+        set_cid(None)
+    timing = _timing(response)
+    assert list(timing) == ['db', 'tpl', 'cache', 'total', 'cid']
+    assert timing['cid'] == 'desc="lab-1 evil dur 0 desc generated-2"'
+
+
+def test_sampled_requests_are_logged(caplog: pytest.LogCaptureFixture) -> None:
+    middleware = _middleware(
+        lambda request: HttpResponse(status=201),
+        INSTRUMENTATION_SAMPLE_RATE=1,
+    )
+    with caplog.at_level(logging.INFO, 'core.instrumentation'):
+        middleware(RequestFactory().get('/page/'))
+    [record] = caplog.records
+    assert record.path == '/page/'
+    assert record.status == 201
+    assert record.queries == 0
+
+
+@pytest.mark.django_db
+def test_duplicate_queries(caplog: pytest.LogCaptureFixture) -> None:
+    def view(request: HttpRequest) -> HttpResponse:
+        for pk in range(3):
+            get_user_model().objects.filter(pk=pk).exists()
+        get_user_model().objects.count()
+        return HttpResponse()
+
+    middleware = _middleware(view, INSTRUMENTATION_DUPLICATE_QUERY_THRESHOLD=3)
+    with caplog.at_level(logging.WARNING, 'core.instrumentation'):
+        middleware(RequestFactory().get('/'))
+    [record] = caplog.records
+    [(sql, count)] = record.duplicate_queries.items()
+    assert 'LIMIT 1' in sql
+    assert count == 3
+
+
+def test_async_requests() -> None:
+    async def view(request: HttpRequest) -> HttpResponse:
+        await cache.aget('instrumentation-missing')
+        return HttpResponse()
+
+    response = async_to_sync(_middleware(view))(AsyncRequestFactory().get('/'))
+    assert _timing(response)['cache'] == 'desc="0 hits / 1 misses"'
+
+
+def test_nothing_counted_outside_requests() -> None:
+    middleware = _middleware(lambda request: HttpResponse())
+    cache.get('instrumentation-missing')
+    response = middleware(RequestFactory().get('/'))
+    assert _timing(response)['cache'] == 'desc="0 hits / 0 misses"'
@@ -0,0 +1,168 @@
+"""
+Tests for the queue-based logging pipeline.
+"""
+import json
+import logging
+import os
+import queue
+import sys
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from cid.locals import set_cid
+from django.conf import settings
+
+from core.log import (
+    CidContextFilter,
+    CidQueueHandler,
+    JsonFormatter,
+    configure_logging,
+    stop_queue_listeners,
+)
+
+
+class ListHandler(logging.Handler):
+    """Collects handled records; used by the dictConfig test below."""
+
+    records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def _record(
+    msg: str = 'sample %s',
+    args: tuple = ('42',),
+) -> logging.LogRecord:
+    return logging.LogRecord(
+        'forenlims', logging.INFO, __file__, 1, msg, args, None
+    )
+
+
+@pytest.fixture
+def cid() -> Generator[str, None, None]:
+    set_cid('lab-1')
+    yield 'lab-1'
+    set_cid(None)
+
+
+class TestCidQueueHandler:
+    """Records are prepared in the logging thread."""
+
+    def test_cid_is_captured_before_hand_off(self, cid: str) -> None:
+        records = queue.Queue()
+        CidQueueHandler(records).handle(_record())
+        set_cid('someone-else')
+
+        record = records.get_nowait()
+        assert record.cid == cid
+        assert record.msg == 'sample 42'
+        assert record.args is None
+
+    def test_traceback_is_kept_separately(self) -> None:
+        records = queue.Queue()
+        record = _record('failed', ())
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            record.exc_info = sys.exc_info()
+        CidQueueHandler(records).handle(record)
+
+        prepared = records.get_nowait()
+        assert prepared.exc_info is None
+        assert 'ValueError: boom' in prepared.exc_text
+        assert prepared.msg == 'failed'
+
+
+class TestCidContextFilter:
+    """The filter fills in but never replaces a captured CID."""
+
+    def test_keeps_existing_cid(self, cid: str) -> None:
+        record = _record()
+        record.cid = 'captured'
+        CidContextFilter().filter(record)
+        assert record.cid == 'captured'
+
+    def test_sets_missing_cid(self, cid: str) -> None:
+        record = _record()
+        CidContextFilter().filter(record)
+        assert record.cid == cid
+
+
+def test_json_formatter(cid: str) -> None:
+    record = _record()
+    record.cid = cid
+    record.sample_id = 'S-1'
+    data = json.loads(JsonFormatter().format(record))
+    assert data['message'] == 'sample 42'
+    assert data['level'] == 'INFO'
+    assert data['cid'] == cid
+    assert data['sample_id'] == 'S-1'
+
+
+def test_listener_delivers_records(cid: str) -> None:
+    """configure_logging() starts the listener of the queue handler."""
+    ListHandler.records.clear()
+    configure_logging({
+        'version': 1,
+        'disable_existing_loggers': False,
+        'handlers': {
+            'collect': {'class': 'core.tests.test_log.ListHandler'},
+            'queue': {
+                'class': 'core.log.CidQueueHandler',
+                'handlers': ['collect'],
+            },
+        },
+        'loggers': {
+            'forenlims.queued': {'handlers': ['queue'], 'level': 'INFO'},
+        },
+    })
+    try:
+        logging.getLogger('forenlims.queued').info('sample %s', 7)
+        # stop() drains the queue before it returns.
+        logging.getHandlerByName('queue').listener.stop()
+    finally:
+        configure_logging(settings.LOGGING)
+
+    (record,) = ListHandler.records
+    assert record.getMessage() == 'sample 7'
+    assert record.cid == cid
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork()')
+@pytest.mark.filterwarnings('ignore::DeprecationWarning')
+def test_listener_runs_in_forked_children(tmp_path: Path) -> None:
+    """A pre-forked worker gets a listener of its own."""
+    path = tmp_path / 'child.log'
+    configure_logging({
+        'version': 1,
+        'disable_existing_loggers': False,
+        'handlers': {
+            'file': {
+                'class': 'logging.FileHandler',
+                'filename': str(path),
+                'delay': True,
+            },
+            'queue': {
+                'class': 'core.log.CidQueueHandler',
+                'handlers': ['file'],
+            },
+        },
+        'loggers': {
+            'forenlims.forked': {'handlers': ['queue'], 'level': 'INFO'},
+        },
+    })
+    try:
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - runs in the child
+            logging.getLogger('forenlims.forked').info('from the child')
+            # Drains the queue through the child's listener thread.
+            stop_queue_listeners()
+            os._exit(0)
+        _, status = os.waitpid(pid, 0)
+    finally:
+        configure_logging(settings.LOGGING)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert path.read_text() == 'from the child\n'
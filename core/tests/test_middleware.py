@@ -0,0 +1,127 @@
+"""
+Tests for the ASGI profile middleware in core/middleware.py.
+"""
+import asyncio
+
+from asgiref.sync import async_to_sync
+from auditlog.context import auditlog_value
+from cid.locals import get_cid
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+
+from core import checks, middleware
+
+HEADER = {'X-Correlation-ID': 'upstream'}
+
+
+async def _echo_cid(request: HttpRequest) -> HttpResponse:
+    # Let the other requests run in between.
+    await asyncio.sleep(0)
+    return HttpResponse(get_cid())
+
+
+class TestCidMiddleware:
+    """core.middleware.CidMiddleware"""
+
+    def test_concurrent_requests_keep_their_ids(self) -> None:
+        cid_middleware = middleware.CidMiddleware(_echo_cid)
+        factory = AsyncRequestFactory()
+
+        async def run() -> list[HttpResponse]:
+            return await asyncio.gather(*(
+                cid_middleware(
+                    factory.get('/', headers={'X-Correlation-ID': str(n)})
+                )
+                for n in range(10)
+            ))
+
+        for n, response in enumerate(async_to_sync(run)()):
+            assert response.content.decode().startswith(f'{n}, ')
+            assert response['X-Correlation-ID'] == response.content.decode()
+
+    def test_sync_requests_are_unchanged(self) -> None:
+        cid_middleware = middleware.CidMiddleware(
+            lambda request: HttpResponse(get_cid())
+        )
+        response = cid_middleware(RequestFactory().get('/', headers=HEADER))
+        assert response.content.decode().startswith('upstream, ')
+
+
+class TestAuditlogMiddleware:
+    """core.middleware.AuditlogMiddleware"""
+
+    def _actor(self, user: object) -> object:
+        async def get_response(request: HttpRequest) -> HttpResponse:
+            response = HttpResponse()
+            response.actor = auditlog_value.get()['actor']
+            return response
+
+        request = AsyncRequestFactory().get('/')
+
+        async def auser() -> object:
+            return user
+
+        request.auser = auser
+        audit_middleware = middleware.AuditlogMiddleware(get_response)
+        return async_to_sync(audit_middleware)(request).actor
+
+    def test_actor_from_the_async_user(self) -> None:
+        user = get_user_model()(email='analyst@example.com')
+        assert self._actor(user) is user
+
+    def test_anonymous_requests_have_no_actor(self) -> None:
+        assert self._actor(AnonymousUser()) is None
+
+
+class TestInlineHooks:
+    """Thread hops of the Django middleware in the ASGI profile."""
+
+    def test_session_only_switches_threads_to_save(self) -> None:
+        session_middleware = middleware.SessionMiddleware(_echo_cid)
+        request = AsyncRequestFactory().get('/')
+        session_middleware.process_request(request)
+        assert not session_middleware.response_needs_thread(request)
+        request.session['key'] = 'value'
+        assert session_middleware.response_needs_thread(request)
+
+    def test_csrf_cookie_is_set_on_the_event_loop(self) -> None:
+        async def get_response(request: HttpRequest) -> HttpResponse:
+            request.META['CSRF_COOKIE_NEEDS_UPDATE'] = True
+            request.META['CSRF_COOKIE'] = 'x' * 32
+            return HttpResponse()
+
+        csrf_middleware = middleware.CsrfViewMiddleware(get_response)
+        request = AsyncRequestFactory().get('/')
+        assert not csrf_middleware.request_needs_thread(request)
+        response = async_to_sync(csrf_middleware)(request)
+        assert settings.CSRF_COOKIE_NAME in response.cookies
+
+
+class TestAsyncMiddlewareCheck:
+    """core.W002"""
+
+    def _check(self, stack: list[str]) -> list[str]:
+        with override_settings(ASGI=True, MIDDLEWARE=stack):
+            return [w.msg for w in checks.check_async_middleware()]
+
+    def test_sync_only_middleware_under_asgi(self) -> None:
+        assert self._check(settings.MIDDLEWARE) == [
+            'cid.middleware.CidMiddleware only supports synchronous '
+            'requests.',
+            'auditlog.middleware.AuditlogMiddleware only supports '
+            'synchronous requests.',
+        ]
+
+    def test_asgi_profile_passes(self) -> None:
+        stack = [
+            settings.ASGI_MIDDLEWARE.get(path, path)
+            for path in settings.MIDDLEWARE
+        ]
+        assert self._check(stack) == []
+
+    def test_ignored_under_wsgi(self) -> None:
+        assert not settings.ASGI
+        assert checks.check_async_middleware() == []
@@ -0,0 +1,187 @@
+"""
+Tests for the full-page cache in core/page_cache.py.
+"""
+import io
+import re
+from collections.abc import Iterator
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpRequest, HttpResponse
+from django.middleware.csrf import _unmask_cipher_token
+from django.test import (
+    AsyncRequestFactory,
+    Client,
+    RequestFactory,
+    override_settings,
+)
+from django.urls import reverse
+
+from core import page_cache
+from core.page_cache import PageCacheMiddleware
+
+pytestmark = pytest.mark.django_db
+
+URL = reverse('home')
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches() -> Iterator[None]:
+    caches['pages'].clear()
+    caches['template_fragments'].clear()
+    yield
+    caches['pages'].clear()
+
+
+def _rendered(response: HttpResponse) -> bool:
+    """Whether the view rendered the response (a cache miss)."""
+    return response.context is not None
+
+
+def _token(response: HttpResponse) -> str:
+    match = re.search(
+        rb'name="csrfmiddlewaretoken" value="(\w+)"', response.content
+    )
+    return _unmask_cipher_token(match[1].decode())
+
+
+def test_switched_off() -> None:
+    with (
+        override_settings(PAGE_CACHE=False),
+        pytest.raises(MiddlewareNotUsed),
+    ):
+        PageCacheMiddleware(lambda request: HttpResponse())
+
+
+class TestPageCacheMiddleware:
+    """core.page_cache.PageCacheMiddleware"""
+
+    @pytest.mark.parametrize('name', settings.PAGE_CACHE_VIEWS)
+    def test_second_request_is_served_from_cache(self, name: str) -> None:
+        url = reverse(name)
+        first = Client().get(url)
+        second = Client().get(url)
+        assert _rendered(first)
+        assert not _rendered(second)
+        assert second.status_code == 200
+        assert second['Content-Type'] == first['Content-Type']
+        assert int(second['Content-Length']) == len(second.content)
+
+    def test_cached_per_language(self) -> None:
+        client = Client()
+        english = client.get(URL, headers={'accept-language': 'en'})
+        german = client.get(URL, headers={'accept-language': 'de'})
+        assert _rendered(english)
+        assert _rendered(german)
+        assert b'<html lang="de">' in german.content
+
+        client.cookies[settings.LANGUAGE_COOKIE_NAME] = 'de'
+        chosen = client.get(URL, headers={'accept-language': 'en'})
+        assert not _rendered(chosen)
+        assert b'<html lang="de">' in chosen.content
+        assert chosen['Content-Language'] == 'de'
+
+    def test_csrf_token_per_visitor(self) -> None:
+        Client().get(URL)
+        first, second = Client(), Client()
+        responses = [c.get(URL) for c in (first, second)]
+        assert not any(_rendered(r) for r in responses)
+        assert page_cache.CSRF_PLACEHOLDER.encode() not in (
+            responses[0].content
+        )
+        assert [_token(r) for r in responses] == [
+            first.cookies['csrftoken'].value,
+            second.cookies['csrftoken'].value,
+        ]
+        # A returning visitor keeps the secret of its cookie.
+        secret = first.cookies['csrftoken'].value
+        assert _token(first.get(URL)) == secret
+        assert first.cookies['csrftoken'].value == secret
+
+    def test_page_cached_by_another_process(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        cached = Client().get(URL)
+        assert _rendered(cached)
+        # A worker started later, with a placeholder of its own.
+        monkeypatch.setattr(page_cache, 'CSRF_PLACEHOLDER', 'csrfother')
+        client = Client()
+        response = client.get(URL)
+        assert not _rendered(response)
+        assert _token(response) == client.cookies['csrftoken'].value
+
+    def test_cached_form_posts(self) -> None:
+        Client().get(URL)
+        client = Client(enforce_csrf_checks=True)
+        response = client.get(URL)
+        assert not _rendered(response)
+        token = re.search(
+            rb'name="csrfmiddlewaretoken" value="(\w+)"', response.content
+        )[1].decode()
+        posted = client.post(
+            reverse('set_language'),
+            {'language': 'de', 'csrfmiddlewaretoken': token},
+        )
+        assert posted.status_code == 302
+
+    def test_authenticated_users_bypass_the_cache(self) -> None:
+        Client().get(URL)
+        client = Client()
+        client.force_login(
+            get_user_model().objects.create_user(
+                email='cached@example.com', password='x'
+            )
+        )
+        assert _rendered(client.get(URL))
+        assert _rendered(client.get(URL))
+
+    def test_query_strings_bypass_the_cache(self) -> None:
+        Client().get(URL)
+        assert _rendered(Client().get(URL, {'next': '/admin/'}))
+
+    def test_responses_setting_cookies_are_not_cached(self) -> None:
+        def view(request: HttpRequest) -> HttpResponse:
+            response = HttpResponse('hello')
+            response.set_cookie('tracking', '1')
+            return response
+
+        middleware = PageCacheMiddleware(view)
+        request = RequestFactory().get(URL)
+        assert middleware(request).cookies['tracking'].value == '1'
+        assert caches['pages'].get(
+            page_cache.cache_key(request, 1)
+        ) is None
+
+    def test_invalidate(self) -> None:
+        Client().get(URL)
+        out = io.StringIO()
+        call_command('invalidate_page_cache', stdout=out)
+        assert out.getvalue().strip() == 'Page cache invalidated.'
+        assert _rendered(Client().get(URL))
+        assert not _rendered(Client().get(URL))
+
+    def test_template_settings_invalidate(self) -> None:
+        Client().get(URL)
+        with override_settings(LANGUAGE_CODE='de'):
+            assert _rendered(Client().get(URL))
+
+    def test_async(self) -> None:
+        calls = []
+
+        async def view(request: HttpRequest) -> HttpResponse:
+            calls.append(request)
+            return HttpResponse('cached')
+
+        middleware = PageCacheMiddleware(view)
+        factory = AsyncRequestFactory()
+        responses = [
+            async_to_sync(middleware)(factory.get(URL)) for _ in range(2)
+        ]
+        assert len(calls) == 1
+        assert responses[1].content == b'cached'
@@ -0,0 +1,150 @@
+"""
+Tests for the coalescing session store and the purge_sessions command.
+"""
+import datetime
+import io
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core import checks, sessions
+from core.sessions import SessionStore
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def session_key() -> str:
+    store = SessionStore()
+    store['lab'] = 'DNA'
+    store.save()
+    return store.session_key
+
+
+def _writes(save: object) -> int:
+    with CaptureQueriesContext(connection) as queries:
+        save()
+    return sum(
+        q['sql'].startswith(('UPDATE', 'INSERT')) for q in queries
+    )
+
+
+class TestSessionStore:
+    """core.sessions.SessionStore"""
+
+    def test_unchanged_data_is_not_written(self, session_key: str) -> None:
+        store = SessionStore(session_key)
+        store['lab'] = 'DNA'
+        assert store.modified
+        assert _writes(store.save) == 0
+
+    def test_changed_data_is_written(self, session_key: str) -> None:
+        store = SessionStore(session_key)
+        store['lab'] = 'Toxicology'
+        assert _writes(store.save) == 1
+        assert SessionStore(session_key)['lab'] == 'Toxicology'
+
+    def test_mutated_values_are_written(self, session_key: str) -> None:
+        store = SessionStore(session_key)
+        store['cases'] = []
+        store.save()
+        store = SessionStore(session_key)
+        store['cases'].append(1)
+        assert _writes(store.save) == 1
+
+    @pytest.mark.parametrize('every_request', [False, True])
+    def test_expiry_refresh_once_per_interval(
+        self,
+        session_key: str,
+        monkeypatch: pytest.MonkeyPatch,
+        every_request: bool,
+    ) -> None:
+        """Marked modified but unchanged, as on every login."""
+
+        def save() -> int:
+            store = SessionStore(session_key)
+            store['lab'] = 'DNA'
+            return _writes(store.save)
+
+        def expire_date() -> datetime.datetime:
+            return Session.objects.get(pk=session_key).expire_date
+
+        with override_settings(SESSION_SAVE_EVERY_REQUEST=every_request):
+            assert save() == 0
+            expires = expire_date()
+
+            interval = sessions.DEFAULT_SAVE_INTERVAL
+            later = sessions.time.time() + interval
+            now = timezone.now() + datetime.timedelta(seconds=interval)
+            monkeypatch.setattr(sessions.time, 'time', lambda: later)
+            monkeypatch.setattr(timezone, 'now', lambda: now)
+            assert save() == 1
+            assert save() == 0
+        assert expire_date() > expires
+
+    def test_cycle_key_keeps_the_data(self, session_key: str) -> None:
+        store = SessionStore(session_key)
+        store.cycle_key()
+        assert _writes(store.save) == 0
+        assert SessionStore(store.session_key)['lab'] == 'DNA'
+        assert not Session.objects.filter(pk=session_key).exists()
+
+    def test_async(self, session_key: str) -> None:
+        store = SessionStore(session_key)
+
+        async def save(value: str) -> None:
+            await store.aset('lab', value)
+            await store.asave()
+
+        assert _writes(lambda: async_to_sync(save)('DNA')) == 0
+        assert _writes(lambda: async_to_sync(save)('Toxicology')) == 1
+        assert SessionStore(session_key)['lab'] == 'Toxicology'
+
+
+class TestPurgeSessions:
+    """manage.py purge_sessions"""
+
+    def _session(self, key: str, days: int) -> None:
+        Session.objects.create(
+            session_key=key,
+            session_data='',
+            expire_date=timezone.now() + datetime.timedelta(days=days),
+        )
+
+    def _purge(self, *args: str) -> str:
+        out = io.StringIO()
+        call_command('purge_sessions', *args, stdout=out)
+        return out.getvalue()
+
+    def test_deletes_expired_sessions_in_batches(self) -> None:
+        for n in range(5):
+            self._session(f'expired{n}', -1)
+        self._session('live', 1)
+        output = self._purge('--batch-size', '2')
+        assert 'Deleted 5 expired sessions in 3 batches.' in output
+        assert list(Session.objects.values_list('pk', flat=True)) == [
+            'live'
+        ]
+
+    def test_dry_run(self) -> None:
+        self._session('expired', -1)
+        assert self._purge('--dry-run').strip() == '1 expired sessions.'
+        assert Session.objects.count() == 1
+
+
+def test_local_session_cache_warning() -> None:
+    with override_settings(DEBUG=False):
+        [warning] = checks.check_session_cache()
+    assert warning.id == 'core.W003'
+    shared = 'django.core.cache.backends.redis.RedisCache'
+    with override_settings(
+        DEBUG=False,
+        CACHES={'sessions': {'BACKEND': shared}},
+    ):
+        assert checks.check_session_cache() == []
@@ -0,0 +1,160 @@
+"""
+Tests for the hashed, pre-compressed static files in core/staticfiles.py.
+"""
+import gzip
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, override_settings
+
+from core import checks
+from core.staticfiles import (
+    IMMUTABLE,
+    StaticFilesMiddleware,
+    brotli_available,
+)
+
+CSS = 'body { background: url("../img/logo.png"); }\n' * 20
+JS = 'document.addEventListener("turbo:load", () => {});\n' * 20
+
+
+@pytest.fixture
+def static_root(tmp_path: Path) -> Iterator[Path]:
+    source, root = tmp_path / 'source', tmp_path / 'root'
+    (source / 'css').mkdir(parents=True)
+    (source / 'img').mkdir()
+    (source / 'js').mkdir()
+    (source / 'css' / 'site.css').write_text(CSS)
+    (source / 'img' / 'logo.png').write_bytes(b'\x89PNG' * 100)
+    (source / 'js' / 'app.1a2b3c4d.js').write_text(JS)
+    with override_settings(
+        STATICFILES_DIRS=[source],
+        STATICFILES_FINDERS=[
+            'django.contrib.staticfiles.finders.FileSystemFinder',
+        ],
+        STATIC_ROOT=root,
+        STATIC_SERVE=True,
+    ):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        yield root
+
+
+def _manifest(root: Path) -> dict[str, str]:
+    return json.loads((root / 'staticfiles.json').read_text())['paths']
+
+
+class TestCompressedManifestStaticFilesStorage:
+    """core.staticfiles.CompressedManifestStaticFilesStorage"""
+
+    def test_hashes_names(self, static_root: Path) -> None:
+        paths = _manifest(static_root)
+        assert paths['css/site.css'].startswith('css/site.')
+        assert paths['css/site.css'] != 'css/site.css'
+        assert paths['js/app.1a2b3c4d.js'] == 'js/app.1a2b3c4d.js'
+        css = (static_root / paths['css/site.css']).read_text()
+        assert paths['img/logo.png'].removeprefix('img/') in css
+        assert staticfiles_storage.url('css/site.css') == (
+            f'/static/{paths["css/site.css"]}'
+        )
+
+    def test_compressed_siblings(self, static_root: Path) -> None:
+        paths = _manifest(static_root)
+        for name in ('css/site.css', 'js/app.1a2b3c4d.js'):
+            path = static_root / paths[name]
+            gz = path.with_name(path.name + '.gz')
+            assert gzip.decompress(gz.read_bytes()) == path.read_bytes()
+        assert (static_root / 'js/app.1a2b3c4d.js').read_text() == JS
+        # Too small, and not compressible.
+        logo = static_root / paths['img/logo.png']
+        assert not logo.with_name(logo.name + '.gz').exists()
+
+    def test_brotli(self, static_root: Path) -> None:
+        brotli = pytest.importorskip('brotli')
+        path = static_root / _manifest(static_root)['js/app.1a2b3c4d.js']
+        br = path.with_name(path.name + '.br')
+        assert brotli.decompress(br.read_bytes()) == path.read_bytes()
+
+    def test_unhashed_without_manifest(self, tmp_path: Path) -> None:
+        with override_settings(STATIC_ROOT=tmp_path):
+            assert staticfiles_storage.url('css/site.css') == (
+                '/static/css/site.css'
+            )
+            [warning] = checks.check_static_manifest()
+        assert warning.id == 'core.W005'
+
+    def test_check_passes_when_collected(self, static_root: Path) -> None:
+        assert checks.check_static_manifest() == []
+
+    def test_check_brotli(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(checks, 'brotli_available', lambda: True)
+        assert checks.check_static_compression() == []
+        monkeypatch.setattr(checks, 'brotli_available', lambda: False)
+        [warning] = checks.check_static_compression()
+        assert warning.id == 'core.W006'
+
+
+class TestStaticFilesMiddleware:
+    """core.staticfiles.StaticFilesMiddleware"""
+
+    def test_switched_off(self) -> None:
+        with (
+            override_settings(STATIC_SERVE=False),
+            pytest.raises(MiddlewareNotUsed),
+        ):
+            StaticFilesMiddleware(lambda request: HttpResponse())
+
+    def test_serves_compressed(self, static_root: Path) -> None:
+        url = staticfiles_storage.url('css/site.css')
+        client = Client()
+        expected = 'br' if brotli_available() else 'gzip'
+        response = client.get(url, headers={'accept-encoding': 'gzip, br'})
+        assert response['Content-Encoding'] == expected
+        assert response['Content-Type'].startswith('text/css')
+        assert response['Cache-Control'] == IMMUTABLE
+        assert response['Vary'] == 'Accept-Encoding'
+        assert not response.has_header('Content-Disposition')
+
+        response = client.get(
+            url, headers={'accept-encoding': 'gzip, br;q=0'}
+        )
+        assert response['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(b''.join(response.streaming_content)) == (
+            b''.join(client.get(url).streaming_content)
+        )
+
+    def test_identity(self, static_root: Path) -> None:
+        response = Client().get(staticfiles_storage.url('css/site.css'))
+        assert not response.has_header('Content-Encoding')
+        assert b''.join(response.streaming_content).startswith(b'body')
+
+    def test_unhashed_names_expire(self, static_root: Path) -> None:
+        response = Client().get('/static/css/site.css')
+        assert response.status_code == 200
+        assert response['Cache-Control'] == 'public, max-age=60'
+
+    def test_not_modified(self, static_root: Path) -> None:
+        url = staticfiles_storage.url('img/logo.png')
+        client = Client()
+        modified = client.get(url)['Last-Modified']
+        response = client.get(url, headers={'if-modified-since': modified})
+        assert response.status_code == 304
+        assert not response.has_header('Vary')
+
+    def test_passes_on(self, static_root: Path) -> None:
+        middleware = StaticFilesMiddleware(
+            lambda request: HttpResponse(b'app')
+        )
+        factory = RequestFactory()
+        for request in (
+            factory.get('/static/css/missing.css'),
+            factory.get('/static/../source/css/site.css'),
+            factory.get('/css/site.css'),
+            factory.post('/static/css/site.css'),
+        ):
+            assert middleware(request).content == b'app'
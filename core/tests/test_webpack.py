@@ -0,0 +1,152 @@
+"""
+Tests for the cached webpack manifest and the preload hints.
+"""
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, JsonResponse
+from django.test import Client, RequestFactory, override_settings
+from webpack_boilerplate import utils
+
+from core.webpack import ManifestLoader, PreloadMiddleware
+
+ASSETS = {
+    'js': [
+        '/static/js/runtime.js',
+        '/static/js/vendors.js',
+        '/static/js/turbo_drive.js',
+    ],
+    'css': ['/static/css/turbo_drive.css'],
+}
+
+
+def _write(path: Path, assets: dict[str, list[str]]) -> None:
+    files = {
+        url.rpartition('/')[2]: url for urls in assets.values() for url in urls
+    }
+    path.write_text(json.dumps({
+        'entrypoints': {'turbo_drive': {'assets': assets}},
+        **files,
+    }))
+
+
+@pytest.fixture
+def manifest(tmp_path: Path) -> Iterator[Path]:
+    path = tmp_path / 'manifest.json'
+    _write(path, ASSETS)
+    with override_settings(
+        WEBPACK_LOADER={**settings.WEBPACK_LOADER, 'MANIFEST_FILE': path},
+    ):
+        yield path
+
+
+@pytest.fixture
+def _clear_caches() -> Iterator[None]:
+    # Pages rendered with another manifest must not be served.
+    caches['pages'].clear()
+    caches['template_fragments'].clear()
+    yield
+    caches['pages'].clear()
+    caches['template_fragments'].clear()
+
+
+def _loader(path: Path, cache: bool) -> ManifestLoader:
+    return ManifestLoader(
+        'DEFAULT',
+        {
+            'MANIFEST_FILE': path,
+            'CACHE': cache,
+            'ignores': [],
+            'web_framework': 'django',
+        },
+    )
+
+
+def _urls(loader: ManifestLoader) -> list[str]:
+    return [chunk['url'] for chunk in loader.get_bundle('turbo_drive')]
+
+
+class TestManifestLoader:
+    """core.webpack.ManifestLoader"""
+
+    def test_reads_the_manifest_once_per_change(
+        self,
+        manifest: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        loader = _loader(manifest, cache=False)
+        loads = []
+        load_assets = loader.load_assets
+        monkeypatch.setattr(
+            loader, 'load_assets', lambda: loads.append(1) or load_assets()
+        )
+        assert _urls(loader) == _urls(loader)
+        assert len(loads) == 1
+
+        _write(manifest, {'js': ['/static/js/turbo_drive.abc.js']})
+        mtime = manifest.stat().st_mtime_ns + 1_000_000_000
+        os.utime(manifest, ns=(mtime, mtime))
+        assert _urls(loader) == ['/static/js/turbo_drive.abc.js']
+        assert len(loads) == 2
+
+    def test_cache_reads_the_manifest_once(self, manifest: Path) -> None:
+        loader = _loader(manifest, cache=True)
+        before = _urls(loader)
+        manifest.unlink()
+        assert _urls(loader) == before
+
+    def test_chunks_are_copies(self, manifest: Path) -> None:
+        loader = _loader(manifest, cache=True)
+        loader.get_bundle('turbo_drive')[0]['url'] = 'changed'
+        assert _urls(loader)[0] == '/static/js/runtime.js'
+
+    def test_template_tags(self, manifest: Path) -> None:
+        assert isinstance(utils.get_loader('DEFAULT'), ManifestLoader)
+        tags = utils.get_as_tags('turbo_drive', extension='js')
+        assert len(tags) == 3
+        assert 'src="/static/js/runtime.js"' in tags[0]
+
+
+class TestPreloadMiddleware:
+    """core.webpack.PreloadMiddleware"""
+
+    def test_switched_off(self) -> None:
+        with (
+            override_settings(WEBPACK_PRELOAD=[]),
+            pytest.raises(MiddlewareNotUsed),
+        ):
+            PreloadMiddleware(lambda request: HttpResponse())
+
+    @pytest.mark.django_db
+    @pytest.mark.usefixtures('_clear_caches')
+    def test_html_pages(self, manifest: Path) -> None:
+        response = Client().get('/')
+        assert response['Link'].split(', ') == [
+            '</static/js/runtime.js>; rel=preload; as=script',
+            '</static/js/vendors.js>; rel=preload; as=script',
+            '</static/js/turbo_drive.js>; rel=preload; as=script',
+            '</static/css/turbo_drive.css>; rel=preload; as=style',
+        ]
+
+    @pytest.mark.django_db
+    def test_other_responses(self, manifest: Path) -> None:
+        middleware = PreloadMiddleware(lambda request: JsonResponse({}))
+        assert not middleware(RequestFactory().get('/')).has_header('Link')
+        response = Client().get('/admin/login/')
+        assert response.status_code == 200
+        assert not response.has_header('Link')
+
+    def test_keeps_existing_links(self, manifest: Path) -> None:
+        def view(request: object) -> HttpResponse:
+            response = HttpResponse()
+            response['Link'] = '</feed>; rel=alternate'
+            return response
+
+        response = PreloadMiddleware(view)(RequestFactory().get('/'))
+        assert response['Link'].startswith('</feed>; rel=alternate, <')
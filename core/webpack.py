@@ -0,0 +1,133 @@
+# core/webpack.py
+"""
+Cached webpack manifest and preload hints for the entrypoint chunks.
+
+``webpack_boilerplate`` parses ``frontend/build/manifest.json`` on
+every ``{% stylesheet_pack %}`` and ``{% javascript_pack %}`` unless
+``WEBPACK_LOADER['CACHE']`` is on, and even then rebuilds each bundle's
+chunk list and static URLs on every call. ``ManifestLoader`` keeps the
+parsed manifest and the resolved chunks of each bundle in the process.
+With ``CACHE`` on (the default outside DEBUG) the manifest is read
+once; otherwise it is read again only when its modification time
+changes, so a running dev server picks up webpack rebuilds.
+
+``PreloadMiddleware`` adds a ``Link`` header with ``rel=preload`` for
+every chunk of the ``WEBPACK_PRELOAD`` entrypoints, including the
+``runtime`` and vendor chunks webpack splits off, to HTML responses.
+Browsers start fetching them before they parse the page; proxies that
+support it (e.g. Cloudflare, H2O) send them ahead as 103 Early Hints.
+"""
+from __future__ import annotations
+
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+from webpack_boilerplate import utils
+from webpack_boilerplate.loader import WebpackLoader
+
+# Requests resolved into these namespaces bring their own assets.
+SKIPPED_NAMESPACES = frozenset({'admin'})
+PRELOAD_AS = {'.js': 'script', '.css': 'style'}
+
+
+class ManifestLoader(WebpackLoader):
+    """``WebpackLoader`` that parses the manifest once per change."""
+
+    def __init__(self, name: str, config: dict[str, Any]) -> None:
+        super().__init__(name, config)
+        self._manifest: dict[str, Any] | None = None
+        self._mtime: int | None = None
+        self._bundles: dict[str, list[dict[str, str]]] = {}
+
+    def get_assets(self) -> dict[str, Any]:
+        if self._manifest is not None and self.config['CACHE']:
+            return self._manifest
+        try:
+            mtime = os.stat(self.config['MANIFEST_FILE']).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._manifest is None or mtime != self._mtime:
+            self._manifest = self.load_assets()
+            self._mtime = mtime
+            self._bundles = {}
+        return self._manifest
+
+    def get_bundle(self, bundle_name: str) -> list[dict[str, str]]:
+        self.get_assets()
+        try:
+            chunks = self._bundles[bundle_name]
+        except KeyError:
+            chunks = self._bundles[bundle_name] = list(
+                super().get_bundle(bundle_name)
+            )
+        return [dict(chunk) for chunk in chunks]
+
+
+@receiver(setting_changed)
+def _reset(setting: str, **kwargs: object) -> None:
+    # Loaders keep the configuration they were created with.
+    if setting in ('WEBPACK_LOADER', 'STATIC_URL', 'STORAGES', 'DEBUG'):
+        utils._loaders.clear()
+
+
+def preload_links(entrypoints: list[str]) -> str:
+    """``Link`` header value preloading the chunks of ``entrypoints``."""
+    links = []
+    for entrypoint in entrypoints:
+        for chunk in utils.get_files(entrypoint):
+            kind = PRELOAD_AS.get(os.path.splitext(chunk['name'])[1])
+            link = f'<{chunk["url"]}>; rel=preload; as={kind}'
+            if kind is not None and link not in links:
+                links.append(link)
+    return ', '.join(links)
+
+
+class PreloadMiddleware:
+    """Tell browsers about the ``WEBPACK_PRELOAD`` chunks up front."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.entrypoints = list(getattr(settings, 'WEBPACK_PRELOAD', []))
+        if not self.entrypoints:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponse | Awaitable[HttpResponse]:
+        if self.is_async:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+    ) -> HttpResponse:
+        if not response.get('Content-Type', '').startswith('text/html'):
+            return response
+        match = request.resolver_match
+        if match is not None and SKIPPED_NAMESPACES & set(match.namespaces):
+            return response
+        links = preload_links(self.entrypoints)
+        if links:
+            existing = response.get('Link')
+            response['Link'] = f'{existing}, {links}' if existing else links
+        return response
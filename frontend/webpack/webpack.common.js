@@ -25,9 +25,12 @@ module.exports = {
   entry: getEntryObject(),
   output: {
     path: Path.join(__dirname, "../build"),
-    filename: "js/[name].js",
+    // Content hashes let the files be cached for good; Django keeps
+    // these names instead of hashing them again (core/staticfiles.py).
+    filename: "js/[name].[contenthash:8].js",
+    chunkFilename: "js/[name].[contenthash:8].chunk.js",
     publicPath: "/static/",
-    assetModuleFilename: "[path][name][ext]",
+    assetModuleFilename: "[path][name].[contenthash:8][ext]",
   },
   optimization: {
     splitChunks: {
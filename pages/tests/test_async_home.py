@@ -0,0 +1,45 @@
+"""
+Tests for the ASGI profile of the home page: AsyncHomeView behind
+the middleware of ASGI_MIDDLEWARE.
+"""
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.test import AsyncClient, override_settings
+from django.urls import path
+
+from core import urls
+from pages.views import AsyncHomeView
+
+urlpatterns = [
+    path('', AsyncHomeView.as_view(), name='home'),
+    *urls.urlpatterns,
+]
+
+
+@pytest.fixture(autouse=True)
+def _asgi_profile() -> None:
+    stack = [
+        settings.ASGI_MIDDLEWARE.get(path, path)
+        for path in settings.MIDDLEWARE
+    ]
+    with override_settings(
+        ASGI=True,
+        MIDDLEWARE=stack,
+        ROOT_URLCONF=__name__,
+    ):
+        yield
+
+
+def test_view_is_async() -> None:
+    assert AsyncHomeView.view_is_async
+
+
+def test_renders() -> None:
+    response = async_to_sync(AsyncClient().get)(
+        '/', headers={'accept-language': 'de', 'x-correlation-id': 'abc'}
+    )
+    assert response.status_code == 200
+    assert b'<html lang="de">' in response.content
+    assert response['X-Correlation-ID'].startswith('abc, ')
+    assert response.cookies['csrftoken'].value
@@ -0,0 +1,61 @@
+"""
+Tests for the home page and the cached fragments of base.html.
+"""
+import re
+
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.middleware.csrf import _unmask_cipher_token
+from django.template import engines
+from django.test import Client
+from django.urls import reverse
+
+URL = reverse('home')
+
+
+@pytest.fixture(autouse=True)
+def _clear_fragments() -> None:
+    caches['template_fragments'].clear()
+
+
+def _rendered_token(content: bytes) -> str:
+    match = re.search(rb'name="csrfmiddlewaretoken" value="(\w+)"', content)
+    return match[1].decode()
+
+
+def test_renders(client: Client) -> None:
+    response = client.get(URL)
+    assert response.status_code == 200
+    assert b'<html lang="en">' in response.content
+
+
+def test_language_switcher_is_cached_per_language(client: Client) -> None:
+    english = client.get(URL, headers={'accept-language': 'en'})
+    german = client.get(URL, headers={'accept-language': 'de'})
+    assert b'<html lang="de">' in german.content
+    assert re.search(rb'value="en"\s+selected', english.content)
+    assert re.search(rb'value="de"\s+selected', german.content)
+    assert german.content.count(b'selected') == 1
+
+
+def test_csrf_token_is_not_cached() -> None:
+    first, second = Client(), Client()
+    first.get(URL)
+    second.get(URL)
+    assert first.cookies['csrftoken'].value
+    secrets = [
+        _unmask_cipher_token(_rendered_token(c.get(URL).content))
+        for c in (first, second)
+    ]
+    assert secrets == [
+        first.cookies['csrftoken'].value,
+        second.cookies['csrftoken'].value,
+    ]
+    assert secrets[0] != secrets[1]
+
+
+def test_cached_loader_outside_debug() -> None:
+    assert not settings.DEBUG
+    loader = engines['django'].engine.template_loaders[0]
+    assert loader.__class__.__module__ == 'django.template.loaders.cached'
@@ -1,7 +1,10 @@
+from django.conf import settings
 from django.urls import path
 
-from .views import HomeView
+from .views import AsyncHomeView, HomeView
+
+home_view = AsyncHomeView if settings.ASGI else HomeView
 
 urlpatterns = [
-    path('', HomeView.as_view(), name='home'),
+    path('', home_view.as_view(), name='home'),
 ]
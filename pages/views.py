@@ -1,6 +1,26 @@
+from typing import Any
+
+from django.http import HttpRequest, HttpResponse
 from django.views.generic import TemplateView
 
 
 class HomeView(TemplateView):
     template_name = 'pages/home.html'
-# Create your views here.
+
+
+class AsyncHomeView(HomeView):
+    """``HomeView`` for ASGI, rendered on the event loop."""
+
+    async def get(
+        self,
+        request: HttpRequest,
+        *args: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> HttpResponse:
+        # Load the user up front: the lazy request.user would query
+        # the database while the template renders.
+        request.user = await request.auser()
+        context = self.get_context_data(**kwargs)
+        # Rendered here; a TemplateResponse returned unrendered is
+        # rendered by the handler in a worker thread.
+        return self.render_to_response(context).render()
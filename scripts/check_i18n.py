@@ -1,11 +1,34 @@
 #!/usr/bin/env python3
 # scripts/check_i18n.py
+import argparse
 import ast
+import bisect
+import functools
+import hashlib
+import importlib.util
+import itertools
+import json
 import os
 import re
+import shutil
+import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+)
 
 KNOWN_TRANSLATION_FUNCS = {
     'gettext',
@@ -78,6 +101,21 @@ EXCLUDE_PATTERNS = [
     r'^[a-z]+-[a-z]+$',
 ]
 SUPPORTED_SUFFIXES = {'.py', '.html', '.htm', '.txt'}
+TEMPLATE_SUFFIXES = {'.html', '.htm'}
+
+CACHE_FILE = '.i18n_cache.json'
+PHASES = ('discovery', 'python_parse', 'template_parse', 'total')
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+SARIF_RULE = {
+    'id': 'unmarked-string',
+    'name': 'UnmarkedString',
+    'shortDescription': {'text': 'String not marked for translation'},
+    'defaultConfiguration': {'level': 'warning'},
+}
+CACHE_VERSION = 1
+# Below this many files to parse, starting worker processes costs more
+# than it saves.
+MIN_PARALLEL_FILES = 8
 
 MIN_STRING_LENGTH = 3
 MIN_WORD_LENGTH = 4
@@ -85,107 +123,197 @@ MAX_EXAMPLE_LENGTH = 30
 MIN_NODE_STR_LENGTH = 10
 MIN_ATTR_TEXT_LENGTH = 2
 
+# Every pattern is compiled once at import. The exclusions are joined
+# into one alternation, so a string is tested in a single match call.
+EXCLUDE_RE = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern in EXCLUDE_PATTERNS),
+    re.IGNORECASE,
+)
+PHRASE_RE = re.compile(r'\b[a-zA-Z]{2,}(?:\s+[a-zA-Z]{2,})+\b', re.IGNORECASE)
+WORD_RE = re.compile(r'\b[a-zA-Z]{4,}\b', re.IGNORECASE)
+QUOTED_RE = re.compile(r'["\']([^"\']{3,})["\']')
+TRANS_RE = re.compile(
+    r'{%\s*trans\s+["\']([^"\']+?)["\']\s*%}',
+    re.IGNORECASE | re.DOTALL,
+)
+BLOCKTRANS_RE = re.compile(
+    r'{%\s*blocktrans\s*.*?%}(.*?){%\s*endblocktrans\s*%}',
+    re.DOTALL | re.IGNORECASE,
+)
+ATTRIBUTE_RE = re.compile(
+    r'(?:title|alt|value|placeholder|label|aria-label)'
+    r'\s*=\s*["\']([^"\']{3,})["\']',
+    re.IGNORECASE | re.DOTALL,
+)
+FALLBACK_ATTRIBUTE_RE = re.compile(
+    r'(?:title|alt|value|placeholder|name|label|aria-label)'
+    r'\s*=\s*["\']([^"\']+)["\']',
+    re.IGNORECASE | re.DOTALL,
+)
+# Template markup in one pass: {% tags %}, {{ variables }}, comments
+# and HTML tags, which may contain template tags themselves. Lazy
+# ``.*?`` is unrolled into ``[^%]*(?:%(?!})[^%]*)*`` and the HTML tag
+# body is atomic, so the engine never steps back through the text.
+_TAG = r'\{%[^%]*(?:%(?!\})[^%]*)*%\}'
+_VARIABLE = r'\{\{[^}]*\}\}'
+TEMPLATE_MARKUP_RE = re.compile(
+    rf'''
+      {_TAG}
+    | {_VARIABLE}
+    | < (?: !--[^-]*(?:-(?!->)[^-]*)*-->
+          | (?>[^>{{]+|{_TAG}|{_VARIABLE}|\{{)++> )
+    ''',
+    re.VERBOSE,
+)
+LINE_BREAK_RE = re.compile('[\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]')
+
+# 0: findings only, 1: progress, 2: details for every file.
+VERBOSITY = 1
+
+# Django is set up by setup_django() when the first template is
+# parsed; --no-django turns it off and templates go through regex.
+USE_DJANGO = True
 DJANGO_AVAILABLE = False
 I18N_NODES_AVAILABLE = False
+_django_attempted = False
 
 Template = None  # type: ignore[assignment]
 TextNode = None  # type: ignore[assignment]
 CommentNode = None  # type: ignore[assignment]
 
-try:
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-    if str(project_root) not in sys.path:
-        sys.path.insert(0, str(project_root))
-        print(f'🔧 Added project root to sys.path: {project_root}')
 
+def report(message: str, level: int = 1) -> None:
+    """Write progress to stderr; stdout only carries the findings."""
+    if VERBOSITY >= level:
+        print(message, file=sys.stderr)
+
+
+def find_settings_module(project_root: Path) -> Optional[str]:
+    """Return the settings module named in manage.py or a known one."""
     manage_py = project_root / 'manage.py'
     settings_module = None
     if manage_py.exists():
-        with open(manage_py, encoding='utf-8') as f:
-            content = f.read()
-            pattern = (
-                r'os\.environ\.setdefault\('
-                r"'DJANGO_SETTINGS_MODULE',\s*'([^']+)'\)"
+        content = manage_py.read_text(encoding='utf-8')
+        pattern = (
+            r'os\.environ\.setdefault\('
+            r"'DJANGO_SETTINGS_MODULE',\s*'([^']+)'\)"
+        )
+        match = re.search(pattern, content)
+        if match:
+            settings_module = match.group(1)
+            report(
+                f'🔍 Detected settings module from manage.py: '
+                f'{settings_module}'
             )
-            match = re.search(pattern, content)
-            if match:
-                settings_module = match.group(1)
-                print(
-                    f'🔍 Detected settings module from manage.py: '
-                    f'{settings_module}'
-                )
-
-    possible_settings = [settings_module] if settings_module else []
-    if not settings_module:
-        possible_settings = [
-            'core.settings',
-            'forenlims.core.settings',
-            'forenlims.settings',
-            'project.settings',
-        ]
 
+    possible_settings = [settings_module] if settings_module else [
+        'core.settings',
+        'forenlims.core.settings',
+        'forenlims.settings',
+        'project.settings',
+    ]
     for ps in possible_settings:
-        if ps:
-            try:
-                __import__(ps.split('.')[0])
-                settings_module = ps
-                print(f'🔍 Verified settings module: {settings_module}')
-                break
-            except ImportError:
-                continue
+        try:
+            __import__(ps.split('.')[0])
+        except ImportError:
+            continue
+        report(f'🔍 Verified settings module: {ps}')
+        return ps
+
+    settings_candidates = list(project_root.glob('**/settings.py'))
+    candidates_str = [str(p.parent) for p in settings_candidates]
+    report(
+        f'⚠️  No valid settings module found. '
+        f'Possible settings.py files: {candidates_str}'
+    )
+    report(f'   sys.path[0]: {sys.path[0]}')
+    report(
+        '   💡 Try adjusting possible_settings list '
+        "(e.g., add 'your_project.settings')"
+    )
+    return None
+
+
+def _load_django() -> None:
+    global Template, TextNode, CommentNode  # noqa: PLW0603
+    global I18N_NODES_AVAILABLE  # noqa: PLW0603
+    project_root = Path(__file__).parent.parent
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+        report(f'🔧 Added project root to sys.path: {project_root}')
 
+    settings_module = os.environ.get(
+        'DJANGO_SETTINGS_MODULE'
+    ) or find_settings_module(project_root)
     if not settings_module:
-        settings_candidates = list(project_root.glob('**/settings.py'))
-        candidates_str = [str(p.parent) for p in settings_candidates]
-        print(
-            f'⚠️  No valid settings module found. '
-            f'Possible settings.py files: {candidates_str}'
-        )
-        print(f'   sys.path[0]: {sys.path[0]}')
-        print(
-            '   💡 Try adjusting possible_settings list '
-            "(e.g., add 'your_project.settings')"
-        )
         raise ImportError('Could not find valid settings module')
-
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
-    import django
 
-    django.setup()
+    import django  # noqa: PLC0415
+    from django.apps import apps  # noqa: PLC0415
 
-    from django.template import Template
-    from django.template.base import TextNode
+    if not apps.ready:
+        django.setup()
+
+    from django.template import Template  # noqa: PLC0415
+    from django.template.base import TextNode  # noqa: PLC0415
 
     try:
-        from django.template.defaulttags import (
+        from django.template.defaulttags import (  # noqa: PLC0415
             CommentNode,
         )
     except ImportError:
-        from django.template.base import CommentNode
-
-    try:
-        import importlib.util
+        from django.template.base import CommentNode  # noqa: PLC0415
 
-        if importlib.util.find_spec('django.templatetags.i18n'):
-            I18N_NODES_AVAILABLE = True
-            print('✅ i18n nodes available')
-    except ImportError:
-        I18N_NODES_AVAILABLE = False
-        print(
+    I18N_NODES_AVAILABLE = bool(
+        importlib.util.find_spec('django.templatetags.i18n')
+    )
+    if I18N_NODES_AVAILABLE:
+        report('✅ i18n nodes available')
+    else:
+        report(
             '⚠️  i18n nodes not directly importable - '
             'using fallback extraction'
         )
 
-    DJANGO_AVAILABLE = True
-    print('✅ Django loaded and ready for full template parsing')
 
-except Exception as e:
-    print(
-        f'⚠️  Django setup failed: {e} - '
-        'using regex fallback for templates'
+def setup_django() -> bool:
+    """
+    Set Django up for template parsing, once, on first use.
+
+    Python files never need it, so runs without templates (and runs
+    with ``USE_DJANGO`` off) skip the settings import and app loading
+    entirely. Returns whether the Django template parser is available.
+    """
+    global DJANGO_AVAILABLE, _django_attempted  # noqa: PLW0603
+    if _django_attempted:
+        return DJANGO_AVAILABLE
+    _django_attempted = True
+    if not USE_DJANGO:
+        report('⚙️  Django disabled - using regex for templates')
+        return False
+    started = time.perf_counter()
+    try:
+        _load_django()
+    except Exception as e:
+        report(
+            f'⚠️  Django setup failed: {e} - '
+            'using regex fallback for templates'
+        )
+        return False
+    DJANGO_AVAILABLE = True
+    report(
+        '✅ Django loaded and ready for full template parsing '
+        f'({time.perf_counter() - started:.2f}s)'
     )
-    DJANGO_AVAILABLE = False
+    return True
+
+
+def _init_worker(use_django: bool, verbosity: int) -> None:
+    # Spawned (not forked) workers start from the module defaults.
+    global USE_DJANGO, VERBOSITY  # noqa: PLW0603
+    USE_DJANGO = use_django
+    VERBOSITY = verbosity
 
 
 def load_i18nignore(root: Path) -> Set[str]:
@@ -203,138 +331,156 @@ def should_exclude_string(s: str) -> bool:
     s = s.strip()
     if len(s) < MIN_STRING_LENGTH:
         return True
-    for pattern in EXCLUDE_PATTERNS:
-        if re.match(pattern, s, re.IGNORECASE):
-            return True
-    return False
+    return EXCLUDE_RE.match(s) is not None
 
 
 def clean_template_text(raw_text: str) -> str:
-    text = re.sub(
-        r'<!--.*?-->',
-        '',
-        raw_text,
-        flags=re.DOTALL | re.IGNORECASE,
-    )
-    text = re.sub(r'\{%.*?%\}', '', text, flags=re.DOTALL)
-    text = re.sub(r'\{\{[^}]*\}\}', '', text, flags=re.DOTALL)
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+    """Strip template and HTML markup and collapse whitespace."""
+    return ' '.join(TEMPLATE_MARKUP_RE.sub('', raw_text).split())
 
 
 def extract_phrases_from_text(clean_text: str) -> List[str]:
-    phrases = re.findall(
-        r'\b[a-zA-Z]{2,}(?:\s+[a-zA-Z]{2,})+\b',
-        clean_text,
-        re.IGNORECASE,
-    )
+    phrases = PHRASE_RE.findall(clean_text)
     if not phrases:
-        words = re.findall(
-            r'\b[a-zA-Z]{4,}\b',
-            clean_text,
-            re.IGNORECASE,
-        )
-        phrases = words[:2]
+        phrases = WORD_RE.findall(clean_text)[:2]
     return [p.strip() for p in phrases if not should_exclude_string(p)]
 
 
+class TranslationVisitor:
+    """
+    Find unmarked string constants in a module with one AST traversal.
+
+    Translation imports, calls with string arguments and string
+    constants are collected in source order. Which calls translate is
+    only decided at the end, so an import below its first use still
+    counts, and a string translated anywhere in the module is treated
+    as marked everywhere.
+    """
+
+    def __init__(self) -> None:
+        self.aliases: Dict[str, Set[str]] = {}
+        self.calls: List[Tuple[ast.expr, List[str]]] = []
+        self.constants: List[Tuple[int, str]] = []
+
+    def scan(self, tree: ast.AST) -> List[Tuple[int, str]]:
+        """Return ``(line, string)`` for every unmarked constant."""
+        handlers = self._handlers
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(self, node)
+            # Pre-order, children in field order: ast.NodeVisitor order.
+            children = list(ast.iter_child_nodes(node))
+            children.reverse()
+            stack.extend(children)
+        return self.unmarked()
+
+    def visit_import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            is_gettext = alias.name == 'gettext'
+            is_django_trans = alias.name.startswith('django.utils.translation')
+            if is_gettext or is_django_trans:
+                local_name = alias.asname or alias.name.split('.')[-1]
+                self.aliases[local_name] = KNOWN_TRANSLATION_FUNCS.copy()
+
+    def visit_import_from(self, node: ast.ImportFrom) -> None:
+        if node.module not in ('gettext', 'django.utils.translation'):
+            return
+        for alias in node.names:
+            if alias.name in KNOWN_TRANSLATION_FUNCS:
+                local_name = alias.asname or alias.name
+                self.aliases.setdefault(local_name, set()).add(alias.name)
+
+    def visit_call(self, node: ast.Call) -> None:
+        strings = [
+            arg.value
+            for arg in node.args
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str)
+        ]
+        if strings:
+            self.calls.append((node.func, strings))
+
+    def visit_constant(self, node: ast.Constant) -> None:
+        if isinstance(node.value, str):
+            self.constants.append((node.lineno, node.value))
+
+    _handlers = {
+        ast.Import: visit_import,
+        ast.ImportFrom: visit_import_from,
+        ast.Call: visit_call,
+        ast.Constant: visit_constant,
+    }
+
+    def is_translation_call(self, func: ast.expr) -> bool:
+        if isinstance(func, ast.Name):
+            return bool(self.aliases.get(func.id))
+        return (
+            isinstance(func, ast.Attribute)
+            and isinstance(func.value, ast.Name)
+            and func.attr in self.aliases.get(func.value.id, ())
+        )
+
+    def unmarked(self) -> List[Tuple[int, str]]:
+        translated = set()
+        for func, strings in self.calls:
+            if self.is_translation_call(func):
+                translated.update(strings)
+        excluded: Dict[str, bool] = {}
+        unmarked = []
+        for line, s in self.constants:
+            if s in translated:
+                continue
+            if s not in excluded:
+                excluded[s] = should_exclude_string(s)
+            if not excluded[s]:
+                unmarked.append((line, s))
+        return unmarked
+
+
 def check_python_file(path: Path) -> List[Tuple[int, str]]:
-    unmarked = []
     try:
         content = path.read_text(encoding='utf-8')
         tree = ast.parse(content, filename=str(path))
     except (SyntaxError, UnicodeDecodeError):
-        print(f'⚠️  Skipped broken file: {path}')
-        return unmarked
+        report(f'⚠️  Skipped broken file: {path}')
+        return []
+    return TranslationVisitor().scan(tree)
 
-    translation_aliases: Dict[str, Set[str]] = {}
-
-    class ImportCollector(ast.NodeVisitor):
-        def visit_Import(self, node: ast.Import) -> None:
-            for alias in node.names:
-                is_gettext = alias.name == 'gettext'
-                is_django_trans = alias.name.startswith(
-                    'django.utils.translation'
-                )
-                if is_gettext or is_django_trans:
-                    local_name = alias.asname or alias.name.split('.')[-1]
-                    translation_aliases[local_name] = (
-                        KNOWN_TRANSLATION_FUNCS.copy()
-                    )
-            self.generic_visit(node)
-
-        def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
-            module = node.module
-            if module in ('gettext', 'django.utils.translation'):
-                for alias in node.names:
-                    imported_name = alias.name
-                    local_name = alias.asname or imported_name
-                    if imported_name in KNOWN_TRANSLATION_FUNCS:
-                        if local_name not in translation_aliases:
-                            translation_aliases[local_name] = set()
-                        translation_aliases[local_name].add(imported_name)
-            self.generic_visit(node)
-
-    import_collector = ImportCollector()
-    import_collector.visit(tree)
 
-    translated_strings = set()
+class LineIndex:
+    """Case-insensitive text search that answers with line numbers."""
 
-    class TranslationCollector(ast.NodeVisitor):
-        def visit_Call(self, node: ast.Call) -> None:
-            is_translation_call = False
-
-            if isinstance(node.func, ast.Name):
-                func_name = node.func.id
-                if translation_aliases.get(func_name):
-                    is_translation_call = True
-            elif isinstance(node.func, ast.Attribute):
-                attr_name = node.func.attr
-                if isinstance(node.func.value, ast.Name):
-                    value_name = node.func.value.id
-                    if value_name in translation_aliases:
-                        attr_in_aliases = (
-                            attr_name in translation_aliases[value_name]
-                        )
-                        if attr_in_aliases:
-                            is_translation_call = True
-
-            if is_translation_call:
-                for arg in node.args:
-                    is_str_constant = isinstance(
-                        arg, ast.Constant
-                    ) and isinstance(arg.value, str)
-                    if is_str_constant:
-                        translated_strings.add(arg.value)
-
-            self.generic_visit(node)
-
-    collector = TranslationCollector()
-    collector.visit(tree)
-
-    class StringFinder(ast.NodeVisitor):
-        def visit_Constant(self, node: ast.Constant) -> None:
-            if isinstance(node.value, str):
-                s = node.value
-                not_translated = s not in translated_strings
-                not_excluded = not should_exclude_string(s)
-                if not_translated and not_excluded:
-                    unmarked.append((node.lineno, s))
-            self.generic_visit(node)
-
-    finder = StringFinder()
-    finder.visit(tree)
+    def __init__(self, content: str) -> None:
+        lines = content.splitlines(keepends=True)
+        self.text = content.lower()
+        if len(self.text) != len(content):
+            # Some characters changed length; keep offsets per line.
+            lines = [line.lower() for line in lines]
+            self.text = ''.join(lines)
+        self.starts = [0, *itertools.accumulate(map(len, lines[:-1]))]
+        if not lines:
+            self.starts = []
 
-    return unmarked
+    def find(self, text: str) -> Optional[int]:
+        """Return the first line (1-based) containing ``text``."""
+        if not self.starts or LINE_BREAK_RE.search(text):
+            # A single line never contains a line break.
+            return None
+        pos = self.text.find(text.lower())
+        if pos == -1:
+            return None
+        return bisect.bisect_right(self.starts, pos)
+
+
+@functools.lru_cache(maxsize=8)
+def _line_index(content: str) -> LineIndex:
+    return LineIndex(content)
 
 
 def find_approx_line(content: str, text: str) -> Optional[int]:
-    lines = content.splitlines()
-    for i, line in enumerate(lines, 1):
-        if text.lower() in line.lower():
-            return i
-    return None
+    return _line_index(content).find(text)
 
 
 def check_template_file(path: Path) -> List[Tuple[int, str]]:
@@ -344,16 +490,16 @@ def check_template_file(path: Path) -> List[Tuple[int, str]]:
     except UnicodeDecodeError:
         return unmarked
 
-    print(f'📄 Checking template: {path.name} (using Django)')
+    report(f'📄 Checking template: {path.name}', 2)
 
-    if not DJANGO_AVAILABLE:
-        print('   Falling back to regex (Django not available)')
+    if not setup_django():
+        report('   Falling back to regex (Django not available)', 2)
         return _regex_template_check(content, path)
 
     try:
         unmarked = _django_template_check(content, path)
     except Exception as e:
-        print(
+        report(
             f'⚠️  Django parsing error in {path.name}: {e} - '
             'using regex fallback'
         )
@@ -365,20 +511,11 @@ def check_template_file(path: Path) -> List[Tuple[int, str]]:
 def _extract_translated_strings(content: str) -> Set[str]:
     """Extract translated strings from template using regex."""
     translated_strings = set()
-
-    trans_pattern = re.compile(
-        r'{%\s*trans\s+["\']([^"\']+?)["\']\s*%}',
-        re.IGNORECASE | re.DOTALL,
-    )
-    blocktrans_pattern = re.compile(
-        r'{%\s*blocktrans\s*.*?%}(.*?){%\s*endblocktrans\s*%}',
-        re.DOTALL | re.IGNORECASE,
-    )
-    for match in trans_pattern.finditer(content):
+    for match in TRANS_RE.finditer(content):
         ts = match.group(1).strip()
         if len(ts) > MIN_STRING_LENGTH:
             translated_strings.add(ts)
-    for match in blocktrans_pattern.finditer(content):
+    for match in BLOCKTRANS_RE.finditer(content):
         block_content = match.group(1).strip()
         plain_block = clean_template_text(block_content)
         phrases = extract_phrases_from_text(plain_block)
@@ -390,26 +527,15 @@ def _extract_translated_strings(content: str) -> Set[str]:
 
 def _extract_attribute_texts(content: str) -> List[Tuple[int, str]]:
     """Extract text from HTML attributes."""
-    attr_patterns = [
-    (
-        r'(?:title|alt|value|placeholder|label|aria-label)'
-        r'\s*=\s*["\']([^"\']{3,})["\']'
-    ),
-    ]
     attr_texts = []
-    for pattern in attr_patterns:
-        for match in re.finditer(
-            pattern,
-            content,
-            re.IGNORECASE | re.DOTALL,
-        ):
-            text = match.group(1).strip()
-            is_long_enough = len(text) > MIN_STRING_LENGTH
-            has_no_var = '{{' not in text
-            not_excluded = not should_exclude_string(text)
-            if is_long_enough and has_no_var and not_excluded:
-                line_num = find_approx_line(content, text) or 1
-                attr_texts.append((line_num, text))
+    for match in ATTRIBUTE_RE.finditer(content):
+        text = match.group(1).strip()
+        is_long_enough = len(text) > MIN_STRING_LENGTH
+        has_no_var = '{{' not in text
+        not_excluded = not should_exclude_string(text)
+        if is_long_enough and has_no_var and not_excluded:
+            line_num = find_approx_line(content, text) or 1
+            attr_texts.append((line_num, text))
     return attr_texts
 
 
@@ -423,7 +549,7 @@ def _extract_translated_nodes(
         'trans' in node_str.lower() or 'blocktrans' in node_str.lower()
     )
     if len(node_str) > MIN_NODE_STR_LENGTH and has_trans:
-        matches = re.findall(r'["\']([^"\']{3,})["\']', node_str)
+        matches = QUOTED_RE.findall(node_str)
         for m in matches:
             clean_m = clean_template_text(m)
             is_long_enough = len(clean_m) > MIN_STRING_LENGTH
@@ -469,13 +595,14 @@ def _print_django_results(
         if len(t) > MIN_STRING_LENGTH and not should_exclude_string(t)
     ]
 
-    print(
+    report(
         f'   Django: {len(potential_unmarked)} texts found, '
-        f'{len(clean_translated)} translated, {len(unmarked)} unmarked'
+        f'{len(clean_translated)} translated, {len(unmarked)} unmarked',
+        2,
     )
     if clean_translated:
         examples = ', '.join(clean_translated[:2])
-        print(f'   Translated examples: {examples}')
+        report(f'   Translated examples: {examples}', 2)
     if unmarked:
         examples = [
             (
@@ -485,7 +612,7 @@ def _print_django_results(
             )
             for _, text in unmarked[:2]
         ]
-        print(f'   Unmarked examples: {", ".join(examples)}')
+        report(f'   Unmarked examples: {", ".join(examples)}', 2)
 
 
 def _filter_unmarked_strings(
@@ -515,7 +642,7 @@ def _django_template_check(
     potential_unmarked: List[Tuple[int, str]] = []
 
     attr_texts = _extract_attribute_texts(content)
-    print(f'   Found {len(attr_texts)} attributes')
+    report(f'   Found {len(attr_texts)} attributes', 2)
 
     if hasattr(template, 'nodelist') and template.nodelist:
         _extract_translated_nodes(
@@ -540,41 +667,12 @@ def _django_template_check(
 
 def _extract_regex_translated(content: str) -> Set[str]:
     """Extract translated strings using regex patterns."""
-    trans_pattern = re.compile(
-        r'{%\s*trans\s+["\']([^"\']+?)["\']\s*%}',
-        re.IGNORECASE | re.DOTALL,
-    )
-    blocktrans_pattern = re.compile(
-        r'{%\s*blocktrans\s*.*?%}(.*?){%\s*endblocktrans\s*%}',
-        re.DOTALL | re.IGNORECASE,
-    )
-
     translated = set()
-    for match in trans_pattern.finditer(content):
+    for match in TRANS_RE.finditer(content):
         translated.add(match.group(1).strip())
-    for match in blocktrans_pattern.finditer(content):
-        block_content = match.group(1).strip()
-        plain_text = re.sub(
-            r'\{\{[^}]*\}\}',
-            '',
-            block_content,
-            flags=re.DOTALL,
-        )
-        plain_text = re.sub(
-            r'\{%.*?%\}',
-            '',
-            plain_text,
-            flags=re.DOTALL,
-        )
-        plain_text = re.sub(r'<[^>]+>', '', plain_text)
-        plain_text = re.sub(
-            r'<!--.*?-->',
-            '',
-            plain_text,
-            flags=re.DOTALL,
-        )
-        plain_text = re.sub(r'\s+', ' ', plain_text).strip()
-        if plain_text and len(plain_text.split()) >= 1:
+    for match in BLOCKTRANS_RE.finditer(content):
+        plain_text = clean_template_text(match.group(1))
+        if plain_text:
             translated.add(plain_text)
     return translated
 
@@ -586,20 +684,12 @@ def _extract_regex_phrases(
     potential_phrases = []
     lines = content_clean.splitlines()
     for line_num, line in enumerate(lines, 1):
-        phrases = re.findall(
-            r'\b[a-zA-Z]{2,}(?:\s+[a-zA-Z]{2,})+\b',
-            line,
-            re.IGNORECASE,
-        )
+        phrases = PHRASE_RE.findall(line)
         for phrase in phrases:
             if not should_exclude_string(phrase):
                 potential_phrases.append((line_num, phrase))
         if not phrases:
-            single_words = re.findall(
-                r'\b[a-zA-Z]{4,}\b',
-                line,
-                re.IGNORECASE,
-            )
+            single_words = WORD_RE.findall(line)
             for word in single_words[:1]:
                 if not should_exclude_string(word) and '{{' not in word:
                     potential_phrases.append((line_num, word))
@@ -615,47 +705,15 @@ def _regex_template_check(
 
     if translated:
         examples = ', '.join(list(translated)[:2])
-        print(f'   Regex translated examples: {examples}')
+        report(f'   Regex translated examples: {examples}', 2)
 
-    content_clean = re.sub(
-        r'<!--.*?-->',
-        '',
-        content,
-        flags=re.DOTALL | re.IGNORECASE,
-    )
-    content_clean = re.sub(
-        r'\{%.*?%\}',
-        '',
-        content_clean,
-        flags=re.DOTALL,
-    )
-    content_clean = re.sub(
-        r'\{\{[^}]*\}\}',
-        '',
-        content_clean,
-        flags=re.DOTALL,
-    )
-    content_clean = re.sub(r'<[^>]+>', '', content_clean)
-    content_clean = re.sub(r'\s+', ' ', content_clean)
-
-    attr_patterns = [
-        (
-            r'(?:title|alt|value|placeholder|name|label|aria-label)'
-            r'\s*=\s*["\']([^"\']+)["\']'
-        ),
-    ]
     attr_texts = []
-    for pattern in attr_patterns:
-        for match in re.finditer(
-            pattern,
-            content,
-            re.IGNORECASE | re.DOTALL,
-        ):
-            text = match.group(1).strip()
-            if len(text) > MIN_ATTR_TEXT_LENGTH and '{{' not in text:
-                attr_texts.append(text)
+    for match in FALLBACK_ATTRIBUTE_RE.finditer(content):
+        text = match.group(1).strip()
+        if len(text) > MIN_ATTR_TEXT_LENGTH and '{{' not in text:
+            attr_texts.append(text)
 
-    potential_phrases = _extract_regex_phrases(content_clean)
+    potential_phrases = _extract_regex_phrases(clean_template_text(content))
 
     seen_texts = {text for _, text in potential_phrases}
     for text in attr_texts:
@@ -672,82 +730,571 @@ def _regex_template_check(
         if not_in_translated and not_excluded and not_in_seen:
             refined_line = find_approx_line(content, text)
             unmarked.append((refined_line or line_num, text))
-            print(
-                f'   Regex: {len(potential_phrases)} phrases found, '
-                f'{len(translated)} translated, {len(unmarked)} unmarked'
-            )
-
+    report(
+        f'   Regex: {len(potential_phrases)} phrases found, '
+        f'{len(translated)} translated, {len(unmarked)} unmarked',
+        2,
+    )
     return unmarked
 
 
-def scan_project(
-    root: str = '.',
-    ignored: Optional[Set[str]] = None,
-) -> List[str]:
-    root_path = Path(root)
-    if ignored is None:
-        ignored = load_i18nignore(root_path)
-
-    results = []
-    py_count = 0
-    template_count = 0
-    py_unmarked = 0
-    template_unmarked = 0
-
-    candidate_paths = []
-    for path in root_path.rglob('*'):
-        if path.suffix.lower() not in SUPPORTED_SUFFIXES:
-            continue
+def scanner_fingerprint() -> str:
+    """Identify this scanner, so cached results of older versions die."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(f'{CACHE_VERSION}:{USE_DJANGO}'.encode())
+    return digest.hexdigest()
 
-        if any(ignored_part in path.parts for ignored_part in ignored):
-            continue
 
-        if not path.is_file():
-            continue
+class ResultCache:
+    """
+    Scan results of unchanged files, stored as JSON next to the code.
+
+    Entries are keyed by path and validated by size and mtime first;
+    when those changed, a content hash decides whether the file really
+    has to be parsed again.
+    """
+
+    def __init__(self, path: Optional[Path], fingerprint: str) -> None:
+        self.path = path
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, dict] = {}
+        self.dirty = False
 
+    def load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
         try:
-            _ = path.read_text(encoding='utf-8', errors='ignore')
-        except Exception:
-            print(f'⚠️  Skipped non-text file: {path}')
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            report(f'⚠️  Ignoring unreadable cache: {self.path}')
+            return
+        if data.get('fingerprint') == self.fingerprint:
+            self.entries = data.get('files', {})
+
+    def lookup(
+        self,
+        key: str,
+        path: Path,
+    ) -> Tuple[Optional[List[Tuple[int, str]]], Optional[str]]:
+        """Return ``(results, digest)``; results are None on a miss."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None, None
+        entry = self.entries.get(key)
+        if (
+            entry is not None
+            and entry['size'] == stat.st_size
+            and entry['mtime_ns'] == stat.st_mtime_ns
+        ):
+            return [tuple(r) for r in entry['results']], entry['sha256']
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        if entry is not None and entry['sha256'] == digest:
+            # Touched but unchanged: remember the new stat.
+            self.store(key, path, digest, entry['results'])
+            return [tuple(r) for r in entry['results']], digest
+        return None, digest
+
+    def store(
+        self,
+        key: str,
+        path: Path,
+        digest: str,
+        results: Iterable[Tuple[int, str]],
+    ) -> None:
+        stat = path.stat()
+        self.entries[key] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest,
+            'results': [list(r) for r in results],
+        }
+        self.dirty = True
+
+    def prune(self, keep: Set[str]) -> None:
+        """Forget files that are no longer part of the scan."""
+        stale = self.entries.keys() - keep
+        for key in stale:
+            del self.entries[key]
+        self.dirty = self.dirty or bool(stale)
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        data = {'fingerprint': self.fingerprint, 'files': self.entries}
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        tmp.write_text(json.dumps(data), encoding='utf-8')
+        os.replace(tmp, self.path)
+
+
+def _is_candidate(path: Path, ignored: Set[str]) -> bool:
+    return path.suffix.lower() in SUPPORTED_SUFFIXES and not any(
+        part in ignored for part in path.parts
+    )
+
+
+def find_candidate_files(root_path: Path, ignored: Set[str]) -> List[Path]:
+    """Return the files to scan, without descending into ignored dirs."""
+    candidates = []
+    for dirpath, dirnames, filenames in os.walk(root_path):
+        dirnames[:] = sorted(d for d in dirnames if d not in ignored)
+        for name in sorted(filenames):
+            path = Path(dirpath, name)
+            if name not in ignored and _is_candidate(path, ignored):
+                candidates.append(path)
+    return candidates
+
+
+def git_changed_files(root_path: Path, base: str = 'HEAD') -> List[str]:
+    """Return files changed since ``base``, relative to ``root_path``."""
+    git = shutil.which('git')
+    if git is None:
+        raise RuntimeError('Command not found: git')
+    output = subprocess.run(  # noqa: S603
+        [git, 'diff', '--name-only', '--relative', '--diff-filter=d', base],
+        cwd=root_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return output.splitlines()
+
+
+def filter_changed_files(
+    root_path: Path,
+    names: Iterable[str],
+    ignored: Set[str],
+) -> List[Path]:
+    """Turn a diff file list into scan candidates below ``root_path``."""
+    candidates = set()
+    for raw_name in names:
+        name = raw_name.strip()
+        if not name:
             continue
+        path = root_path / name
+        if _is_candidate(Path(name), ignored) and path.is_file():
+            candidates.add(path)
+    return sorted(candidates)
+
+
+def scan_file(path: Path) -> List[Tuple[int, str]]:
+    """Return the unmarked strings of one file."""
+    if path.suffix == '.py':
+        return check_python_file(path)
+    if path.suffix in TEMPLATE_SUFFIXES:
+        return check_template_file(path)
+    return []
+
+
+def _timed_scan(path: Path) -> Tuple[List[Tuple[int, str]], float]:
+    started = time.perf_counter()
+    unmarked = scan_file(path)
+    return unmarked, time.perf_counter() - started
+
+
+def _parse_files(
+    paths: List[Path],
+    workers: int,
+) -> Iterator[Tuple[List[Tuple[int, str]], float]]:
+    if workers == 1 or len(paths) < MIN_PARALLEL_FILES:
+        yield from map(_timed_scan, paths)
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers or None,
+        initializer=_init_worker,
+        initargs=(USE_DJANGO, VERBOSITY),
+    ) as pool:
+        yield from pool.map(_timed_scan, paths, chunksize=4)
+
+
+class Finding(NamedTuple):
+    """A string that looks like it should be marked for translation."""
+
+    path: Path
+    line: int
+    text: str
+
+    def __str__(self) -> str:
+        return f'{self.path}:{self.line}: {self.text[:80]}'
+
+    def as_dict(self) -> Dict[str, object]:
+        return {'path': str(self.path), 'line': self.line, 'text': self.text}
+
+
+@dataclass
+class ScanSummary:
+    """
+    Counts and timings of one scan.
+
+    Timings are in seconds. Parse times are summed over the files that
+    were actually parsed, so with several workers they exceed the
+    wall-clock ``total``.
+    """
+
+    python_files: int = 0
+    templates: int = 0
+    python_findings: int = 0
+    template_findings: int = 0
+    cached: int = 0
+    parsed: int = 0
+    timings: Dict[str, float] = field(
+        default_factory=lambda: dict.fromkeys(PHASES, 0.0)
+    )
 
-        candidate_paths.append(path)
+    def add(self, path: Path, unmarked: List[Tuple[int, str]]) -> None:
+        if path.suffix == '.py':
+            self.python_files += 1
+            self.python_findings += len(unmarked)
+        elif path.suffix in TEMPLATE_SUFFIXES:
+            self.templates += 1
+            self.template_findings += len(unmarked)
+
+    @property
+    def findings(self) -> int:
+        return self.python_findings + self.template_findings
+
+    def as_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data['findings'] = self.findings
+        data['timings'] = {
+            phase: round(seconds, 4) for phase, seconds in self.timings.items()
+        }
+        return data
+
+    def describe(self) -> str:
+        timings = ', '.join(
+            f'{phase.replace("_", " ")} {seconds:.2f}s'
+            for phase, seconds in self.timings.items()
+        )
+        return (
+            f'📊 Scanned {self.python_files} Python files '
+            f'({self.python_findings} unmarked), {self.templates} templates '
+            f'({self.template_findings} unmarked)\n'
+            f'⏱️  {timings}'
+        )
 
-    print(f'🔍 Found {len(candidate_paths)} candidate files to scan')
 
-    for path in candidate_paths:
-        unmarked = []
+class ProjectScan:
+    """
+    Scan of a project; iterate over it to get the unmarked strings.
+
+    ``changed`` limits the scan to those files (relative to ``root``).
+    Results are cached in ``cache_file`` (relative to ``root``; None
+    disables the cache), so only new or modified files are parsed, on
+    up to ``workers`` processes (0: one per CPU). Findings are yielded
+    in path order as soon as they are known, and ``summary`` is
+    complete once the iteration has finished.
+    """
+
+    def __init__(
+        self,
+        root: str = '.',
+        ignored: Optional[Set[str]] = None,
+        *,
+        changed: Optional[Iterable[str]] = None,
+        cache_file: Optional[str] = CACHE_FILE,
+        workers: int = 0,
+    ) -> None:
+        self.root_path = Path(root)
+        self.ignored = ignored
+        self.changed = changed
+        self.cache_file = cache_file
+        self.workers = workers
+        self.summary = ScanSummary()
+
+    def __iter__(self) -> Iterator[Finding]:
+        summary = self.summary
+        started = time.perf_counter()
+        root_path = self.root_path
+        ignored = self.ignored
+        if ignored is None:
+            ignored = load_i18nignore(root_path)
+
+        if self.changed is None:
+            paths = find_candidate_files(root_path, ignored)
+        else:
+            paths = filter_changed_files(root_path, self.changed, ignored)
+
+        cache = ResultCache(
+            root_path / self.cache_file if self.cache_file else None,
+            scanner_fingerprint(),
+        )
+        cache.load()
+        keys = [str(path.relative_to(root_path)) for path in paths]
+        lookups = [
+            (key, path, *cache.lookup(key, path))
+            for key, path in zip(keys, paths, strict=True)
+        ]
+        stale = [path for _, path, unmarked, _ in lookups if unmarked is None]
+        summary.timings['discovery'] = time.perf_counter() - started
+        report(
+            f'🔍 Found {len(paths)} candidate files, '
+            f'{len(paths) - len(stale)} unchanged, parsing {len(stale)}'
+        )
 
-        if path.suffix == '.py':
-            py_count += 1
-            unmarked = check_python_file(path)
-            py_unmarked += len(unmarked)
-        elif path.suffix in {'.html', '.htm'}:
-            template_count += 1
-            unmarked = check_template_file(path)
-            template_unmarked += len(unmarked)
-
-        for line_num, string in unmarked:
-            results.append(f'{path}:{line_num}: {string[:80]}')
-
-    print(
-        f'\n📊 Scanned {py_count} Python files ({py_unmarked} unmarked), '
-        f'{template_count} templates ({template_unmarked} unmarked)'
-    )
+        # Set Django up here rather than in every worker: forked
+        # workers inherit it, and Python-only runs never pay for it.
+        if any(path.suffix in TEMPLATE_SUFFIXES for path in stale):
+            setup_django()
+        # Regex results of a run whose Django setup failed must not be
+        # served to the next run as if Django had parsed them.
+        cache_templates = DJANGO_AVAILABLE or not USE_DJANGO
+
+        parsed = _parse_files(stale, self.workers)
+        try:
+            for key, path, cached, digest in lookups:
+                unmarked = cached
+                if unmarked is None:
+                    unmarked, seconds = next(parsed)
+                    phase = (
+                        'python_parse' if path.suffix == '.py'
+                        else 'template_parse'
+                    )
+                    summary.timings[phase] += seconds
+                    summary.parsed += 1
+                    if digest is not None and (
+                        cache_templates or path.suffix not in TEMPLATE_SUFFIXES
+                    ):
+                        cache.store(key, path, digest, unmarked)
+                else:
+                    summary.cached += 1
+                summary.add(path, unmarked)
+                for line_num, string in unmarked:
+                    yield Finding(path, line_num, string)
+        finally:
+            parsed.close()
+
+        if self.changed is None:
+            cache.prune(set(keys))
+        cache.save()
+        summary.timings['total'] = time.perf_counter() - started
+
+
+def scan_project(
+    root: str = '.',
+    ignored: Optional[Set[str]] = None,
+    **options: Any,  # noqa: ANN401
+) -> List[str]:
+    """
+    Scan ``root`` and return the unmarked strings as ``path:line: text``.
+
+    Takes the keyword arguments of ``ProjectScan``.
+    """
+    scan = ProjectScan(root, ignored, **options)
+    results = [str(finding) for finding in scan]
+    report(scan.summary.describe())
     return results
 
 
-if __name__ == '__main__':
-    print('🔍 Scanning for unmarked i18n strings...\n')
-    strings = scan_project()
-
-    if strings:
-        print(f'⚠️  Found {len(strings)} potentially unmarked strings:\n')
-        for s in strings:
-            print(s)
-        print(
-            f'\n💡 Total: {len(strings)} strings need review '
+def write_text(scan: ProjectScan, out: TextIO) -> None:
+    for finding in scan:
+        print(finding, file=out, flush=True)
+    summary = scan.summary
+    if summary.findings:
+        report(
+            f'\n⚠️  Found {summary.findings} potentially unmarked strings '
             '(review for gettext or {% trans %})'
         )
     else:
-        print('✅ No unmarked strings found!')
+        report('✅ No unmarked strings found!')
+
+
+def write_ndjson(scan: ProjectScan, out: TextIO) -> None:
+    for finding in scan:
+        record = {'type': 'finding', **finding.as_dict()}
+        print(json.dumps(record, ensure_ascii=False), file=out, flush=True)
+    record = {'type': 'summary', **scan.summary.as_dict()}
+    print(json.dumps(record, ensure_ascii=False), file=out)
+
+
+def write_json(scan: ProjectScan, out: TextIO) -> None:
+    out.write('{"findings": [')
+    for n, finding in enumerate(scan):
+        out.write(',\n  ' if n else '\n  ')
+        out.write(json.dumps(finding.as_dict(), ensure_ascii=False))
+        out.flush()
+    out.write('\n], "summary": ')
+    out.write(json.dumps(scan.summary.as_dict()))
+    out.write('}\n')
+
+
+def _sarif_result(finding: Finding, root_path: Path) -> Dict[str, object]:
+    try:
+        uri = finding.path.relative_to(root_path).as_posix()
+    except ValueError:
+        uri = finding.path.as_posix()
+    return {
+        'ruleId': SARIF_RULE['id'],
+        'level': 'warning',
+        'message': {
+            'text': f'String not marked for translation: {finding.text}',
+        },
+        'locations': [{
+            'physicalLocation': {
+                'artifactLocation': {'uri': uri, 'uriBaseId': 'SRCROOT'},
+                'region': {'startLine': finding.line},
+            },
+        }],
+    }
+
+
+def write_sarif(scan: ProjectScan, out: TextIO) -> None:
+    """Write a SARIF 2.1.0 log, one result per finding."""
+    root_path = scan.root_path
+    run = {
+        'tool': {
+            'driver': {
+                'name': 'check_i18n',
+                'rules': [SARIF_RULE],
+            },
+        },
+        'originalUriBaseIds': {
+            'SRCROOT': {'uri': root_path.resolve().as_uri() + '/'},
+        },
+    }
+    head = json.dumps({
+        '$schema': SARIF_SCHEMA,
+        'version': '2.1.0',
+        'runs': [{**run, 'results': []}],
+    })
+    # Stream the results into the otherwise complete document.
+    prefix, suffix = head.split('"results": []')
+    out.write(prefix + '"results": [')
+    for n, finding in enumerate(scan):
+        out.write(',\n' if n else '\n')
+        out.write(
+            json.dumps(_sarif_result(finding, root_path), ensure_ascii=False)
+        )
+        out.flush()
+    invocation = {
+        'executionSuccessful': True,
+        'properties': scan.summary.as_dict(),
+    }
+    out.write('\n], "invocations": [' + json.dumps(invocation) + ']')
+    out.write(suffix + '\n')
+
+
+WRITERS = {
+    'text': write_text,
+    'json': write_json,
+    'ndjson': write_ndjson,
+    'sarif': write_sarif,
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Find strings that are not marked for translation.',
+    )
+    parser.add_argument(
+        'root',
+        nargs='?',
+        default='.',
+        help='Project directory to scan (default: current directory).',
+    )
+    parser.add_argument(
+        '--changed-only',
+        action='store_true',
+        help=(
+            'Only scan files changed since --base, or the files listed '
+            'in --files-from.'
+        ),
+    )
+    parser.add_argument(
+        '--base',
+        default='HEAD',
+        help='Git revision to diff against (default: HEAD).',
+    )
+    parser.add_argument(
+        '--files-from',
+        metavar='PATH',
+        help=(
+            'Read the changed files, one per line and relative to root, '
+            'from PATH ("-" for stdin), e.g. the output of '
+            '"git diff --name-only".'
+        ),
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Parser processes (default: one per CPU; 1 disables).',
+    )
+    parser.add_argument(
+        '--cache-file',
+        default=CACHE_FILE,
+        help=f'Result cache, relative to root (default: {CACHE_FILE}).',
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_const',
+        const=None,
+        dest='cache_file',
+        help='Parse every file and do not write the cache.',
+    )
+    parser.add_argument(
+        '--no-django',
+        action='store_false',
+        dest='django',
+        help=(
+            'Check templates with the regex scanner only; Django is '
+            'never imported.'
+        ),
+    )
+    parser.add_argument(
+        '--format',
+        choices=tuple(WRITERS),
+        default='text',
+        help=(
+            'Output format (default: text). Findings are written as '
+            'they are found, followed by a summary with phase timings.'
+        ),
+    )
+    parser.add_argument(
+        '-q',
+        '--quiet',
+        action='store_const',
+        const=0,
+        dest='verbosity',
+        default=1,
+        help='Only write findings; no progress on stderr.',
+    )
+    parser.add_argument(
+        '-v',
+        '--verbose',
+        action='store_const',
+        const=2,
+        dest='verbosity',
+        help='Report on every file as it is parsed.',
+    )
+    return parser.parse_args(argv)
+
+
+def _changed_files(args: argparse.Namespace) -> Optional[List[str]]:
+    if args.files_from == '-':
+        return sys.stdin.read().splitlines()
+    if args.files_from:
+        return Path(args.files_from).read_text(encoding='utf-8').splitlines()
+    if args.changed_only:
+        return git_changed_files(Path(args.root), args.base)
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    global VERBOSITY, USE_DJANGO  # noqa: PLW0603
+    args = parse_args(argv)
+    VERBOSITY = args.verbosity
+    USE_DJANGO = args.django
+    report('🔍 Scanning for unmarked i18n strings...\n')
+    scan = ProjectScan(
+        args.root,
+        changed=_changed_files(args),
+        cache_file=args.cache_file,
+        workers=args.workers,
+    )
+    WRITERS[args.format](scan, sys.stdout)
+    report(scan.summary.describe())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+"""
+Tests for the incremental i18n scanner in scripts/check_i18n.py.
+"""
+import json
+import subprocess
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from scripts import check_i18n
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / 'app').mkdir()
+    (tmp_path / 'app' / 'views.py').write_text(
+        'from django.utils.translation import gettext as _\n'
+        "TITLE = _('Translated title')\n"
+        "HELP = 'Please mark this sentence'\n"
+    )
+    (tmp_path / 'app' / 'clean.py').write_text('VALUE = 1\n')
+    (tmp_path / 'node_modules').mkdir()
+    (tmp_path / 'node_modules' / 'vendor.py').write_text("X = 'Not scanned'\n")
+    return tmp_path
+
+
+def _scan(root: Path, **kwargs: object) -> list[str]:
+    return check_i18n.scan_project(str(root), workers=1, **kwargs)
+
+
+def test_reports_unmarked_strings(project: Path) -> None:
+    results = _scan(project, cache_file=None)
+    assert results == [f'{project}/app/views.py:3: Please mark this sentence']
+    assert not (project / check_i18n.CACHE_FILE).exists()
+
+
+def test_unchanged_files_come_from_the_cache(
+    project: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first = _scan(project)
+    cache = json.loads((project / check_i18n.CACHE_FILE).read_text())
+    assert set(cache['files']) == {'app/views.py', 'app/clean.py'}
+
+    parsed = []
+    original = check_i18n.scan_file
+    monkeypatch.setattr(
+        check_i18n,
+        'scan_file',
+        lambda path: parsed.append(path.name) or original(path),
+    )
+    assert _scan(project) == first
+    assert parsed == []
+
+    (project / 'app' / 'clean.py').write_text("LABEL = 'Another sentence'\n")
+    assert len(_scan(project)) == 2
+    assert parsed == ['clean.py']
+
+
+def test_cache_of_another_scanner_version_is_ignored(project: Path) -> None:
+    _scan(project)
+    cache_path = project / check_i18n.CACHE_FILE
+    cache = json.loads(cache_path.read_text())
+    cache['fingerprint'] = 'old'
+    for entry in cache['files'].values():
+        entry['results'] = [[1, 'stale']]
+    cache_path.write_text(json.dumps(cache))
+    assert _scan(project) == [
+        f'{project}/app/views.py:3: Please mark this sentence'
+    ]
+
+
+def test_changed_only(project: Path) -> None:
+    changed = [
+        'app/clean.py',
+        'app/views.py',
+        'node_modules/vendor.py',
+        'README.md',
+        'app/deleted.py',
+    ]
+    results = _scan(project, changed=changed)
+    assert results == [f'{project}/app/views.py:3: Please mark this sentence']
+    results = _scan(project, changed=['app/clean.py'])
+    assert results == []
+
+
+# The test process runs database pool and log listener threads.
+@pytest.mark.filterwarnings('ignore:This process .* is multi-threaded')
+def test_parallel_scan_matches_serial(project: Path) -> None:
+    for n in range(check_i18n.MIN_PARALLEL_FILES):
+        (project / 'app' / f'module{n}.py').write_text(
+            f"TEXT = 'Unmarked sentence number {n}'\n"
+        )
+    serial = _scan(project, cache_file=None)
+    parallel = check_i18n.scan_project(
+        str(project), cache_file=None, workers=2
+    )
+    assert parallel == serial
+    assert len(serial) == check_i18n.MIN_PARALLEL_FILES + 1
+
+
+@pytest.mark.parametrize(
+    ('raw', 'clean'),
+    [
+        ('<p>Hello <b>lab</b>\n  world</p>', 'Hello lab world'),
+        ('<!-- note --> {% trans "x" %} {{ user }}Text', 'Text'),
+        ('<div {% if a > b %}class="x"{% endif %}>Body</div>', 'Body'),
+        ('50 % {  less < more', '50 % { less < more'),
+    ],
+)
+def test_clean_template_text(raw: str, clean: str) -> None:
+    assert check_i18n.clean_template_text(raw) == clean
+
+
+def test_should_exclude_string() -> None:
+    assert check_i18n.should_exclude_string('snake_case_name')
+    assert check_i18n.should_exclude_string('https://example.com')
+    assert not check_i18n.should_exclude_string('Choose a sample')
+
+
+def test_find_approx_line() -> None:
+    content = 'first\nSecond Line\r\nthird line'
+    assert check_i18n.find_approx_line(content, 'second line') == 2
+    assert check_i18n.find_approx_line(content, 'LINE') == 2
+    assert check_i18n.find_approx_line(content, 'third') == 3
+    assert check_i18n.find_approx_line(content, 'line\nthird') is None
+    assert check_i18n.find_approx_line(content, 'missing') is None
+
+
+def test_python_scanner_resolves_aliases(tmp_path: Path) -> None:
+    module = tmp_path / 'module.py'
+    module.write_text(
+        'def view():\n'
+        "    return tr.gettext('Late import sentence'), _('Marked text')\n"
+        '\n'
+        '\n'
+        'import django.utils.translation as tr\n'
+        'from django.utils.translation import gettext_lazy as _\n'
+        "OTHER = 'Marked text'\n"
+        "LABEL = other.gettext('Unknown module sentence')\n"
+    )
+    assert check_i18n.check_python_file(module) == [
+        (8, 'Unknown module sentence'),
+    ]
+
+
+def _main(project: Path, *args: str) -> None:
+    check_i18n.main([str(project), '--no-cache', '--workers=1', *args])
+
+
+@pytest.fixture
+def verbosity() -> Iterator[None]:
+    # main() sets the module-wide options from the command line.
+    yield
+    check_i18n.VERBOSITY = 1
+    check_i18n.USE_DJANGO = True
+
+
+@pytest.mark.usefixtures('verbosity')
+class TestOutputFormats:
+    """check_i18n.py --format=..."""
+
+    def test_ndjson(
+        self,
+        project: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        _main(project, '--format=ndjson', '--quiet')
+        out, err = capsys.readouterr()
+        finding, summary = (json.loads(line) for line in out.splitlines())
+        assert finding == {
+            'type': 'finding',
+            'path': f'{project}/app/views.py',
+            'line': 3,
+            'text': 'Please mark this sentence',
+        }
+        assert summary['type'] == 'summary'
+        assert summary['python_files'] == 2
+        assert summary['findings'] == 1
+        assert set(summary['timings']) == set(check_i18n.PHASES)
+        assert err == ''
+
+    def test_json(
+        self,
+        project: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        _main(project, '--format=json')
+        out, err = capsys.readouterr()
+        data = json.loads(out)
+        assert [f['line'] for f in data['findings']] == [3]
+        assert data['summary']['parsed'] == 2
+        assert 'Found 1 potentially unmarked' not in out
+        assert 'Scanned 2 Python files' in err
+
+    def test_sarif(
+        self,
+        project: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        _main(project, '--format=sarif', '-q')
+        log = json.loads(capsys.readouterr().out)
+        assert log['version'] == '2.1.0'
+        run = log['runs'][0]
+        location = run['results'][0]['locations'][0]['physicalLocation']
+        assert location['artifactLocation']['uri'] == 'app/views.py'
+        assert location['region'] == {'startLine': 3}
+        assert run['invocations'][0]['properties']['findings'] == 1
+
+    def test_text(
+        self,
+        project: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        _main(project, '--quiet')
+        out, err = capsys.readouterr()
+        assert out == f'{project}/app/views.py:3: Please mark this sentence\n'
+        assert err == ''
+
+
+@pytest.fixture
+def django_state(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """A scanner that has not set Django up yet; lists setup calls."""
+    calls: list[str] = []
+    monkeypatch.setattr(check_i18n, '_django_attempted', False)
+    monkeypatch.setattr(check_i18n, 'DJANGO_AVAILABLE', False)
+    monkeypatch.setattr(check_i18n, 'USE_DJANGO', True)
+    monkeypatch.setattr(
+        check_i18n, '_load_django', lambda: calls.append('setup')
+    )
+    return calls
+
+
+def _add_template(project: Path) -> None:
+    (project / 'app' / 'page.html').write_text(
+        '{% load i18n %}\n<p>Please translate this paragraph</p>\n'
+    )
+
+
+def test_python_only_scan_does_not_import_django(project: Path) -> None:
+    code = (
+        'import sys\n'
+        'from scripts import check_i18n\n'
+        f'check_i18n.scan_project({str(project)!r}, cache_file=None)\n'
+        "print('django' in sys.modules)\n"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, '-c', code],
+        cwd=Path(check_i18n.__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout == 'False\n'
+
+
+def test_django_is_set_up_for_the_first_template(
+    project: Path,
+    django_state: list[str],
+) -> None:
+    _scan(project, cache_file=None)
+    assert django_state == []
+    _add_template(project)
+    _scan(project, cache_file=None)
+    _scan(project, cache_file=None)
+    assert django_state == ['setup']
+
+
+@pytest.mark.usefixtures('verbosity')
+def test_no_django_uses_the_regex_scanner(
+    project: Path,
+    django_state: list[str],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    _add_template(project)
+    _main(project, '--no-django', '-q')
+    assert django_state == []
+    assert 'page.html:2: Please translate this paragraph' in (
+        capsys.readouterr().out
+    )
+
+
+def test_regex_fallback_results_are_not_cached(
+    project: Path,
+    django_state: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def fail() -> None:
+        raise ImportError('no settings')
+
+    monkeypatch.setattr(check_i18n, '_load_django', fail)
+    _add_template(project)
+    _scan(project)
+    cache = json.loads((project / check_i18n.CACHE_FILE).read_text())
+    assert set(cache['files']) == {'app/views.py', 'app/clean.py'}